@@ -6,3 +6,10 @@ class AddressRegistryConfig(AppConfig):
     name = "apps.address_registry"
     verbose_name = "Address Registry"
     verbose_name_plural = "Address Registries"
+
+    def ready(self) -> None:
+        from apps.address_registry import signals  # noqa: F401
+        from apps.address_registry.rc_examples.helpers import xml_examples
+
+        # Examples are loaded once per worker instead of on the first request
+        xml_examples.load()
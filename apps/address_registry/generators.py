@@ -0,0 +1,232 @@
+import math
+import random
+from collections.abc import Callable, Sequence
+
+from django.db import models, transaction
+from django.db.models import Max
+from model_bakery.baker import prepare_recipe
+
+from apps.address_registry.helpers import (
+    RESPONSE_CACHE_DEPENDENCIES,
+    invalidate_countries_xml,
+    invalidate_model_response_cache,
+)
+from apps.address_registry.hierarchy import refresh_administrative_hierarchy
+from apps.address_registry.models import (
+    Administration,
+    AdministrativeUnit,
+    AdministrativeUnitType,
+    Continent,
+    Country,
+    County,
+    Document,
+    DocumentAuthor,
+    Eldership,
+    Municipality,
+    Settlement,
+    Title,
+)
+
+
+class BulkTestDataGenerator:
+    """
+    Generates test data without saving objects one by one:
+      - Builds whole object graph in memory using model bakery recipes
+      - Reuses each parent object for `fan_out` children
+      - Writes each table with `bulk_create` in batches of `batch_size` inside a single transaction
+      - Fills denormalized fields (e.g. `country_code`, administrative hierarchy) and invalidates caches, because
+        `bulk_create` does not call `save()` and does not send model signals
+    """
+
+    def __init__(self, fan_out: int = 1, batch_size: int = 1000):
+        self.fan_out = fan_out
+        self.batch_size = batch_size
+        # Ids of countries generated by the current `generate()` call
+        self.country_ids: list[int] = []
+
+    @property
+    def generators(self) -> dict[type[models.Model], Callable[[int], list]]:
+        return {
+            Continent: self.generate_continents,
+            Country: self.generate_countries,
+            Settlement: self.generate_settlements,
+            Title: self.generate_titles,
+            Document: self.generate_documents,
+            AdministrativeUnit: self.generate_administrative_units,
+            Administration: self.generate_administrations,
+            County: self.generate_counties,
+            Municipality: self.generate_municipalities,
+            Eldership: self.generate_elderships,
+        }
+
+    @classmethod
+    def supports(cls, model: type[models.Model]) -> bool:
+        return model in cls().generators
+
+    def generate(self, model: type[models.Model], quantity: int) -> list:
+        self.country_ids = []
+        with transaction.atomic():
+            objects = self.generators[model](quantity)
+
+        # Caches are invalidated once the rows are committed, so they cannot be rebuilt from the old rows
+        if self.country_ids:
+            invalidate_countries_xml(self.country_ids)
+        invalidate_model_response_cache(*RESPONSE_CACHE_DEPENDENCIES)
+        return objects
+
+    def _get_parent_count(self, quantity: int) -> int:
+        return math.ceil(quantity / self.fan_out)
+
+    def _get_parent(self, parents: Sequence, index: int):
+        return parents[index // self.fan_out]
+
+    def _prepare(self, recipe_name: str, quantity: int, **attrs) -> list:
+        if not quantity:
+            return []
+        return prepare_recipe(f"address_registry.{recipe_name}", _quantity=quantity, _fill_optional=True, **attrs)
+
+    def _bulk_create(self, model: type[models.Model], objects: list) -> list:
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def generate_continents(self, quantity: int) -> list[Continent]:
+        continents = self._prepare("continent", quantity)
+
+        # Code is primary key, so random codes generated by model bakery could collide with existing ones
+        max_code = Continent.objects.aggregate(max_code=Max("code"))["max_code"] or 0
+        for index, continent in enumerate(continents, start=1):
+            continent.code = max_code + index
+
+        return self._bulk_create(Continent, continents)
+
+    def generate_countries(self, quantity: int) -> list[Country]:
+        continents = self.generate_continents(self._get_parent_count(quantity))
+        countries = self._prepare("country", quantity, continent=continents[0] if continents else None)
+        for index, country in enumerate(countries):
+            country.code = str(random.random())
+            country.continent = self._get_parent(continents, index)
+
+        countries = self._bulk_create(Country, countries)
+        self.country_ids.extend(country.id for country in countries)
+        return countries
+
+    def generate_settlements(
+        self, quantity: int, settlements_per_country: int | None = None, with_titles: bool = True
+    ) -> list[Settlement]:
+        settlements_per_country = settlements_per_country or self.fan_out
+        countries = self.generate_countries(math.ceil(quantity / settlements_per_country))
+        settlements = self._prepare("settlement", quantity, country=countries[0] if countries else None)
+        for index, settlement in enumerate(settlements):
+            settlement.country = countries[index // settlements_per_country]
+            settlement.country_code = settlement.country.code
+
+        settlements = self._bulk_create(Settlement, settlements)
+
+        if with_titles:
+            titles = self._prepare("title", quantity, settlement=None)
+            for title, settlement in zip(titles, settlements, strict=True):
+                title.settlement = settlement
+            self._bulk_create(Title, titles)
+
+        return settlements
+
+    def generate_titles(self, quantity: int) -> list[Title]:
+        settlements = self.generate_settlements(self._get_parent_count(quantity), with_titles=False)
+        titles = self._prepare("title", quantity, settlement=None)
+        for index, title in enumerate(titles):
+            title.settlement = self._get_parent(settlements, index)
+
+        return self._bulk_create(Title, titles)
+
+    def generate_documents(self, quantity: int) -> list[Document]:
+        documents = self._prepare("document", quantity)
+        for document in documents:
+            document.set_content_digest()
+        documents = self._bulk_create(Document, documents)
+
+        document_authors = self._prepare("document_author", quantity, document=None)
+        for document_author, document in zip(document_authors, documents, strict=True):
+            document_author.document = document
+        self._bulk_create(DocumentAuthor, document_authors)
+
+        return documents
+
+    def generate_administrative_units(
+        self,
+        quantity: int,
+        unit_type: str = AdministrativeUnitType.ADMINISTRATION,
+        centres: Sequence[Settlement] | None = None,
+    ) -> list[AdministrativeUnit]:
+        if centres is None:
+            centres = self.generate_settlements(quantity)
+
+        administrative_units = self._prepare(
+            "administrative_unit", quantity, type=unit_type, centre=centres[0] if centres else None
+        )
+        for administrative_unit, centre in zip(administrative_units, centres, strict=True):
+            administrative_unit.centre = centre
+            administrative_unit.country = centre.country
+            administrative_unit.country_code = centre.country.code
+
+        return self._bulk_create(AdministrativeUnit, administrative_units)
+
+    def generate_administrations(self, quantity: int) -> list[Administration]:
+        admin_units = self.generate_administrative_units(quantity)
+        administrations = self._prepare("administration", quantity, admin_unit=None, country=None)
+        for administration, admin_unit in zip(administrations, admin_units, strict=True):
+            administration.admin_unit = admin_unit
+            administration.country = admin_unit.country
+
+        return self._bulk_create(Administration, administrations)
+
+    def generate_counties(self, quantity: int, centres: Sequence[Settlement] | None = None) -> list[County]:
+        admin_units = self.generate_administrative_units(
+            quantity, unit_type=AdministrativeUnitType.COUNTY, centres=centres
+        )
+        counties = self._prepare("county", quantity, admin_unit=None)
+        for county, admin_unit in zip(counties, admin_units, strict=True):
+            county.admin_unit = admin_unit
+
+        counties = self._bulk_create(County, counties)
+        refresh_administrative_hierarchy(County, [obj.id for obj in counties])
+        return counties
+
+    def generate_municipalities(self, quantity: int, centres: Sequence[Settlement] | None = None) -> list[Municipality]:
+        if centres is None:
+            # All municipalities of a county are placed in the same country as the county
+            centres = self.generate_settlements(quantity, settlements_per_country=self.fan_out)
+
+        # County shares centre settlement with the first of its municipalities
+        counties = self.generate_counties(self._get_parent_count(quantity), centres=centres[:: self.fan_out])
+        admin_units = self.generate_administrative_units(
+            quantity, unit_type=AdministrativeUnitType.MUNICIPALITY, centres=centres
+        )
+
+        municipalities = self._prepare("municipality", quantity, county=None, admin_unit=None)
+        for index, (municipality, admin_unit) in enumerate(zip(municipalities, admin_units, strict=True)):
+            municipality.county = self._get_parent(counties, index)
+            municipality.admin_unit = admin_unit
+
+        municipalities = self._bulk_create(Municipality, municipalities)
+        refresh_administrative_hierarchy(Municipality, [obj.id for obj in municipalities])
+        return municipalities
+
+    def generate_elderships(self, quantity: int) -> list[Eldership]:
+        # All elderships of a county are placed in the same country as the county
+        centres = self.generate_settlements(quantity, settlements_per_country=self.fan_out**2)
+
+        # Municipality shares centre settlement with the first of its elderships
+        municipalities = self.generate_municipalities(
+            self._get_parent_count(quantity), centres=centres[:: self.fan_out]
+        )
+        admin_units = self.generate_administrative_units(
+            quantity, unit_type=AdministrativeUnitType.ELDERSHIP, centres=centres
+        )
+
+        elderships = self._prepare("eldership", quantity, municipality=None, admin_unit=None)
+        for index, (eldership, admin_unit) in enumerate(zip(elderships, admin_units, strict=True)):
+            eldership.municipality = self._get_parent(municipalities, index)
+            eldership.admin_unit = admin_unit
+
+        elderships = self._bulk_create(Eldership, elderships)
+        refresh_administrative_hierarchy(Eldership, [obj.id for obj in elderships])
+        return elderships
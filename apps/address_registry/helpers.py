@@ -1,24 +1,199 @@
+import base64
+import uuid
 import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
 
-from apps.address_registry.models import Country
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BinaryField
+from django.db.models.functions import Substr
 
+from apps.address_registry.models import (
+    AdministrativeBoundary,
+    AdministrativeUnit,
+    Continent,
+    Country,
+    County,
+    Document,
+    DocumentAuthor,
+    Eldership,
+    Municipality,
+    Settlement,
+    Title,
+)
+from apps.address_registry.xml_engines import EMPTY_COUNTRIES_XML, construct_country_xml, get_countries_xml_engine
+from apps.utils.spyne_cache import invalidate_response_cache
+from apps.utils.streaming import iter_base64
 
-def construct_country_xml(country: Country) -> ET.Element:
-    country_data = ET.Element("countryData")
-    ET.SubElement(country_data, "id").text = str(country.id)
-    ET.SubElement(country_data, "title").text = country.title
-    ET.SubElement(country_data, "continent_id").text = str(country.continent_id)
+COUNTRY_XML_CACHE_KEY = "address_registry:country_xml:{}"
+COUNTRY_XML_BASE64_CACHE_KEY = "address_registry:country_xml_base64:{}"
+# Whole <countries> document is cached as a list of encoded chunks, separately for each form it is returned in.
+# Documents are keyed by version, which is replaced on invalidation, so a document built from the old rows while the
+# version changes is never served.
+COUNTRIES_XML_CACHE_KEY = "address_registry:countries_xml:{}"
+COUNTRIES_XML_BASE64_CACHE_KEY = "address_registry:countries_xml_base64:{}"
+COUNTRIES_XML_VERSION_CACHE_KEY = "address_registry:countries_xml_version"
 
-    continent_data = ET.SubElement(country_data, "continent")
-    ET.SubElement(continent_data, "code").text = str(country.continent.code)
-    ET.SubElement(continent_data, "name").text = country.continent.name
+# Number of countries read from the database (and from the cache) at once while serializing all countries
+COUNTRIES_CHUNK_SIZE = 1000
 
-    return country_data
 
+class ResponseCacheNamespace:
+    CITIES = "cities"
+    DOCUMENTS = "documents"
+    COUNTRIES = "countries"
+    ADMINISTRATIVE_UNITS = "administrative_units"
 
-def construct_countries_xml() -> ET.Element:
-    countries = ET.Element("countries")
-    for country in Country.objects.all().select_related("continent"):
-        countries.append(construct_country_xml(country))
 
-    return countries
+# Spyne application response caches, which depend on the data of the model
+RESPONSE_CACHE_DEPENDENCIES = {
+    Continent: (ResponseCacheNamespace.CITIES, ResponseCacheNamespace.COUNTRIES),
+    Country: (
+        ResponseCacheNamespace.CITIES,
+        ResponseCacheNamespace.COUNTRIES,
+        ResponseCacheNamespace.ADMINISTRATIVE_UNITS,
+    ),
+    Settlement: (ResponseCacheNamespace.CITIES, ResponseCacheNamespace.ADMINISTRATIVE_UNITS),
+    Title: (ResponseCacheNamespace.CITIES, ResponseCacheNamespace.ADMINISTRATIVE_UNITS),
+    Document: (ResponseCacheNamespace.DOCUMENTS,),
+    DocumentAuthor: (ResponseCacheNamespace.DOCUMENTS,),
+    AdministrativeUnit: (ResponseCacheNamespace.ADMINISTRATIVE_UNITS,),
+    AdministrativeBoundary: (ResponseCacheNamespace.ADMINISTRATIVE_UNITS,),
+    County: (ResponseCacheNamespace.ADMINISTRATIVE_UNITS,),
+    Municipality: (ResponseCacheNamespace.ADMINISTRATIVE_UNITS,),
+    Eldership: (ResponseCacheNamespace.ADMINISTRATIVE_UNITS,),
+}
+
+
+def get_country_xml(country: Country) -> str:
+    """Returns serialized <countryData> fragment of the country, reusing the cached one if it exists"""
+    return get_countries_xml_fragments([country])[0]
+
+
+def get_countries_xml_fragments(countries: Iterable[Country]) -> list[str]:
+    """Returns serialized <countryData> fragments of given countries, building and caching only the missing ones"""
+    countries = list(countries)
+    fragments = cache.get_many([COUNTRY_XML_CACHE_KEY.format(country.id) for country in countries])
+
+    missing_fragments = {}
+    for country in countries:
+        cache_key = COUNTRY_XML_CACHE_KEY.format(country.id)
+        if cache_key not in fragments:
+            fragments[cache_key] = missing_fragments[cache_key] = ET.tostring(
+                construct_country_xml(country), encoding="unicode"
+            )
+
+    if missing_fragments:
+        cache.set_many(missing_fragments, settings.COUNTRY_XML_CACHE_TIMEOUT)
+
+    return [fragments[COUNTRY_XML_CACHE_KEY.format(country.id)] for country in countries]
+
+
+def wrap_countries_xml(countries_xml: list[str]) -> str:
+    if not countries_xml:
+        return EMPTY_COUNTRIES_XML
+    return f"<countries>{''.join(countries_xml)}</countries>"
+
+
+def get_countries_xml_base64_fragments(countries: Iterable[Country]) -> list[bytes]:
+    """
+    Returns base64 encoded <countries> documents with single country for each of given countries, encoding and
+    caching only the missing ones
+    """
+    countries = list(countries)
+    encoded = cache.get_many([COUNTRY_XML_BASE64_CACHE_KEY.format(country.id) for country in countries])
+
+    missing_countries = [
+        country for country in countries if COUNTRY_XML_BASE64_CACHE_KEY.format(country.id) not in encoded
+    ]
+    if missing_countries:
+        missing_encoded = {
+            COUNTRY_XML_BASE64_CACHE_KEY.format(country.id): encode_xml_base64(wrap_countries_xml([country_xml]))
+            for country, country_xml in zip(
+                missing_countries, get_countries_xml_fragments(missing_countries), strict=True
+            )
+        }
+        cache.set_many(missing_encoded, settings.COUNTRY_XML_CACHE_TIMEOUT)
+        encoded.update(missing_encoded)
+
+    return [encoded[COUNTRY_XML_BASE64_CACHE_KEY.format(country.id)] for country in countries]
+
+
+def encode_xml_base64(xml: str) -> bytes:
+    # Same bytes as ET.tostring() with its default us-ascii encoding
+    return base64.b64encode(xml.encode("ascii", "xmlcharrefreplace"))
+
+
+def iter_countries_xml(encoding: str = "ascii") -> Iterator[bytes]:
+    """
+    Yields encoded chunks of <countries> document with all countries.
+    Countries are read from the database in chunks and serialized by the configured engine.
+    """
+    countries = Country.objects.select_related("continent").order_by("id").iterator(chunk_size=COUNTRIES_CHUNK_SIZE)
+    return get_countries_xml_engine().iter_xml(countries, encoding=encoding)
+
+
+def _get_countries_xml_version() -> str:
+    version = cache.get(COUNTRIES_XML_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(COUNTRIES_XML_VERSION_CACHE_KEY, version, None):
+            # Added by another request meanwhile
+            version = cache.get(COUNTRIES_XML_VERSION_CACHE_KEY, version)
+    return version
+
+
+def _iter_cached_chunks(cache_key: str, iter_chunks: Callable[[], Iterator[bytes]]) -> Iterator[bytes]:
+    """
+    Yields chunks cached under `cache_key` of the current version, otherwise yields chunks of `iter_chunks()` while
+    they are built and caches them once all of them are consumed, unless the version has changed meanwhile
+    """
+    version = _get_countries_xml_version()
+    chunks = cache.get(cache_key.format(version))
+    if chunks is not None:
+        yield from chunks
+        return
+
+    chunks = []
+    for chunk in iter_chunks():
+        chunks.append(chunk)
+        yield chunk
+    if cache.get(COUNTRIES_XML_VERSION_CACHE_KEY) == version:
+        cache.set(cache_key.format(version), chunks, settings.COUNTRY_XML_CACHE_TIMEOUT)
+
+
+def iter_cached_countries_xml() -> Iterator[bytes]:
+    """Yields UTF-8 encoded chunks of <countries> document with all countries"""
+    return _iter_cached_chunks(COUNTRIES_XML_CACHE_KEY, lambda: iter_countries_xml(encoding="utf-8"))
+
+
+def iter_cached_countries_xml_base64() -> Iterator[bytes]:
+    """
+    Yields base64 encoded chunks of <countries> document with all countries. Only the encoded chunks are kept for
+    caching, the XML is encoded while it is being written.
+    """
+    return _iter_cached_chunks(COUNTRIES_XML_BASE64_CACHE_KEY, lambda: iter_base64(iter_countries_xml()))
+
+
+def invalidate_countries_xml(country_ids: list[int]) -> None:
+    cache.set(COUNTRIES_XML_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    cache.delete_many(
+        [
+            *(COUNTRY_XML_CACHE_KEY.format(country_id) for country_id in country_ids),
+            *(COUNTRY_XML_BASE64_CACHE_KEY.format(country_id) for country_id in country_ids),
+        ]
+    )
+
+
+def invalidate_model_response_cache(*models: type) -> None:
+    namespaces = {namespace for model in models for namespace in RESPONSE_CACHE_DEPENDENCIES.get(model, ())}
+    invalidate_response_cache(*namespaces)
+
+
+def iter_document_content(document_id: int, first: int, last: int, chunk_size: int) -> Iterator[bytes]:
+    """Yields document content bytes from first to last position (inclusive), reading one chunk per query"""
+    for offset in range(first, last + 1, chunk_size):
+        length = min(chunk_size, last + 1 - offset)
+        # Database substring positions start from 1
+        chunk = Substr("content", offset + 1, length, output_field=BinaryField())
+        yield bytes(Document.objects.filter(id=document_id).values_list(chunk, flat=True).get())
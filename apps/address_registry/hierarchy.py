@@ -0,0 +1,106 @@
+"""
+hierarchy.py
+Maintenance of AdministrativeHierarchy - denormalized lineage of counties, municipalities and elderships.
+
+Rows of changed units and their descendants are rebuilt by signals (refresh_administrative_hierarchy), titles and
+codes are updated when administrative units change. Whole table is rebuilt by rebuild_administrative_hierarchy
+(`manage.py rebuild_administrative_hierarchy`), e.g. after data is changed without sending model signals.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+
+from django.apps import apps as django_apps
+from django.db import models, transaction
+from django.db.models import QuerySet
+
+from apps.address_registry.models import AdministrativeHierarchy, AdministrativeLevel, AdministrativeUnit
+
+HIERARCHY_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class HierarchyLevel:
+    level: str
+    model_name: str
+    # Lookup prefix from the unit of this level to each level of its lineage (including itself)
+    lineage: dict[str, str]
+
+
+HIERARCHY_LEVELS = (
+    HierarchyLevel(AdministrativeLevel.COUNTY, "County", {"county": ""}),
+    HierarchyLevel(AdministrativeLevel.MUNICIPALITY, "Municipality", {"county": "county__", "municipality": ""}),
+    HierarchyLevel(
+        AdministrativeLevel.ELDERSHIP,
+        "Eldership",
+        {"county": "municipality__county__", "municipality": "municipality__", "eldership": ""},
+    ),
+)
+
+
+def _get_lookups(hierarchy_level: HierarchyLevel) -> dict[str, str]:
+    """Returns AdministrativeHierarchy field names mapped to lookups of the unit model"""
+    lookups = {}
+    for name, prefix in hierarchy_level.lineage.items():
+        lookups[f"{name}_id"] = f"{prefix}id"
+        lookups[f"{name}_admin_unit_id"] = f"{prefix}admin_unit_id"
+        lookups[f"{name}_title"] = f"{prefix}admin_unit__title"
+        lookups[f"{name}_code"] = f"{prefix}admin_unit__code"
+    return lookups
+
+
+def _iter_hierarchy(
+    hierarchy_model: type[models.Model], hierarchy_level: HierarchyLevel, queryset: QuerySet
+) -> Iterator[models.Model]:
+    lookups = _get_lookups(hierarchy_level)
+    for row in queryset.values(*lookups.values()).iterator(chunk_size=HIERARCHY_BATCH_SIZE):
+        yield hierarchy_model(level=hierarchy_level.level, **{field: row[lookup] for field, lookup in lookups.items()})
+
+
+def _bulk_create(hierarchy_model: type[models.Model], objects: Iterable[models.Model]) -> int:
+    created = 0
+    objects = iter(objects)
+    while batch := list(islice(objects, HIERARCHY_BATCH_SIZE)):
+        hierarchy_model.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def rebuild_administrative_hierarchy() -> int:
+    """Rebuilds the whole hierarchy table, returns number of rows"""
+    created = 0
+    with transaction.atomic():
+        AdministrativeHierarchy.objects.all().delete()
+        for hierarchy_level in HIERARCHY_LEVELS:
+            queryset = django_apps.get_model("address_registry", hierarchy_level.model_name).objects.order_by("id")
+            created += _bulk_create(
+                AdministrativeHierarchy, _iter_hierarchy(AdministrativeHierarchy, hierarchy_level, queryset)
+            )
+    return created
+
+
+def refresh_administrative_hierarchy(model: type[models.Model], ids: Iterable[int]) -> None:
+    """Rebuilds hierarchy rows of given counties, municipalities or elderships and of all their descendants"""
+    name = model._meta.model_name
+    ids = iter(ids)
+    with transaction.atomic():
+        while batch := list(islice(ids, HIERARCHY_BATCH_SIZE)):
+            AdministrativeHierarchy.objects.filter(**{f"{name}__in": batch}).delete()
+            for hierarchy_level in HIERARCHY_LEVELS:
+                if name not in hierarchy_level.lineage:
+                    continue
+                queryset = django_apps.get_model("address_registry", hierarchy_level.model_name).objects.filter(
+                    **{f"{hierarchy_level.lineage[name]}id__in": batch}
+                )
+                _bulk_create(
+                    AdministrativeHierarchy, _iter_hierarchy(AdministrativeHierarchy, hierarchy_level, queryset)
+                )
+
+
+def update_hierarchy_admin_unit(admin_unit: AdministrativeUnit) -> None:
+    """Updates title and code of administrative unit in all the lineages it is part of"""
+    for name in ("county", "municipality", "eldership"):
+        AdministrativeHierarchy.objects.filter(**{f"{name}_admin_unit": admin_unit}).update(
+            **{f"{name}_title": admin_unit.title, f"{name}_code": admin_unit.code}
+        )
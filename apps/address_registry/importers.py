@@ -0,0 +1,291 @@
+"""
+importers.py
+Bulk import of registry dumps (CSV with header row or NDJSON) using PostgreSQL COPY.
+
+Dump is streamed with COPY into a temporary staging table and merged into the model table with a single
+`INSERT ... SELECT ... ON CONFLICT (id) DO UPDATE` statement, so rows with existing ids are updated and the rest are
+inserted. Rows are never built as model instances, so the dump does not have to fit into memory. Denormalized
+`country_code` is not read from the dump, it is joined from the country table in the same statement.
+
+Columns are given by the CSV header or by the keys of the first NDJSON object and must include `id`. Columns left out
+of the dump keep their values in updated rows. NDJSON lines are copied as jsonb values and converted into staging rows
+with jsonb_populate_record, so values are cast by PostgreSQL the same way for both formats (keys missing from later
+objects are NULL, keys which are not columns are ignored). As with CSV COPY, unquoted empty CSV values are NULL.
+
+Rows are written without model signals, so dependent data (country codes of settlements and administrative units,
+administrative hierarchy) is refreshed in the import transaction. Cached country XML, responses and tiles are
+invalidated after it commits (as done by BulkTestDataGenerator), so they cannot be rebuilt from the old rows.
+"""
+
+import csv
+import json
+from collections.abc import Iterable
+from typing import IO
+
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, models, transaction
+from django.db.backends.utils import CursorWrapper
+
+from apps.address_registry.helpers import invalidate_countries_xml, invalidate_model_response_cache
+from apps.address_registry.hierarchy import rebuild_administrative_hierarchy, refresh_administrative_hierarchy
+from apps.address_registry.models import (
+    Administration,
+    AdministrativeUnit,
+    Continent,
+    Country,
+    County,
+    Eldership,
+    Municipality,
+    Settlement,
+    Title,
+)
+from apps.address_registry.tiles import tile_cache
+
+# Size of chunks of the dump sent to the database
+COPY_CHUNK_SIZE = 1024 * 1024
+# Denormalized fields filled from the related country
+COUNTRY_CODE_FIELD = "country_code"
+# Models whose changes are visible in map tiles
+TILE_MODELS = (AdministrativeUnit, County, Municipality, Eldership)
+
+
+class ImportFormat:
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+IMPORT_FORMATS = (ImportFormat.CSV, ImportFormat.NDJSON)
+IMPORT_CONTENT_TYPES = {"text/csv": ImportFormat.CSV, "application/x-ndjson": ImportFormat.NDJSON}
+IMPORTABLE_MODELS = (
+    Continent,
+    Country,
+    Settlement,
+    Title,
+    AdministrativeUnit,
+    Administration,
+    County,
+    Municipality,
+    Eldership,
+)
+
+
+class BulkImportError(Exception):
+    pass
+
+
+class _PrefixedStream:
+    """Readable stream of bytes already read from `stream` (e.g. header line) followed by the rest of it"""
+
+    def __init__(self, prefix: bytes, stream: IO[bytes]):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if self.prefix:
+            data, self.prefix = self.prefix, b""
+            return data
+        return self.stream.read(size)
+
+
+def _quote(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+class BulkImporter:
+    def __init__(self, model: type[models.Model]):
+        if not self.supports(model):
+            raise BulkImportError(f"Data of model {model.__name__} cannot be imported")
+        self.model = model
+        self.fields = {
+            field.attname: field for field in model._meta.concrete_fields if field.attname != COUNTRY_CODE_FIELD
+        }
+        self.has_country_code = any(field.attname == COUNTRY_CODE_FIELD for field in model._meta.concrete_fields)
+        self.table = model._meta.db_table
+        self.staging_table = f"import_{self.table}"
+        self._raw_table = f"{self.staging_table}_raw"
+
+    @staticmethod
+    def supports(model: type[models.Model]) -> bool:
+        return model in IMPORTABLE_MODELS
+
+    def import_stream(self, stream: IO[bytes], import_format: str) -> int:
+        """Imports dump read from binary stream, returns number of imported (inserted or updated) rows"""
+        if import_format not in IMPORT_FORMATS:
+            raise BulkImportError(f"Unknown import format {import_format!r}, expected one of {IMPORT_FORMATS}")
+        if connection.vendor != "postgresql":
+            raise BulkImportError("Bulk import requires PostgreSQL database")
+
+        first_line = stream.readline()
+        fields = self._get_fields(self._read_columns(first_line, import_format))
+
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                self._create_staging_table(cursor, fields)
+                if import_format == ImportFormat.CSV:
+                    # Header line has been read already
+                    self._copy(cursor, f"{_quote(self.staging_table)} ({self._columns_sql(fields)})", stream)
+                else:
+                    self._copy_ndjson(cursor, _PrefixedStream(first_line, stream))
+                imported = self._upsert(cursor, fields)
+                # Foreign keys are checked now rather than on commit, which might be later when run in a transaction
+                connection.check_constraints(table_names=[self.table])
+                for sql in connection.ops.sequence_reset_sql(no_style(), [self.model]):
+                    cursor.execute(sql)
+                self._refresh_dependent_data(cursor)
+                country_ids = self._get_changed_country_ids(cursor)
+                self._drop_staging_tables(cursor, import_format)
+        except DatabaseError as exception:
+            # Invalid values, unknown related objects or repeated ids
+            raise BulkImportError(str(exception).strip()) from exception
+
+        self._invalidate_caches(country_ids)
+        return imported
+
+    @staticmethod
+    def _read_columns(first_line: bytes, import_format: str) -> list[str]:
+        """Columns are given by CSV header or keys of the first NDJSON object"""
+        if not first_line.strip():
+            raise BulkImportError("Dump is empty")
+        try:
+            if import_format == ImportFormat.CSV:
+                return next(csv.reader([first_line.decode("utf-8-sig")]))
+            return list(json.loads(first_line))
+        except (ValueError, TypeError) as exception:
+            raise BulkImportError(f"Columns cannot be read from the first line: {exception}") from exception
+
+    def _get_fields(self, columns: list[str]) -> list[models.Field]:
+        columns = [column.strip() for column in columns]
+        if unknown := [column for column in columns if column not in self.fields]:
+            raise BulkImportError(f"Unknown columns {unknown}, expected any of {list(self.fields)}")
+        if len(set(columns)) != len(columns):
+            raise BulkImportError("Columns are repeated")
+
+        pk_name = self.model._meta.pk.attname
+        if pk_name not in columns:
+            raise BulkImportError(f"Column {pk_name!r} is required")
+        # Rows are checked for NOT NULL constraints before conflicts with existing rows, so required fields must be
+        # given even for rows which are only updated
+        if missing := [
+            name
+            for name, field in self.fields.items()
+            if name not in columns and not field.null and not self._is_generated(field)
+        ]:
+            raise BulkImportError(f"Required columns {missing} are missing")
+        return [self.fields[column] for column in columns]
+
+    @staticmethod
+    def _is_generated(field: models.Field) -> bool:
+        """UUIDs of new rows are generated in the database when they are not given"""
+        return isinstance(field, models.UUIDField) and field.has_default()
+
+    def _columns_sql(self, fields: Iterable[models.Field], prefix: str = "") -> str:
+        return ", ".join(f"{prefix}{_quote(field.column)}" for field in fields)
+
+    def _create_staging_table(self, cursor: CursorWrapper, fields: list[models.Field]) -> None:
+        columns = ", ".join(f"{_quote(field.column)} {field.db_type(connection)}" for field in fields)
+        cursor.execute(f"CREATE TEMPORARY TABLE {_quote(self.staging_table)} ({columns}) ON COMMIT DROP")
+
+    def _drop_staging_tables(self, cursor: CursorWrapper, import_format: str) -> None:
+        """Tables are dropped on commit, but an outer transaction might import more data before it is committed"""
+        cursor.execute(f"DROP TABLE {_quote(self.staging_table)}")
+        if import_format == ImportFormat.NDJSON:
+            cursor.execute(f"DROP TABLE {_quote(self._raw_table)}")
+
+    @staticmethod
+    def _copy(cursor: CursorWrapper, target: str, stream: IO[bytes], options: str = "") -> None:
+        sql = f"COPY {target} FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8'{options})"
+        # Errors of the driver's cursor are converted to django.db errors as done by CursorWrapper
+        with connection.wrap_database_errors:
+            if hasattr(cursor.cursor, "copy_expert"):
+                # psycopg2
+                cursor.cursor.copy_expert(sql, stream, size=COPY_CHUNK_SIZE)
+                return
+            with cursor.cursor.copy(sql) as copy:
+                while data := stream.read(COPY_CHUNK_SIZE):
+                    copy.write(data)
+
+    def _copy_ndjson(self, cursor: CursorWrapper, stream: IO[bytes] | _PrefixedStream) -> None:
+        raw_table = _quote(self._raw_table)
+        cursor.execute(f"CREATE TEMPORARY TABLE {raw_table} (doc jsonb) ON COMMIT DROP")
+        # Each line is a single CSV value: quote and delimiter are control characters which are escaped in JSON
+        self._copy(cursor, f"{raw_table} (doc)", stream, options=", QUOTE e'\\x01', DELIMITER e'\\x02'")
+        cursor.execute(
+            f"INSERT INTO {_quote(self.staging_table)} "
+            f"SELECT staged.* FROM {raw_table}, "
+            f"jsonb_populate_record(NULL::{_quote(self.staging_table)}, {raw_table}.doc) AS staged "
+            # Empty lines
+            f"WHERE {raw_table}.doc IS NOT NULL"
+        )
+
+    def _upsert(self, cursor: CursorWrapper, fields: list[models.Field]) -> int:
+        staging_table = _quote(self.staging_table)
+        cursor.execute(f"SELECT count(*) FROM {staging_table}")
+        (staged,) = cursor.fetchone()
+
+        columns = self._columns_sql(fields)
+        select = self._columns_sql(fields, prefix=f"{staging_table}.")
+        joins = ""
+        if self.has_country_code:
+            country_table = _quote(Country._meta.db_table)
+            columns += f", {_quote(COUNTRY_CODE_FIELD)}"
+            select += f", {country_table}.{_quote('code')}"
+            joins = f" JOIN {country_table} ON {country_table}.{_quote('id')} = {staging_table}.{_quote('country_id')}"
+        for field in self.fields.values():
+            if field not in fields and self._is_generated(field):
+                # Not updated on conflict, so existing rows keep their UUIDs
+                columns += f", {_quote(field.column)}"
+                select += ", gen_random_uuid()"
+
+        pk_column = _quote(self.model._meta.pk.column)
+        updates = ", ".join(
+            f"{_quote(column)} = EXCLUDED.{_quote(column)}"
+            for column in [field.column for field in fields if not field.primary_key]
+            + ([COUNTRY_CODE_FIELD] if self.has_country_code else [])
+        )
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        cursor.execute(
+            f"INSERT INTO {_quote(self.table)} ({columns}) SELECT {select} FROM {staging_table}{joins} "
+            f"ON CONFLICT ({pk_column}) {conflict}"
+        )
+        imported = cursor.rowcount
+        if self.has_country_code and imported < staged:
+            raise BulkImportError(f"{staged - imported} rows refer to countries which do not exist")
+        return imported
+
+    def _get_staged_ids(self, cursor: CursorWrapper) -> list[int]:
+        cursor.execute(f"SELECT {_quote(self.model._meta.pk.column)} FROM {_quote(self.staging_table)}")
+        return [row[0] for row in cursor.fetchall()]
+
+    def _refresh_dependent_data(self, cursor: CursorWrapper) -> None:
+        if self.model is Country:
+            # Country codes might have changed
+            country_table = _quote(Country._meta.db_table)
+            for model in (Settlement, AdministrativeUnit):
+                table = _quote(model._meta.db_table)
+                code = _quote(COUNTRY_CODE_FIELD)
+                cursor.execute(
+                    f"UPDATE {table} SET {code} = {country_table}.{_quote('code')} "
+                    f"FROM {country_table} JOIN {_quote(self.staging_table)} USING ({_quote('id')}) "
+                    f"WHERE {table}.{_quote('country_id')} = {country_table}.{_quote('id')} "
+                    f"AND {table}.{code} <> {country_table}.{_quote('code')}"
+                )
+        elif self.model in (County, Municipality, Eldership):
+            refresh_administrative_hierarchy(self.model, self._get_staged_ids(cursor))
+        elif self.model is AdministrativeUnit:
+            # Titles and codes of units are copied to hierarchy rows of all levels
+            rebuild_administrative_hierarchy()
+
+    def _get_changed_country_ids(self, cursor: CursorWrapper) -> list[int]:
+        """Returns ids of countries whose XML might have changed"""
+        if self.model is Country:
+            return self._get_staged_ids(cursor)
+        if self.model is Continent:
+            return list(Country.objects.filter(continent__in=self._get_staged_ids(cursor)).values_list("id", flat=True))
+        return []
+
+    def _invalidate_caches(self, country_ids: list[int]) -> None:
+        if country_ids:
+            invalidate_countries_xml(country_ids)
+        invalidate_model_response_cache(self.model)
+        if self.model in TILE_MODELS:
+            tile_cache.invalidate()
@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from apps.utils.json_renderers import JSON_BACKENDS, JsonBackend
+
+BENCHMARK_ENDPOINTS = (
+    "/api/v1/documents/?all=true",
+    "/api/v1/settlements/?all=true",
+    "/api/v1/cities/json/cities",
+    "/api/v1/documents/json/documents",
+    "/api/v1/countries/json/countries",
+)
+
+
+class Command(BaseCommand):
+    help = "Compares response times of JSON endpoints rendered with each of JSON_BACKEND encoders"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--repeat", type=int, default=5, help="Number of requests sent to each endpoint")
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            help="Endpoint path, can be given several times. Defaults to all JSON endpoints",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be a positive number")
+
+        client = APIClient()
+        # Not saved user - authentication does not depend on database and is the same for each backend
+        client.force_authenticate(User(username="benchmark", is_active=True))
+
+        for endpoint in options["endpoints"] or BENCHMARK_ENDPOINTS:
+            timings = {}
+            for backend in JSON_BACKENDS:
+                # Response cache would hide encoding time
+                with override_settings(JSON_BACKEND=backend, SPYNE_RESPONSE_CACHE_TIMEOUT=0):
+                    timings[backend], size = self._measure(client, endpoint, options["repeat"])
+                self.stdout.write(f"{endpoint} {backend}: {timings[backend]:.1f} ms, {size} bytes")
+
+            speedup = timings[JsonBackend.STDLIB] / max(timings[JsonBackend.ORJSON], 0.001)
+            self.stdout.write(f"{endpoint} speedup: {speedup:.2f}x")
+
+    @staticmethod
+    def _measure(client: APIClient, endpoint: str, repeat: int) -> tuple[float, int]:
+        """Returns best response time in milliseconds and response size"""
+        best = float("inf")
+        size = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(endpoint)
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+            best = min(best, (time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"{endpoint} responded with status {response.status_code}")
+            size = len(content)
+        return best, size
@@ -0,0 +1,46 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.address_registry.generators import BulkTestDataGenerator
+
+
+class Command(BaseCommand):
+    help = "Generates large amounts of test data for given model using bulk inserts"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("model", help="Model in app_label.model_name format, e.g. address_registry.eldership")
+        parser.add_argument("quantity", type=int)
+        parser.add_argument(
+            "--fan-out",
+            type=int,
+            default=1,
+            help="Number of children created for each parent. Parents are not shared between chunks",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows inserted per query")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100_000,
+            help="Number of objects kept in memory and committed in a single transaction",
+        )
+
+    def handle(self, *args, **options) -> None:
+        for option in ("quantity", "fan_out", "batch_size", "chunk_size"):
+            if options[option] < 1:
+                raise CommandError(f"{option.replace('_', '-')} must be a positive number")
+
+        try:
+            model_class = django_apps.get_model(options["model"])
+        except (LookupError, ValueError) as exception:
+            raise CommandError(f"Django model '{options['model']}' does not exist") from exception
+
+        if not BulkTestDataGenerator.supports(model_class):
+            raise CommandError(f"Test data for model {model_class.__name__} cannot be generated")
+
+        generator = BulkTestDataGenerator(fan_out=options["fan_out"], batch_size=options["batch_size"])
+        generated = 0
+        while generated < options["quantity"]:
+            quantity = min(options["chunk_size"], options["quantity"] - generated)
+            generator.generate(model_class, quantity)
+            generated += quantity
+            self.stdout.write(f"Generated {generated}/{options['quantity']} {model_class._meta.verbose_name_plural}")
@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.address_registry.importers import IMPORT_FORMATS, BulkImporter, BulkImportError, ImportFormat
+
+FORMAT_SUFFIXES = {".csv": ImportFormat.CSV, ".ndjson": ImportFormat.NDJSON, ".jsonl": ImportFormat.NDJSON}
+
+
+class Command(BaseCommand):
+    help = "Imports CSV or NDJSON dump of given model using PostgreSQL COPY, rows with existing ids are updated"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("model", help="Model in app_label.model_name format, e.g. address_registry.settlement")
+        parser.add_argument("path", help="Path of the dump, - to read from standard input")
+        parser.add_argument(
+            "--format", choices=IMPORT_FORMATS, help="Format of the dump, by default guessed from the file extension"
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            model_class = django_apps.get_model(options["model"])
+        except (LookupError, ValueError) as exception:
+            raise CommandError(f"Django model '{options['model']}' does not exist") from exception
+
+        if not BulkImporter.supports(model_class):
+            raise CommandError(f"Data of model {model_class.__name__} cannot be imported")
+
+        path = options["path"]
+        import_format = options["format"] or FORMAT_SUFFIXES.get(Path(path).suffix.lower())
+        if import_format is None:
+            raise CommandError(f"Format of '{path}' cannot be guessed, use --format")
+
+        try:
+            if path == "-":
+                imported = BulkImporter(model_class).import_stream(sys.stdin.buffer, import_format)
+            else:
+                with open(path, "rb") as file:
+                    imported = BulkImporter(model_class).import_stream(file, import_format)
+        except (BulkImportError, OSError) as exception:
+            raise CommandError(str(exception)) from exception
+
+        self.stdout.write(f"Imported {imported} {model_class._meta.verbose_name_plural}")
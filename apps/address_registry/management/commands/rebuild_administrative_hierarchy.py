@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.address_registry.hierarchy import rebuild_administrative_hierarchy
+
+
+class Command(BaseCommand):
+    help = "Rebuilds denormalized lineage of counties, municipalities and elderships (AdministrativeHierarchy)"
+
+    def handle(self, *args, **options) -> None:
+        created = rebuild_administrative_hierarchy()
+        self.stdout.write(f"Administrative hierarchy rebuilt, {created} rows")
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:09
+
+import apps.utils.search
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension, UnaccentExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Indexes are created concurrently, so that large tables are not locked for writes
+    atomic = False
+
+    dependencies = [
+        ('address_registry', '0004_alter_country_continent_alter_settlement_country'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        # unaccent() is only STABLE, so it can not be used in index expressions directly
+        migrations.RunSQL(
+            sql=(
+                "CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS "
+                "$$ SELECT public.unaccent('public.unaccent', $1) $$ "
+                "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;"
+            ),
+            reverse_sql="DROP FUNCTION IF EXISTS immutable_unaccent(text);",
+        ),
+        AddIndexConcurrently(
+            model_name='country',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title_lt'), name='gin_trgm_ops'), name='country_title_lt_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='country',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(apps.utils.search.ImmutableUnaccent('title_lt')), name='gin_trgm_ops'), name='country_title_lt_unacc_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='documentauthor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='doc_author_name_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='documentauthor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(apps.utils.search.ImmutableUnaccent('name')), name='gin_trgm_ops'), name='doc_author_name_unacc_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='documentauthor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('surname'), name='gin_trgm_ops'), name='doc_author_surname_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='documentauthor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(apps.utils.search.ImmutableUnaccent('surname')), name='gin_trgm_ops'), name='doc_author_surname_unacc_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='settlement',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title_lt'), name='gin_trgm_ops'), name='settlement_title_lt_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='settlement',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(apps.utils.search.ImmutableUnaccent('title_lt')), name='gin_trgm_ops'), name='settlement_title_lt_unacc_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='title',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='title_title_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='title',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(apps.utils.search.ImmutableUnaccent('title')), name='gin_trgm_ops'), name='title_title_unacc_trgm'),
+        ),
+    ]
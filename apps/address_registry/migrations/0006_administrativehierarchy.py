@@ -0,0 +1,68 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:54
+
+from itertools import islice
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+# Level, model name and lookup prefix from the unit to each level of its lineage (including itself)
+HIERARCHY_LEVELS = (
+    ("COUNTY", "County", {"county": ""}),
+    ("MUNICIPALITY", "Municipality", {"county": "county__", "municipality": ""}),
+    ("ELDERSHIP", "Eldership", {"county": "municipality__county__", "municipality": "municipality__", "eldership": ""}),
+)
+
+
+def build_administrative_hierarchy(apps, schema_editor):
+    AdministrativeHierarchy = apps.get_model("address_registry", "AdministrativeHierarchy")
+    for level, model_name, lineage in HIERARCHY_LEVELS:
+        lookups = {}
+        for name, prefix in lineage.items():
+            lookups[f"{name}_id"] = f"{prefix}id"
+            lookups[f"{name}_admin_unit_id"] = f"{prefix}admin_unit_id"
+            lookups[f"{name}_title"] = f"{prefix}admin_unit__title"
+            lookups[f"{name}_code"] = f"{prefix}admin_unit__code"
+
+        queryset = apps.get_model("address_registry", model_name).objects.order_by("id")
+        rows = queryset.values(*lookups.values()).iterator(chunk_size=BATCH_SIZE)
+        while batch := list(islice(rows, BATCH_SIZE)):
+            AdministrativeHierarchy.objects.bulk_create(
+                AdministrativeHierarchy(level=level, **{field: row[lookup] for field, lookup in lookups.items()})
+                for row in batch
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address_registry', '0005_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdministrativeHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.CharField(choices=[('COUNTY', 'County'), ('MUNICIPALITY', 'Municipality'), ('ELDERSHIP', 'Eldership')], max_length=255)),
+                ('county_title', models.CharField(max_length=255)),
+                ('county_code', models.FloatField(null=True)),
+                ('municipality_title', models.CharField(blank=True, max_length=255)),
+                ('municipality_code', models.FloatField(null=True)),
+                ('eldership_title', models.CharField(blank=True, max_length=255)),
+                ('eldership_code', models.FloatField(null=True)),
+                ('county', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='address_registry.county')),
+                ('county_admin_unit', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='address_registry.administrativeunit')),
+                ('eldership', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='address_registry.eldership')),
+                ('eldership_admin_unit', models.ForeignKey(null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='address_registry.administrativeunit')),
+                ('municipality', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='address_registry.municipality')),
+                ('municipality_admin_unit', models.ForeignKey(null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='address_registry.administrativeunit')),
+            ],
+            options={
+                'verbose_name': 'Administrative Hierarchy',
+                'verbose_name_plural': 'Administrative Hierarchy',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('level', 'COUNTY')), fields=('county',), name='administrative_hierarchy_county_uniq'), models.UniqueConstraint(condition=models.Q(('level', 'MUNICIPALITY')), fields=('municipality',), name='administrative_hierarchy_municipality_uniq'), models.UniqueConstraint(fields=('eldership',), name='administrative_hierarchy_eldership_uniq')],
+            },
+        ),
+        migrations.RunPython(build_administrative_hierarchy, migrations.RunPython.noop),
+    ]
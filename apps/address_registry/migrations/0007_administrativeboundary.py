@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:06
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address_registry', '0006_administrativehierarchy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdministrativeBoundary',
+            fields=[
+                ('admin_unit', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='boundary', serialize=False, to='address_registry.administrativeunit')),
+                ('geometry', django.contrib.gis.db.models.fields.PolygonField(srid=4326)),
+            ],
+            options={
+                'verbose_name': 'Administrative Boundary',
+                'verbose_name_plural': 'Administrative Boundaries',
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:29
+
+from django.db import migrations, models
+from django.db.models.functions import MD5, Length
+
+
+def fill_content_digest(apps, schema_editor):
+    # Calculated in the database, so that contents of existing documents are not transferred
+    Document = apps.get_model("address_registry", "Document")
+    Document.objects.update(content_size=Length("content"), content_hash=MD5("content", output_field=models.CharField()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address_registry', '0007_administrativeboundary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='MD5 hash of content', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='content_size',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_content_digest, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
-import random
+import hashlib
 from uuid import uuid4
 
+from django.contrib.gis.db import models as gis_models
 from django.db import models
-from model_bakery.baker import make_recipe
+
+from apps.utils.search import trigram_index, unaccent_trigram_index
 
 
 class SettlementType(models.TextChoices):
@@ -37,11 +39,15 @@ class DocumentStatus(models.TextChoices):
 
 class GenerateTestDataMixin:
     @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs):
-        raise NotImplementedError("generate_test_data method is not implemented")
+    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list:
+        """Generates test data in bulk, kwargs are passed to BulkTestDataGenerator (e.g. fan_out, batch_size)"""
+        # Imported here, because generators module depends on models
+        from apps.address_registry.generators import BulkTestDataGenerator
+
+        return BulkTestDataGenerator(**kwargs).generate(cls, quantity)
 
 
-class Continent(models.Model):
+class Continent(GenerateTestDataMixin, models.Model):
     code = models.IntegerField(primary_key=True, unique=True)
     name = models.CharField(max_length=255)
 
@@ -58,19 +64,14 @@ class Continent(models.Model):
             "name": self.name,
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["Continent"]:
-        return make_recipe(
-            "address_registry.continent",
-            _fill_optional=True,
-            _quantity=quantity,
-        )
-
 
-class Document(models.Model):
+class Document(GenerateTestDataMixin, models.Model):
     number = models.CharField(max_length=255)
     received = models.DateField()
     content = models.BinaryField()
+    # Filled from content on save, so that lists do not have to read content
+    content_size = models.PositiveBigIntegerField(default=0, editable=False)
+    content_hash = models.CharField(max_length=32, blank=True, editable=False, help_text="MD5 hash of content")
     status = models.CharField(choices=DocumentStatus.choices, max_length=255)  # type: ignore
     type = models.CharField(choices=DocumentType.choices, max_length=255)  # type: ignore
     creation_date = models.DateField()
@@ -83,27 +84,33 @@ class Document(models.Model):
     def __str__(self) -> str:
         return self.number
 
-    def to_dict(self) -> dict:
+    def save(self, *args, **kwargs) -> None:
+        if "content" not in self.get_deferred_fields():
+            self.set_content_digest()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {"content_size", "content_hash"}.union(update_fields)
+        return super().save(*args, **kwargs)
+
+    def set_content_digest(self) -> None:
+        """Fills content size and hash, called by save(), has to be called before bulk_create()"""
+        content = self.content or b""
+        self.content_size = len(content)
+        self.content_hash = hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+    def to_dict(self, with_content: bool = True) -> dict:
         return {
             "id": self.id,
             "number": self.number,
             "received": self.received,
-            "content": self.content,
+            **({"content": self.content} if with_content else {}),
             "status": self.status,
             "type": self.type,
             "creation_date": self.creation_date,
             "creation_time": self.creation_time,
         }
 
-    # TODO: Add test data generators
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["Document"]:
-        return make_recipe(
-            "address_registry.document_author",
-            _fill_optional=True,
-            _quantity=quantity,
-        )
-
 
 class DocumentAuthor(models.Model):
     name = models.CharField(max_length=255)
@@ -114,6 +121,12 @@ class DocumentAuthor(models.Model):
     class Meta:
         verbose_name = "Document Author"
         verbose_name_plural = "Document Authors"
+        indexes = [
+            trigram_index("name", name="doc_author_name_trgm"),
+            unaccent_trigram_index("name", name="doc_author_name_unacc_trgm"),
+            trigram_index("surname", name="doc_author_surname_trgm"),
+            unaccent_trigram_index("surname", name="doc_author_surname_unacc_trgm"),
+        ]
 
     def __str__(self) -> str:
         return f"Author: {self.name} {self.surname}"
@@ -128,7 +141,7 @@ class DocumentAuthor(models.Model):
         }
 
 
-class Country(models.Model):
+class Country(GenerateTestDataMixin, models.Model):
     code = models.CharField(max_length=50)
     title = models.CharField(max_length=255)
     title_lt = models.CharField(max_length=255)
@@ -138,6 +151,10 @@ class Country(models.Model):
     class Meta:
         verbose_name = "Country"
         verbose_name_plural = "Countries"
+        indexes = [
+            trigram_index("title_lt", name="country_title_lt_trgm"),
+            unaccent_trigram_index("title_lt", name="country_title_lt_unacc_trgm"),
+        ]
 
     def __str__(self) -> str:
         return self.code
@@ -152,25 +169,8 @@ class Country(models.Model):
             "continent_id": self.continent_id,
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["Country"]:
-        countries = []
-        for _ in range(quantity):
-            continent = kwargs.get("continent") or Continent.generate_test_data()[0]
-
-            country = make_recipe(
-                "address_registry.country",
-                code=random.random(),
-                continent=continent,
-                _fill_optional=True,
-            )
-
-            countries.append(country)
-
-        return countries
 
-
-class Settlement(models.Model):
+class Settlement(GenerateTestDataMixin, models.Model):
     registered = models.DateField(null=True)
     deregistered = models.DateField(null=True)
     title_lt = models.CharField(max_length=255)
@@ -182,6 +182,10 @@ class Settlement(models.Model):
     class Meta:
         verbose_name = "Settlement"
         verbose_name_plural = "Settlements"
+        indexes = [
+            trigram_index("title_lt", name="settlement_title_lt_trgm"),
+            unaccent_trigram_index("title_lt", name="settlement_title_lt_unacc_trgm"),
+        ]
 
     def __str__(self) -> str:
         return self.title_lt
@@ -206,26 +210,8 @@ class Settlement(models.Model):
             "country_code": self.country_code,
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["Settlement"]:
-        settlements = []
-        for _ in range(quantity):
-            country = kwargs.get("country") or Country.generate_test_data()[0]
-
-            settlement = make_recipe(
-                "address_registry.settlement",
-                country=country,
-                _fill_optional=True,
-            )
 
-            make_recipe("address_registry.title", _fill_optional=True, settlement=settlement)
-
-            settlements.append(settlement)
-
-        return settlements
-
-
-class Title(models.Model):
+class Title(GenerateTestDataMixin, models.Model):
     title = models.CharField(max_length=255)
     accented = models.CharField(max_length=255)
     grammatical_case = models.CharField(choices=GrammaticalCase.choices, max_length=255)  # type: ignore
@@ -234,6 +220,10 @@ class Title(models.Model):
     class Meta:
         verbose_name = "Title"
         verbose_name_plural = "Titles"
+        indexes = [
+            trigram_index("title", name="title_title_trgm"),
+            unaccent_trigram_index("title", name="title_title_unacc_trgm"),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -247,12 +237,8 @@ class Title(models.Model):
             "settlement_id": getattr(self, "settlement_id", None),
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["Title"]:
-        return make_recipe("address_registry.title", _fill_optional=True, _quantity=quantity)
-
 
-class AdministrativeUnit(models.Model):
+class AdministrativeUnit(GenerateTestDataMixin, models.Model):
     uuid = models.UUIDField(unique=True, editable=False, default=uuid4)
     code = models.FloatField(null=True)
     registered = models.DateField(null=True)
@@ -293,24 +279,28 @@ class AdministrativeUnit(models.Model):
             "country_id": getattr(self, "country_id", None),
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["AdministrativeUnit"]:
-        administrative_units = []
-        for _ in range(quantity):
-            settlement = kwargs.get("settlement") or Settlement.generate_test_data()[0]
-            administrative_unit = make_recipe(
-                "address_registry.administrative_unit",
-                type=kwargs.get("type", "ADMINISTRATION"),
-                country=settlement.country,
-                centre=settlement,
-                _fill_optional=True,
-            )
-            administrative_units.append(administrative_unit)
-
-        return administrative_units
-
-
-class Administration(models.Model):
+
+class AdministrativeBoundary(models.Model):
+    """
+    Boundary of administrative unit. Kept in a separate table, so that polygons are not loaded (and not exposed by
+    response models derived from AdministrativeUnit) whenever units are read.
+    """
+
+    admin_unit = models.OneToOneField(
+        AdministrativeUnit, on_delete=models.CASCADE, primary_key=True, related_name="boundary"
+    )
+    # Spatial (GiST) index is created for geometry fields by default
+    geometry = gis_models.PolygonField(srid=4326)
+
+    class Meta:
+        verbose_name = "Administrative Boundary"
+        verbose_name_plural = "Administrative Boundaries"
+
+    def __str__(self) -> str:
+        return str(self.admin_unit)
+
+
+class Administration(GenerateTestDataMixin, models.Model):
     country = models.ForeignKey(Country, on_delete=models.CASCADE)
     admin_unit = models.ForeignKey(AdministrativeUnit, on_delete=models.CASCADE)
 
@@ -328,27 +318,8 @@ class Administration(models.Model):
             "admin_unit_id": self.admin_unit_id,
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["Administration"]:
-        administrations = []
-        for _ in range(quantity):
-            admin_unit = (
-                kwargs.get("Administration")
-                or AdministrativeUnit.generate_test_data(quantity=1, type="ADMINISTRATION")[0]
-            )
-            administration = make_recipe(
-                "address_registry.administration",
-                admin_unit=admin_unit,
-                country=admin_unit.country,
-                _fill_optional=True,
-            )
-
-            administrations.append(administration)
-
-        return administrations
-
-
-class County(models.Model):
+
+class County(GenerateTestDataMixin, models.Model):
     admin_unit = models.ForeignKey(AdministrativeUnit, on_delete=models.CASCADE)
 
     class Meta:
@@ -361,25 +332,8 @@ class County(models.Model):
     def to_dict(self) -> dict:
         return {"id": self.id, "admin_unit_id": self.admin_unit_id, **self.admin_unit.to_dict()}
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["AdministrativeUnit"]:
-        counties = []
-        for _ in range(quantity):
-            settlement = kwargs.get("settlement") or Settlement.generate_test_data()[0]
-
-            admin_unit = AdministrativeUnit.generate_test_data(quantity=1, settlement=settlement, type="COUNTY")[0]
-
-            county = make_recipe(
-                "address_registry.county",
-                admin_unit=admin_unit,
-                _fill_optional=True,
-            )
-
-            counties.append(county)
-        return counties
-
 
-class Municipality(models.Model):
+class Municipality(GenerateTestDataMixin, models.Model):
     county = models.ForeignKey(County, on_delete=models.CASCADE)
     admin_unit = models.ForeignKey(AdministrativeUnit, on_delete=models.CASCADE)
 
@@ -398,28 +352,8 @@ class Municipality(models.Model):
             **self.admin_unit.to_dict(),
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["AdministrativeUnit"]:
-        municipalities = []
-        for _ in range(quantity):
-            settlement = kwargs.get("settlement") or Settlement.generate_test_data()[0]
-            county = County.generate_test_data(quantity=1, settlement=settlement)[0]
-            admin_unit = AdministrativeUnit.generate_test_data(quantity=1, settlement=settlement, type="MUNICIPALITY")[
-                0
-            ]
-
-            municipality = make_recipe(
-                "address_registry.municipality",
-                county=county,
-                admin_unit=admin_unit,
-                _fill_optional=True,
-            )
-
-            municipalities.append(municipality)
-        return municipalities
-
-
-class Eldership(models.Model):
+
+class Eldership(GenerateTestDataMixin, models.Model):
     municipality = models.ForeignKey(Municipality, on_delete=models.CASCADE)
     admin_unit = models.ForeignKey(AdministrativeUnit, on_delete=models.CASCADE)
 
@@ -438,24 +372,56 @@ class Eldership(models.Model):
             **self.admin_unit.to_dict(),
         }
 
-    @classmethod
-    def generate_test_data(cls, quantity: int = 1, **kwargs) -> list["AdministrativeUnit"]:
-        elderships = []
-        for _ in range(quantity):
-            settlement = kwargs.get("settlement") or Settlement.generate_test_data()[0]
-
-            admin_unit = AdministrativeUnit.generate_test_data(quantity=1, settlement=settlement, type="ELDERSHIP")[0]
-
-            municipality = Municipality.generate_test_data(
-                quantity=1,
-                settlement=settlement,
-            )[0]
-
-            eldership = make_recipe(
-                "address_registry.eldership",
-                municipality=municipality,
-                admin_unit=admin_unit,
-                _fill_optional=True,
-            )
-            elderships.append(eldership)
-        return elderships
+
+class AdministrativeLevel(models.TextChoices):
+    COUNTY = "COUNTY"
+    MUNICIPALITY = "MUNICIPALITY"
+    ELDERSHIP = "ELDERSHIP"
+
+
+class AdministrativeHierarchy(models.Model):
+    """
+    Denormalized lineage of counties, municipalities and elderships - one row per each of them with ids, titles and
+    codes of the unit and its ancestors (empty below row's level), so that the hierarchy is read without joins.
+    Maintained by apps.address_registry.hierarchy.
+    """
+
+    level = models.CharField(choices=AdministrativeLevel.choices, max_length=255)
+    county = models.ForeignKey(County, on_delete=models.CASCADE, related_name="+")
+    # Rows are deleted by cascade with their county, municipality or eldership, which are deleted with their
+    # administrative units, so administrative unit relations do not need to cascade
+    county_admin_unit = models.ForeignKey(AdministrativeUnit, on_delete=models.DO_NOTHING, related_name="+")
+    county_title = models.CharField(max_length=255)
+    county_code = models.FloatField(null=True)
+    municipality = models.ForeignKey(Municipality, on_delete=models.CASCADE, null=True, related_name="+")
+    municipality_admin_unit = models.ForeignKey(
+        AdministrativeUnit, on_delete=models.DO_NOTHING, null=True, related_name="+"
+    )
+    municipality_title = models.CharField(max_length=255, blank=True)
+    municipality_code = models.FloatField(null=True)
+    eldership = models.ForeignKey(Eldership, on_delete=models.CASCADE, null=True, related_name="+")
+    eldership_admin_unit = models.ForeignKey(
+        AdministrativeUnit, on_delete=models.DO_NOTHING, null=True, related_name="+"
+    )
+    eldership_title = models.CharField(max_length=255, blank=True)
+    eldership_code = models.FloatField(null=True)
+
+    class Meta:
+        verbose_name = "Administrative Hierarchy"
+        verbose_name_plural = "Administrative Hierarchy"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["county"], condition=models.Q(level="COUNTY"), name="administrative_hierarchy_county_uniq"
+            ),
+            models.UniqueConstraint(
+                fields=["municipality"],
+                condition=models.Q(level="MUNICIPALITY"),
+                name="administrative_hierarchy_municipality_uniq",
+            ),
+            models.UniqueConstraint(fields=["eldership"], name="administrative_hierarchy_eldership_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return " / ".join(
+            title for title in (self.county_title, self.municipality_title, self.eldership_title) if title
+        )
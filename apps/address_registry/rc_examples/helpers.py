@@ -1,30 +1,92 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
+from django.conf import settings
+
+from apps.utils.streaming import iter_base64, iter_file
+
 examples_path_root = Path(__file__).parent
 
-XML_PATH_MAP = {
-    "1687": {
-        "1": examples_path_root / "nirvar/example1.xml",
-        "2": examples_path_root / "nirvar/example2.xml",
-        "3": examples_path_root / "nirvar/example3.xml",
-        "4": examples_path_root / "nirvar/example4.xml",
-        "5": examples_path_root / "nirvar/example5.xml",
-    },
-    "249": {
-        "1": examples_path_root / "jadis/example1.xml",
-        "2": examples_path_root / "jadis/example2.xml",
-        "3": examples_path_root / "jadis/example3.xml",
-        "4": examples_path_root / "jadis/example4.xml",
-        "5": examples_path_root / "jadis/example5.xml",
-    }
+# Example directories named after the register instead of action_type.
+# Directories named with action_type number (e.g. "1687/") are picked up without adding them here.
+ACTION_TYPE_DIRECTORIES = {
+    "nirvar": "1687",
+    "jadis": "249",
 }
 
+EXAMPLE_FILE_NAME_PATTERN = re.compile(r"^example(\d+)\.xml$")
+
+
+@dataclass(frozen=True)
+class XmlExample:
+    path: Path
+    mtime_ns: int
+    data_base64: str
 
-def get_xml_file_path(action_type: str, example_number_str: str) -> Path | None:
+
+class XmlExampleRegistry:
     """
-    Returns XML Path based on action_type and caller_code.
-        action_type - predefined string with integer, based on https://ws.registrucentras.lt/broker/info.php
-        example_number_str - string with integer that determines which example file to use, if
-                             multiple example files exist for same action_type
+    Keeps base64 encoded RC broker XML examples in memory, so they are not read and encoded on each request.
+    Examples are found by scanning `root` directory - <action_type directory>/example<number>.xml.
+    Directory is rescanned at most every `reload_interval` seconds (never if None) and changed (by mtime), new and
+    removed files are reloaded.
     """
-    return XML_PATH_MAP.get(action_type, {}).get(example_number_str)
+
+    def __init__(self, root: Path, reload_interval: float | None = None):
+        self.root = root
+        self.reload_interval = reload_interval
+        self._examples: dict[tuple[str, str], XmlExample] = {}
+        self._scanned_at: float | None = None
+        self._lock = threading.Lock()
+
+    def get_base64(self, action_type: str, example_number_str: str) -> str | None:
+        """
+        Returns base64 encoded XML based on action_type and caller_code.
+            action_type - predefined string with integer, based on https://ws.registrucentras.lt/broker/info.php
+            example_number_str - string with integer that determines which example file to use, if
+                                 multiple example files exist for same action_type
+        """
+        if self._is_scan_due():
+            self.load()
+
+        example = self._examples.get((action_type, example_number_str))
+        return example.data_base64 if example else None
+
+    def load(self) -> None:
+        with self._lock:
+            examples = {}
+            for key, path in self._scan():
+                mtime_ns = path.stat().st_mtime_ns
+                example = self._examples.get(key)
+                if example is None or example.path != path or example.mtime_ns != mtime_ns:
+                    data_base64 = b"".join(iter_base64(iter_file(path))).decode("ascii")
+                    example = XmlExample(path, mtime_ns, data_base64)
+                examples[key] = example
+
+            self._examples = examples
+            self._scanned_at = time.monotonic()
+
+    def _is_scan_due(self) -> bool:
+        if self._scanned_at is None:
+            return True
+        if self.reload_interval is None:
+            return False
+        return time.monotonic() - self._scanned_at >= self.reload_interval
+
+    def _scan(self) -> list[tuple[tuple[str, str], Path]]:
+        examples = []
+        for directory in sorted(path for path in self.root.iterdir() if path.is_dir()):
+            action_type = ACTION_TYPE_DIRECTORIES.get(directory.name, directory.name)
+            if not action_type.isdigit():
+                continue
+
+            for path in sorted(directory.iterdir()):
+                if match := EXAMPLE_FILE_NAME_PATTERN.match(path.name):
+                    examples.append(((action_type, str(int(match.group(1)))), path))
+        return examples
+
+
+xml_examples = XmlExampleRegistry(examples_path_root, reload_interval=settings.RC_EXAMPLES_RELOAD_INTERVAL)
@@ -52,6 +52,16 @@ class DocumentSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class DocumentListSerializer(serializers.ModelSerializer):
+    """Document without binary content, which is replaced by its stored size and MD5 hash"""
+
+    document_author = DocumentAuthorSerializer(source="documentauthor", read_only=True)
+
+    class Meta:
+        model = Document
+        exclude = ["content"]
+
+
 class CountrySettlementSerializer(serializers.ModelSerializer):
     settlements = SettlementSerializer(many=True, read_only=True)
 
@@ -1,18 +1,43 @@
 import json
-import xml.etree.ElementTree as ET
+from collections.abc import Iterator
 
+from django.contrib.gis.geos import Point, Polygon
 from django.db.models import QuerySet
-from spyne import ComplexModel, Integer, Iterable, String, rpc
+from spyne import Boolean, ComplexModel, Double, Fault, Integer, Iterable, String, rpc
 from spyne.service import Service
 
-from apps.address_registry.helpers import construct_country_xml
-from apps.address_registry.models import Continent, Country, Document, DocumentAuthor, Settlement, Title
+from apps.address_registry.helpers import get_country_xml
+from apps.address_registry.models import (
+    AdministrativeHierarchy,
+    AdministrativeLevel,
+    Continent,
+    Country,
+    County,
+    Document,
+    DocumentAuthor,
+    Eldership,
+    Municipality,
+    Settlement,
+    Title,
+)
 from apps.address_registry.schema import ContinentModel, CountryModel, DocumentAuthorModel
 from apps.address_registry.schema_nested import (
+    CountyNestedResponseModel,
     DocumentsNestedResponseModel,
+    EldershipNestedResponseModel,
+    MunicipalityNestedResponseModel,
     SettlementTitleNestedModel,
     TitleSettlementNestedModel,
 )
+from apps.utils.query_planning import get_spyne_model_query_plan
+from apps.utils.search import filter_contains
+from apps.utils.spatial import GEOMETRY_FORMATS, MAX_ZOOM, GeometryFormat, encode_geometry, wkb_to_base64
+from apps.utils.spyne_utils import DjangoInstanceProxy
+
+# Number of settlements fetched (and title forms prefetched) per database round trip while streaming
+CITIES_CHUNK_SIZE = 2000
+# Number of administrative units fetched (and their nested relations prefetched) per database round trip
+ADMINISTRATIVE_UNITS_CHUNK_SIZE = 2000
 
 
 class TownFilter(ComplexModel):
@@ -23,6 +48,7 @@ class CityNameFilter(ComplexModel):
     title = String(min_occurs=0, nillable=True)
     grammatical_case = String(min_occurs=0, nillable=True)
     settlement = TownFilter
+    accent_insensitive = Boolean(min_occurs=0, nillable=True)
 
 
 class CityNameService(Service):
@@ -33,22 +59,23 @@ class CityNameService(Service):
         if not city_name_filter:
             return queryset
 
+        accent_insensitive = bool(city_name_filter.accent_insensitive)
         if name := city_name_filter.title:
-            queryset = queryset.filter(title__icontains=name)
+            queryset = filter_contains(queryset, "title", name, accent_insensitive)
         if case := city_name_filter.grammatical_case:
             queryset = queryset.filter(grammatical_case=case)
         if city_name_filter.settlement and (town_name := city_name_filter.settlement.title):
-            queryset = queryset.filter(settlement__title_lt__icontains=town_name)
+            queryset = filter_contains(queryset, "settlement__title_lt", town_name, accent_insensitive)
 
         return queryset
 
 
 class CityService(Service):
     @rpc(_returns=Iterable(SettlementTitleNestedModel))
-    def cities(self) -> list[dict]:
-        queryset = Settlement.objects.all().prefetch_related("title_forms")
-        return [
-            {
+    def cities(self) -> Iterator[dict]:
+        queryset = Settlement.objects.all().select_related("country__continent").prefetch_related("title_forms")
+        for settlement in queryset.iterator(chunk_size=CITIES_CHUNK_SIZE):
+            yield {
                 **settlement.to_dict(),
                 "title_forms": [{**title.to_dict()} for title in settlement.title_forms.all()],
                 "json_settlement_data": json.dumps(
@@ -59,10 +86,8 @@ class CityService(Service):
                         "type": settlement.type,
                     }
                 ),
-                "xml_country_data": ET.tostring(construct_country_xml(settlement.country), encoding="unicode"),
+                "xml_country_data": get_country_xml(settlement.country),
             }
-            for settlement in queryset
-        ]
 
 
 class DocumentFilter(ComplexModel):
@@ -73,7 +98,8 @@ class DocumentFilter(ComplexModel):
 class DocumentService(Service):
     @rpc(DocumentFilter, _returns=Iterable(DocumentsNestedResponseModel))
     def documents(self, document_filter: DocumentFilter) -> list[dict]:
-        queryset = Document.objects.all().select_related("documentauthor")
+        # Content is not part of the response schema, so binary payload is not loaded
+        queryset = Document.objects.all().select_related("documentauthor").defer("content")
         if document_filter:
             if doc_type := document_filter.type:
                 queryset = queryset.filter(type__icontains=doc_type)
@@ -83,7 +109,7 @@ class DocumentService(Service):
 
         return [
             {
-                **document.to_dict(),
+                **document.to_dict(with_content=False),
                 "document_author": document.documentauthor.to_dict() if hasattr(document, "documentauthor") else None,
             }
             for document in queryset
@@ -94,6 +120,7 @@ class DocumentAuthorFilter(ComplexModel):
     name = String(min_occurs=0, nillable=True)
     surname = String(min_occurs=0, nillable=True)
     document_id = Integer(min_occurs=0, nillable=True)
+    accent_insensitive = Boolean(min_occurs=0, nillable=True)
 
 
 class DocumentAuthorService(Service):
@@ -102,11 +129,12 @@ class DocumentAuthorService(Service):
         queryset = DocumentAuthor.objects.all().select_related("document")
 
         if document_author_filter:
+            accent_insensitive = bool(document_author_filter.accent_insensitive)
             if name := document_author_filter.name:
-                queryset = queryset.filter(name__icontains=name)
+                queryset = filter_contains(queryset, "name", name, accent_insensitive)
 
             if surname := document_author_filter.surname:
-                queryset = queryset.filter(surname__icontains=surname)
+                queryset = filter_contains(queryset, "surname", surname, accent_insensitive)
 
             if document_id := document_author_filter.document_id:
                 queryset = queryset.filter(document_id=document_id)
@@ -123,6 +151,7 @@ class ContinentService(Service):
 class CountryFilter(ComplexModel):
     code = String(min_occurs=0, nillable=True)
     title = String(min_occurs=0, nillable=True)
+    accent_insensitive = Boolean(min_occurs=0, nillable=True)
 
 
 class CountryService(Service):
@@ -135,6 +164,135 @@ class CountryService(Service):
                 queryset = queryset.filter(code=code)
 
             if title := country_filter.title:
-                queryset = queryset.filter(title_lt__icontains=title)
+                queryset = filter_contains(queryset, "title_lt", title, bool(country_filter.accent_insensitive))
 
         return queryset
+
+
+class AdministrativeUnitFilter(ComplexModel):
+    title = String(min_occurs=0, nillable=True)
+    accent_insensitive = Boolean(min_occurs=0, nillable=True)
+
+
+def _get_administrative_units(
+    queryset: QuerySet, response_model: type[ComplexModel], unit_filter: AdministrativeUnitFilter | None
+) -> Iterator[DjangoInstanceProxy]:
+    """Yields units with all the relations of nested response model loaded by one join and a prefetch per level"""
+    if unit_filter and (title := unit_filter.title):
+        queryset = filter_contains(queryset, "admin_unit__title", title, bool(unit_filter.accent_insensitive))
+
+    queryset = get_spyne_model_query_plan(response_model).apply(queryset.order_by("id"))
+    for unit in queryset.iterator(chunk_size=ADMINISTRATIVE_UNITS_CHUNK_SIZE):
+        yield DjangoInstanceProxy(unit)
+
+
+class AdministrativeUnitService(Service):
+    @rpc(AdministrativeUnitFilter, _returns=Iterable(CountyNestedResponseModel))
+    def counties(self, unit_filter: AdministrativeUnitFilter | None = None) -> Iterator[DjangoInstanceProxy]:
+        return _get_administrative_units(County.objects.all(), CountyNestedResponseModel, unit_filter)
+
+    @rpc(AdministrativeUnitFilter, _returns=Iterable(MunicipalityNestedResponseModel))
+    def municipalities(self, unit_filter: AdministrativeUnitFilter | None = None) -> Iterator[DjangoInstanceProxy]:
+        return _get_administrative_units(Municipality.objects.all(), MunicipalityNestedResponseModel, unit_filter)
+
+    @rpc(AdministrativeUnitFilter, _returns=Iterable(EldershipNestedResponseModel))
+    def elderships(self, unit_filter: AdministrativeUnitFilter | None = None) -> Iterator[DjangoInstanceProxy]:
+        return _get_administrative_units(Eldership.objects.all(), EldershipNestedResponseModel, unit_filter)
+
+
+class BoundaryPointFilter(ComplexModel):
+    longitude = Double(min_occurs=1, nillable=False)
+    latitude = Double(min_occurs=1, nillable=False)
+    level = String(values=AdministrativeLevel.values, min_occurs=0, nillable=True)
+
+
+class BoundingBoxFilter(ComplexModel):
+    min_longitude = Double(min_occurs=1, nillable=False)
+    min_latitude = Double(min_occurs=1, nillable=False)
+    max_longitude = Double(min_occurs=1, nillable=False)
+    max_latitude = Double(min_occurs=1, nillable=False)
+    level = String(values=AdministrativeLevel.values, min_occurs=0, nillable=True)
+    # Geometry is simplified to the size of map pixel at the zoom level, not simplified if zoom is not given
+    zoom = Integer(ge=0, le=MAX_ZOOM, min_occurs=0, nillable=True)
+    # GeoJSON geometry or base64 encoded WKB
+    geometry_format = String(values=GEOMETRY_FORMATS, min_occurs=0, nillable=True)
+
+
+class AdministrativeBoundaryModel(ComplexModel):
+    level = String
+    county_id = Integer
+    county_title = String
+    county_code = Double
+    municipality_id = Integer
+    municipality_title = String
+    municipality_code = Double
+    eldership_id = Integer
+    eldership_title = String
+    eldership_code = Double
+    geometry = String(min_occurs=0, nillable=True)
+
+
+BOUNDARY_LINEAGE_FIELDS = [
+    "level",
+    "county_id",
+    "county_title",
+    "county_code",
+    "municipality_id",
+    "municipality_title",
+    "municipality_code",
+    "eldership_id",
+    "eldership_title",
+    "eldership_code",
+]
+
+
+def _get_boundaries(level: str | None) -> tuple[QuerySet, str]:
+    """Returns hierarchy rows of given level (elderships by default) and lookup of their boundary geometry"""
+    level = level or AdministrativeLevel.ELDERSHIP
+    return AdministrativeHierarchy.objects.filter(level=level), f"{level.lower()}_admin_unit__boundary__geometry"
+
+
+def _require(*values: float | None) -> None:
+    if any(value is None for value in values):
+        raise Fault(faultcode="Client", faultstring="Coordinates are required")
+
+
+def _iter_boundaries(queryset: QuerySet, geometry_format: str) -> Iterator[dict]:
+    for row in queryset.iterator(chunk_size=ADMINISTRATIVE_UNITS_CHUNK_SIZE):
+        if geometry_format == GeometryFormat.WKB:
+            row["geometry"] = wkb_to_base64(row["geometry"])
+        yield row
+
+
+class AdministrativeBoundaryService(Service):
+    @rpc(BoundaryPointFilter, _returns=Iterable(AdministrativeBoundaryModel))
+    def boundaries_at_point(self, point_filter: BoundaryPointFilter | None = None) -> QuerySet:
+        """Reverse geocoding - lineage of the units, whose boundary contains the point (ST_Contains, GiST index)"""
+        point_filter = point_filter or BoundaryPointFilter()
+        _require(point_filter.longitude, point_filter.latitude)
+
+        queryset, geometry_field = _get_boundaries(point_filter.level)
+        point = Point(point_filter.longitude, point_filter.latitude, srid=4326)
+        return queryset.filter(**{f"{geometry_field}__contains": point}).values(*BOUNDARY_LINEAGE_FIELDS)
+
+    @rpc(BoundingBoxFilter, _returns=Iterable(AdministrativeBoundaryModel))
+    def boundaries_in_bbox(self, bbox_filter: BoundingBoxFilter | None = None) -> Iterator[dict]:
+        """Units, whose boundary intersects the bounding box (ST_Intersects, GiST index), with simplified geometry"""
+        bbox_filter = bbox_filter or BoundingBoxFilter()
+        bbox = (
+            bbox_filter.min_longitude,
+            bbox_filter.min_latitude,
+            bbox_filter.max_longitude,
+            bbox_filter.max_latitude,
+        )
+        _require(*bbox)
+
+        queryset, geometry_field = _get_boundaries(bbox_filter.level)
+        geometry_format = bbox_filter.geometry_format or GeometryFormat.GEOJSON
+        queryset = (
+            queryset.filter(**{f"{geometry_field}__intersects": Polygon.from_bbox(bbox)})
+            .annotate(geometry=encode_geometry(geometry_field, bbox_filter.zoom, geometry_format))
+            .order_by("id")
+            .values(*BOUNDARY_LINEAGE_FIELDS, "geometry")
+        )
+        return _iter_boundaries(queryset, geometry_format)
@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.address_registry.helpers import (
+    RESPONSE_CACHE_DEPENDENCIES,
+    invalidate_countries_xml,
+    invalidate_model_response_cache,
+)
+from apps.address_registry.hierarchy import refresh_administrative_hierarchy, update_hierarchy_admin_unit
+from apps.address_registry.models import (
+    AdministrativeBoundary,
+    AdministrativeUnit,
+    Continent,
+    Country,
+    County,
+    Eldership,
+    Municipality,
+)
+from apps.address_registry.tiles import tile_cache
+from apps.utils.basic_auth import invalidate_credential_caches
+
+
+@receiver([post_save, post_delete], sender=Country)
+def invalidate_country_xml(sender, instance: Country, **kwargs) -> None:
+    invalidate_countries_xml([instance.id])
+
+
+@receiver([post_save, post_delete], sender=Continent)
+def invalidate_continent_countries_xml(sender, instance: Continent, **kwargs) -> None:
+    # Countries removed by cascade send their own post_delete signals
+    invalidate_countries_xml(list(Country.objects.filter(continent=instance).values_list("id", flat=True)))
+
+
+@receiver(post_save, sender=County)
+@receiver(post_save, sender=Municipality)
+@receiver(post_save, sender=Eldership)
+def refresh_hierarchy(sender, instance: County | Municipality | Eldership, **kwargs) -> None:
+    # Rows of deleted units are deleted by cascade
+    refresh_administrative_hierarchy(sender, [instance.id])
+
+
+@receiver(post_save, sender=AdministrativeUnit)
+def update_hierarchy_titles(sender, instance: AdministrativeUnit, **kwargs) -> None:
+    update_hierarchy_admin_unit(instance)
+
+
+@receiver([post_save, post_delete], sender=AdministrativeBoundary)
+@receiver([post_save, post_delete], sender=AdministrativeUnit)
+@receiver([post_save, post_delete], sender=County)
+@receiver([post_save, post_delete], sender=Municipality)
+@receiver([post_save, post_delete], sender=Eldership)
+def invalidate_tiles(sender, **kwargs) -> None:
+    tile_cache.invalidate()
+
+
+def invalidate_spyne_responses(sender, **kwargs) -> None:
+    invalidate_model_response_cache(sender)
+
+
+for model in RESPONSE_CACHE_DEPENDENCIES:
+    post_save.connect(invalidate_spyne_responses, sender=model, dispatch_uid=f"response_cache_{model.__name__}")
+    post_delete.connect(invalidate_spyne_responses, sender=model, dispatch_uid=f"response_cache_{model.__name__}")
+
+
+# Fields of users checked when verifying credentials
+CREDENTIAL_FIELDS = {"username", "password", "is_active"}
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_verified_credentials(sender, instance: User, update_fields: frozenset | None = None, **kwargs) -> None:
+    # Saves of other fields only (e.g. last_login on every login) do not change credentials
+    if update_fields is not None and not CREDENTIAL_FIELDS.intersection(update_fields):
+        return
+    invalidate_credential_caches()
@@ -0,0 +1,170 @@
+import base64
+from unittest.mock import Mock
+
+import pytest
+from django.contrib.auth.models import User, update_last_login
+from model_bakery.baker import make
+
+from apps.utils.basic_auth import (
+    BasicAuthError,
+    BasicAuthVerifier,
+    CredentialCache,
+    check_user_credentials,
+    invalidate_credential_caches,
+)
+
+
+def _get_header(username: str, password: str) -> str:
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+
+def test_verified_credentials_cached() -> None:
+    credential_cache = CredentialCache(max_size=10, timeout=60)
+    verify_credentials = Mock(return_value=True)
+
+    assert credential_cache.verify("credentials", verify_credentials)
+    assert credential_cache.verify("credentials", verify_credentials)
+    assert verify_credentials.call_count == 1
+
+
+def test_failed_verification_not_cached() -> None:
+    credential_cache = CredentialCache(max_size=10, timeout=60)
+    verify_credentials = Mock(return_value=False)
+
+    assert not credential_cache.verify("credentials", verify_credentials)
+    assert not credential_cache.verify("credentials", verify_credentials)
+    assert verify_credentials.call_count == 2
+
+
+def test_expired_credentials_verified_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    credential_cache = CredentialCache(max_size=10, timeout=60)
+    verify_credentials = Mock(return_value=True)
+    monkeypatch.setattr("apps.utils.basic_auth.time.monotonic", lambda: 1000)
+    credential_cache.verify("credentials", verify_credentials)
+
+    monkeypatch.setattr("apps.utils.basic_auth.time.monotonic", lambda: 1060)
+    credential_cache.verify("credentials", verify_credentials)
+
+    assert verify_credentials.call_count == 2
+
+
+def test_least_recently_used_credentials_evicted() -> None:
+    credential_cache = CredentialCache(max_size=2, timeout=60)
+    verify_credentials = Mock(return_value=True)
+    credential_cache.verify("first", verify_credentials)
+    credential_cache.verify("second", verify_credentials)
+    credential_cache.verify("first", verify_credentials)
+    credential_cache.verify("third", verify_credentials)
+    assert verify_credentials.call_count == 3
+
+    credential_cache.verify("first", verify_credentials)
+    assert verify_credentials.call_count == 3
+
+    credential_cache.verify("second", verify_credentials)
+    assert verify_credentials.call_count == 4
+
+
+def test_disabled_cache_always_verifies() -> None:
+    credential_cache = CredentialCache(max_size=10, timeout=0)
+    verify_credentials = Mock(return_value=True)
+
+    credential_cache.verify("credentials", verify_credentials)
+    credential_cache.verify("credentials", verify_credentials)
+    assert verify_credentials.call_count == 2
+
+
+def test_invalidated_credentials_verified_again() -> None:
+    credential_cache = CredentialCache(max_size=10, timeout=60)
+    verify_credentials = Mock(return_value=True)
+    credential_cache.verify("credentials", verify_credentials)
+
+    invalidate_credential_caches()
+    credential_cache.verify("credentials", verify_credentials)
+
+    assert verify_credentials.call_count == 2
+
+
+def test_user_change_invalidates_credentials() -> None:
+    user = make(User)
+    credential_cache = CredentialCache(max_size=10, timeout=60)
+    verify_credentials = Mock(return_value=True)
+    credential_cache.verify("credentials", verify_credentials)
+
+    user.set_password("new_password")
+    user.save()
+    credential_cache.verify("credentials", verify_credentials)
+
+    assert verify_credentials.call_count == 2
+
+
+def test_last_login_update_does_not_invalidate_credentials() -> None:
+    user = make(User)
+    credential_cache = CredentialCache(max_size=10, timeout=60)
+    verify_credentials = Mock(return_value=True)
+    credential_cache.verify("credentials", verify_credentials)
+
+    update_last_login(None, user)
+    credential_cache.verify("credentials", verify_credentials)
+
+    assert verify_credentials.call_count == 1
+
+
+def test_shared_version_read_once_per_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    get_version = Mock(return_value=1)
+    monkeypatch.setattr("apps.utils.basic_auth.get_credential_cache_version", get_version)
+    monkeypatch.setattr("apps.utils.basic_auth._invalidated_at", float("-inf"))
+    credential_cache = CredentialCache(max_size=10, timeout=60, version_check_interval=5)
+    verify_credentials = Mock(return_value=True)
+
+    monkeypatch.setattr("apps.utils.basic_auth.time.monotonic", lambda: 1000)
+    credential_cache.verify("credentials", verify_credentials)
+    credential_cache.verify("credentials", verify_credentials)
+    assert get_version.call_count == 1
+
+    # Invalidated by another worker
+    get_version.return_value = 2
+    monkeypatch.setattr("apps.utils.basic_auth.time.monotonic", lambda: 1005)
+    credential_cache.verify("credentials", verify_credentials)
+
+    assert get_version.call_count == 2
+    assert verify_credentials.call_count == 2
+
+
+@pytest.mark.parametrize(
+    ("header", "error_message"),
+    [
+        ("", "Invalid auth header"),
+        ("Token abc", "Invalid auth header"),
+        ("Basic dGVzdF91c2VyIHRlc3RfcGFzc3dvcmQ=", "Invalid basic header. Credentials not correctly base64 encoded"),
+        (_get_header("test_user", "password"), "Invalid credentials"),
+    ],
+)
+def test_basic_auth_verifier_raises_error(header: str, error_message: str) -> None:
+    verifier = BasicAuthVerifier(lambda username, password: password == "test_password")
+
+    with pytest.raises(BasicAuthError) as error:
+        verifier.verify(header)
+    assert error.value.message == error_message
+
+
+def test_basic_auth_verifier_checks_credentials_once() -> None:
+    check_credentials = Mock(return_value=True)
+    verifier = BasicAuthVerifier(check_credentials, CredentialCache(max_size=10, timeout=60))
+
+    verifier.verify(_get_header("test_user", "test_password"))
+    verifier.verify(_get_header("test_user", "test_password"))
+
+    check_credentials.assert_called_once_with("test_user", "test_password")
+
+
+def test_check_user_credentials() -> None:
+    user = make(User, username="test_user", is_active=True)
+    user.set_password("test_password")
+    user.save()
+
+    assert check_user_credentials("test_user", "test_password")
+    assert not check_user_credentials("test_user", "password")
+
+    user.is_active = False
+    user.save()
+    assert not check_user_credentials("test_user", "test_password")
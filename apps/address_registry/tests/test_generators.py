@@ -0,0 +1,82 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from apps.address_registry.generators import BulkTestDataGenerator
+from apps.address_registry.models import (
+    AdministrativeUnit,
+    Continent,
+    Country,
+    County,
+    Document,
+    DocumentAuthor,
+    Eldership,
+    Municipality,
+    Settlement,
+    Title,
+)
+
+
+class TestBulkTestDataGenerator:
+    def test_parents_are_reused_by_fan_out(self) -> None:
+        BulkTestDataGenerator(fan_out=3).generate(Settlement, 7)
+
+        assert Settlement.objects.count() == 7
+        assert Title.objects.count() == 7
+        assert Country.objects.count() == 3
+        assert Continent.objects.count() == 1
+
+    def test_denormalized_country_code_matches_country(self) -> None:
+        BulkTestDataGenerator(fan_out=2).generate(Eldership, 4)
+
+        assert not Settlement.objects.exclude(country_code=F("country__code")).exists()
+        assert not AdministrativeUnit.objects.exclude(country_code=F("country__code")).exists()
+        assert not AdministrativeUnit.objects.exclude(country=F("centre__country")).exists()
+
+    def test_administrative_hierarchy_is_generated_by_fan_out(self) -> None:
+        BulkTestDataGenerator(fan_out=2).generate(Eldership, 4)
+
+        assert Eldership.objects.count() == 4
+        assert Municipality.objects.count() == 2
+        assert County.objects.count() == 1
+        assert Country.objects.count() == 1
+        assert not Eldership.objects.exclude(admin_unit__country=F("municipality__admin_unit__country")).exists()
+        assert not Municipality.objects.exclude(admin_unit__country=F("county__admin_unit__country")).exists()
+
+    def test_number_of_queries_does_not_depend_on_quantity(self) -> None:
+        with CaptureQueriesContext(connection) as single_eldership_queries:
+            BulkTestDataGenerator(batch_size=100).generate(Eldership, 1)
+
+        with CaptureQueriesContext(connection) as multiple_elderships_queries:
+            BulkTestDataGenerator(batch_size=100).generate(Eldership, 50)
+
+        assert len(multiple_elderships_queries) == len(single_eldership_queries)
+        assert Eldership.objects.count() == 51
+
+    def test_document_authors_are_generated_for_documents(self) -> None:
+        documents = BulkTestDataGenerator().generate(Document, 3)
+
+        assert DocumentAuthor.objects.filter(document__in=documents).count() == 3
+
+
+class TestGenerateTestDataCommand:
+    def test_generates_data_in_chunks(self) -> None:
+        call_command("generate_test_data", "address_registry.settlement", "5", "--fan-out=5", "--chunk-size=5")
+        call_command("generate_test_data", "address_registry.settlement", "5", "--fan-out=5", "--chunk-size=2")
+
+        assert Settlement.objects.count() == 10
+        assert Country.objects.count() == 4
+
+    @pytest.mark.parametrize("model", ["address_registry.foo", "address_registry.documentauthor"])
+    def test_raises_error_for_not_supported_model(self, model: str) -> None:
+        with pytest.raises(CommandError):
+            call_command("generate_test_data", model, "1")
+
+    @pytest.mark.parametrize("option", ["--fan-out=0", "--batch-size=0", "--chunk-size=-1"])
+    def test_raises_error_for_not_positive_option(self, option: str) -> None:
+        with pytest.raises(CommandError, match="must be a positive number"):
+            call_command("generate_test_data", "address_registry.settlement", "1", option)
+
+        assert not Settlement.objects.exists()
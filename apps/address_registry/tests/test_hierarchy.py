@@ -0,0 +1,119 @@
+from io import StringIO
+
+from django.core.management import call_command
+from model_bakery.baker import make
+
+from apps.address_registry.hierarchy import rebuild_administrative_hierarchy
+from apps.address_registry.models import (
+    AdministrativeHierarchy,
+    AdministrativeLevel,
+    County,
+    Eldership,
+    Municipality,
+)
+
+
+def _get_lineage(eldership: Eldership) -> dict:
+    return AdministrativeHierarchy.objects.values(
+        "county_id",
+        "county_title",
+        "municipality_id",
+        "municipality_title",
+        "eldership_id",
+        "eldership_title",
+        "eldership_code",
+    ).get(eldership=eldership)
+
+
+def test_hierarchy_rows_created_for_each_level() -> None:
+    eldership = make(Eldership)
+    municipality = eldership.municipality
+    county = municipality.county
+
+    assert list(AdministrativeHierarchy.objects.order_by("id").values_list("level", flat=True)) == [
+        AdministrativeLevel.COUNTY,
+        AdministrativeLevel.MUNICIPALITY,
+        AdministrativeLevel.ELDERSHIP,
+    ]
+    assert _get_lineage(eldership) == {
+        "county_id": county.id,
+        "county_title": county.admin_unit.title,
+        "municipality_id": municipality.id,
+        "municipality_title": municipality.admin_unit.title,
+        "eldership_id": eldership.id,
+        "eldership_title": eldership.admin_unit.title,
+        "eldership_code": eldership.admin_unit.code,
+    }
+
+
+def test_lineage_read_with_single_query(django_assert_num_queries) -> None:
+    eldership = make(Eldership)
+
+    with django_assert_num_queries(1):
+        lineage = _get_lineage(eldership)
+
+    assert lineage["county_id"] == eldership.municipality.county_id
+
+
+def test_descendants_refreshed_when_municipality_moved() -> None:
+    eldership = make(Eldership)
+    county = make(County)
+
+    municipality = eldership.municipality
+    municipality.county = county
+    municipality.save()
+
+    assert _get_lineage(eldership)["county_id"] == county.id
+    assert AdministrativeHierarchy.objects.filter(county=county).count() == 3
+
+
+def test_titles_updated_when_administrative_unit_changes() -> None:
+    eldership = make(Eldership)
+    admin_unit = eldership.municipality.county.admin_unit
+
+    admin_unit.title = "Vilniaus apskritis"
+    admin_unit.save()
+
+    assert set(AdministrativeHierarchy.objects.values_list("county_title", flat=True)) == {"Vilniaus apskritis"}
+
+
+def test_rows_deleted_with_unit() -> None:
+    eldership = make(Eldership)
+
+    eldership.municipality.delete()
+
+    assert list(AdministrativeHierarchy.objects.values_list("level", flat=True)) == [AdministrativeLevel.COUNTY]
+
+
+def test_rows_deleted_with_administrative_unit() -> None:
+    eldership = make(Eldership)
+
+    eldership.municipality.county.admin_unit.delete()
+
+    assert not AdministrativeHierarchy.objects.exists()
+
+
+def test_generated_units_added_to_hierarchy() -> None:
+    Eldership.generate_test_data(quantity=4, fan_out=2)
+
+    assert AdministrativeHierarchy.objects.filter(level=AdministrativeLevel.ELDERSHIP).count() == 4
+    assert AdministrativeHierarchy.objects.filter(level=AdministrativeLevel.MUNICIPALITY).count() == 2
+    assert AdministrativeHierarchy.objects.filter(level=AdministrativeLevel.COUNTY).count() == 1
+    assert set(AdministrativeHierarchy.objects.values_list("county_id", flat=True)) == set(
+        County.objects.values_list("id", flat=True)
+    )
+
+
+def test_rebuild_administrative_hierarchy() -> None:
+    make(Eldership, _quantity=2)
+    make(Municipality)
+    expected = list(AdministrativeHierarchy.objects.order_by("level", "county", "municipality").values())
+    AdministrativeHierarchy.objects.update(county_title="outdated")
+
+    stdout = StringIO()
+    call_command("rebuild_administrative_hierarchy", stdout=stdout)
+
+    assert "8 rows" in stdout.getvalue()
+    rebuilt = list(AdministrativeHierarchy.objects.order_by("level", "county", "municipality").values())
+    assert [{**row, "id": None} for row in rebuilt] == [{**row, "id": None} for row in expected]
+    assert rebuild_administrative_hierarchy() == 8
@@ -0,0 +1,200 @@
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from model_bakery.baker import make
+
+from apps.address_registry import importers
+from apps.address_registry.importers import BulkImporter, BulkImportError, ImportFormat
+from apps.address_registry.models import (
+    AdministrativeHierarchy,
+    AdministrativeUnit,
+    Continent,
+    Country,
+    County,
+    Document,
+    Settlement,
+    Title,
+)
+from apps.utils.tests_query_counter import APIClientWithQueryCounter
+
+
+def to_ndjson(*rows: dict) -> io.BytesIO:
+    return io.BytesIO("".join(f"{json.dumps(row)}\n" for row in rows).encode())
+
+
+@pytest.fixture
+def continent() -> Continent:
+    return make(Continent, code=1)
+
+
+class TestBulkImporter:
+    def test_rows_are_inserted_and_updated(self, continent: Continent) -> None:
+        country = make(Country, code="LT", title="Lietuva", continent=continent)
+        dump = io.BytesIO(
+            b"id,code,title,title_lt,title_en,continent_id\n"
+            + f"{country.id},LT,Lithuania,Lietuva,Lithuania,1\n".encode()
+            + b'1000,LV,"Latvia, Republic of",Latvija,Latvia,1\n'
+        )
+
+        assert BulkImporter(Country).import_stream(dump, ImportFormat.CSV) == 2
+
+        country.refresh_from_db()
+        assert country.title == "Lithuania"
+        assert Country.objects.get(id=1000).title == "Latvia, Republic of"
+        # Sequence continues after imported ids
+        assert make(Country, continent=continent).id > 1000
+
+    def test_country_code_is_resolved_from_country(self, continent: Continent) -> None:
+        country = make(Country, code="LT", continent=continent)
+        dump = to_ndjson(
+            {"id": 1, "title_lt": "Vilnius", "type": "MIESTAS", "country_id": country.id, "area": None},
+            {"id": 2, "title_lt": "Kaunas", "type": "MIESTAS", "country_id": country.id, "area": 157.0},
+        )
+
+        assert BulkImporter(Settlement).import_stream(dump, ImportFormat.NDJSON) == 2
+
+        assert list(Settlement.objects.order_by("id").values_list("title_lt", "country_code", "area")) == [
+            ("Vilnius", "LT", None),
+            ("Kaunas", "LT", 157.0),
+        ]
+
+    def test_country_code_change_is_denormalized(self, continent: Continent) -> None:
+        settlement = make(Settlement, country__code="LT", country__continent=continent)
+        dump = io.BytesIO(
+            f"id,code,title,title_lt,title_en,continent_id\n{settlement.country_id},LTU,Lithuania,Lietuva,Lithuania,1\n".encode()
+        )
+
+        BulkImporter(Country).import_stream(dump, ImportFormat.CSV)
+
+        settlement.refresh_from_db()
+        assert settlement.country_code == "LTU"
+
+    def test_unknown_country(self) -> None:
+        dump = to_ndjson({"id": 1, "title_lt": "Vilnius", "type": "MIESTAS", "country_id": 1})
+
+        with pytest.raises(BulkImportError, match="1 rows refer to countries which do not exist"):
+            BulkImporter(Settlement).import_stream(dump, ImportFormat.NDJSON)
+
+        assert not Settlement.objects.exists()
+
+    def test_unknown_related_object(self) -> None:
+        dump = io.BytesIO(b"id,title,accented,grammatical_case,settlement_id\n1,Vilniaus,Vilniaus,GENITIVE,1\n")
+
+        with pytest.raises(BulkImportError, match="violates foreign key constraint"):
+            BulkImporter(Title).import_stream(dump, ImportFormat.CSV)
+
+    @pytest.mark.parametrize(
+        ("header", "error"),
+        [
+            (b"id,code,title,continent_id,country_code\n", "Unknown columns \\['country_code'\\]"),
+            (b"code,title,title_lt,title_en,continent_id\n", "Column 'id' is required"),
+            (b"id,code,title\n", "Required columns \\['title_lt', 'title_en', 'continent_id'\\] are missing"),
+            (b"", "Dump is empty"),
+        ],
+    )
+    def test_invalid_columns(self, header: bytes, error: str) -> None:
+        with pytest.raises(BulkImportError, match=error):
+            BulkImporter(Country).import_stream(io.BytesIO(header), ImportFormat.CSV)
+
+    def test_invalid_value(self, continent: Continent) -> None:
+        dump = io.BytesIO(b"id,code,title,title_lt,title_en,continent_id\nfoo,LT,,,,1\n")
+
+        with pytest.raises(BulkImportError, match="invalid input syntax"):
+            BulkImporter(Country).import_stream(dump, ImportFormat.CSV)
+
+    def test_not_supported_model(self) -> None:
+        with pytest.raises(BulkImportError, match="Data of model Document cannot be imported"):
+            BulkImporter(Document)
+
+    def test_uuid_is_generated_for_new_administrative_units(self) -> None:
+        settlement = make(Settlement)
+        admin_unit = make(AdministrativeUnit, centre=settlement, country=settlement.country)
+        columns = {"type": "APSKRITIS", "centre_id": settlement.id, "country_id": settlement.country_id}
+        dump = to_ndjson(
+            {"id": admin_unit.id, "title": "Vilniaus", **columns}, {"id": 1000, "title": "Kauno", **columns}
+        )
+
+        BulkImporter(AdministrativeUnit).import_stream(dump, ImportFormat.NDJSON)
+
+        assert AdministrativeUnit.objects.get(id=admin_unit.id).uuid == admin_unit.uuid
+        assert AdministrativeUnit.objects.get(id=1000).uuid is not None
+
+    def test_country_xml_is_invalidated_after_commit(self, monkeypatch, continent: Continent) -> None:
+        country = make(Country, continent=continent)
+        savepoints = len(connection.savepoint_ids)
+        invalidations = []
+        monkeypatch.setattr(
+            importers,
+            "invalidate_countries_xml",
+            lambda country_ids: invalidations.append((country_ids, len(connection.savepoint_ids))),
+        )
+
+        BulkImporter(Continent).import_stream(io.BytesIO(b"code,name\n1,Europe\n"), ImportFormat.CSV)
+
+        assert invalidations == [([country.id], savepoints)]
+
+    def test_administrative_hierarchy_is_refreshed(self) -> None:
+        admin_unit = make(AdministrativeUnit, title="Vilniaus")
+
+        BulkImporter(County).import_stream(
+            io.BytesIO(f"id,admin_unit_id\n1,{admin_unit.id}\n".encode()), ImportFormat.CSV
+        )
+
+        assert list(AdministrativeHierarchy.objects.values_list("county_id", "county_title")) == [(1, "Vilniaus")]
+
+
+class TestImportRegistryDataCommand:
+    def test_imports_file(self, tmp_path, continent: Continent) -> None:
+        path = tmp_path / "countries.csv"
+        path.write_bytes(b"id,code,title,title_lt,title_en,continent_id\n1,LT,Lithuania,Lietuva,Lithuania,1\n")
+        stdout = io.StringIO()
+
+        call_command("import_registry_data", "address_registry.country", str(path), stdout=stdout)
+
+        assert Country.objects.get(id=1).code == "LT"
+        assert "Imported 1 Countries" in stdout.getvalue()
+
+    def test_format_cannot_be_guessed(self, tmp_path) -> None:
+        with pytest.raises(CommandError, match="use --format"):
+            call_command("import_registry_data", "address_registry.country", str(tmp_path / "countries.txt"))
+
+    def test_not_supported_model(self, tmp_path) -> None:
+        with pytest.raises(CommandError, match="cannot be imported"):
+            call_command("import_registry_data", "address_registry.document", str(tmp_path / "documents.csv"))
+
+
+class TestImportData:
+    URL = "/api/v1/address_registry/country/import/"
+    DUMP = b"id,code,title,title_lt,title_en,continent_id\n1,LT,Lithuania,Lietuva,Lithuania,1\n"
+
+    def test_return_403_when_not_staff(self, authorized_client: APIClientWithQueryCounter) -> None:
+        response = authorized_client.post(self.URL, data=self.DUMP, content_type="text/csv")
+        assert response.status_code == 403
+
+    def test_imports_csv(self, superuser, authorized_client: APIClientWithQueryCounter, continent: Continent) -> None:
+        response = authorized_client.post(self.URL, data=self.DUMP, content_type="text/csv; charset=utf-8")
+
+        assert response.status_code == 200
+        assert response.json() == {"imported": 1}
+        assert Country.objects.get(id=1).code == "LT"
+
+    def test_return_400_when_dump_is_not_valid(self, superuser, authorized_client: APIClientWithQueryCounter) -> None:
+        response = authorized_client.post(self.URL, data=b"id,foo\n", content_type="text/csv")
+        assert response.status_code == 400
+
+    def test_return_415_when_content_type_not_supported(
+        self, superuser, authorized_client: APIClientWithQueryCounter
+    ) -> None:
+        response = authorized_client.post(self.URL, data={"id": 1}, format="json")
+        assert response.status_code == 415
+
+    def test_return_404_when_model_cannot_be_imported(
+        self, superuser, authorized_client: APIClientWithQueryCounter
+    ) -> None:
+        response = authorized_client.post(
+            "/api/v1/address_registry/document/import/", data=self.DUMP, content_type="text/csv"
+        )
+        assert response.status_code == 404
@@ -0,0 +1,93 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from model_bakery.baker import make
+from rest_framework.renderers import JSONRenderer
+
+from apps.address_registry.models import Country
+from apps.utils.json_renderers import FastJSONRenderer, JsonBackend
+from apps.utils.tests_query_counter import APIClientWithQueryCounter
+
+DATA = {
+    "date": datetime.date(2024, 1, 2),
+    "time": datetime.time(10, 20, 30),
+    "datetime": datetime.datetime(2024, 1, 2, 10, 20, 30, tzinfo=datetime.timezone.utc),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "decimal": Decimal("1.50"),
+    "text": "Šiauliai ",
+    "list": (value for value in [1, 2]),
+    1: None,
+}
+
+
+def test_fast_renderer_output() -> None:
+    content = FastJSONRenderer().render(DATA)
+
+    assert b"\\u2028" in content
+    assert json.loads(content) == {
+        "date": "2024-01-02",
+        "time": "10:20:30",
+        "datetime": "2024-01-02T10:20:30Z",
+        "uuid": "12345678-1234-5678-1234-567812345678",
+        "decimal": 1.5,
+        "text": "Šiauliai ",
+        "list": [1, 2],
+        "1": None,
+    }
+
+
+@override_settings(JSON_BACKEND=JsonBackend.STDLIB)
+def test_stdlib_backend_same_as_json_renderer() -> None:
+    data = {"decimal": Decimal("1.50"), "text": "Šiauliai"}
+
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_indented_output_rendered_by_json_renderer() -> None:
+    renderer_context = {"indent": 2}
+
+    assert FastJSONRenderer().render({"a": 1}, renderer_context=renderer_context) == b'{\n  "a": 1\n}'
+
+
+@override_settings(JSON_BACKEND="unknown")
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown JSON_BACKEND"):
+        FastJSONRenderer().render({"a": 1})
+
+
+@pytest.mark.parametrize("backend", [JsonBackend.STDLIB, JsonBackend.ORJSON])
+def test_spyne_json_response_same_for_backends(client: APIClientWithQueryCounter, backend: str) -> None:
+    make(Country, code="LT", title="Lietuva")
+
+    with override_settings(JSON_BACKEND=backend, SPYNE_RESPONSE_CACHE_TIMEOUT=0):
+        response = client.get("/api/v1/countries/json/countries")
+
+    assert response.status_code == 200
+    assert [(country["code"], country["title"]) for country in response.json()] == [("LT", "Lietuva")]
+
+
+def test_spyne_json_rendered_with_orjson(client: APIClientWithQueryCounter) -> None:
+    make(Country, code="LT", title="Lietuva")
+
+    with override_settings(SPYNE_RESPONSE_CACHE_TIMEOUT=0):
+        response = client.get("/api/v1/countries/json/countries")
+
+    # Standard library json separates keys and values with ": "
+    assert b'"code":"LT"' in response.content
+
+
+def test_benchmark_json() -> None:
+    stdout = StringIO()
+
+    call_command("benchmark_json", "--repeat=1", "--endpoint=/api/v1/countries/json/countries", stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "/api/v1/countries/json/countries json:" in output
+    assert "/api/v1/countries/json/countries orjson:" in output
+    assert "speedup" in output
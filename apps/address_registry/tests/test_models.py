@@ -1,3 +1,5 @@
+import hashlib
+
 from model_bakery.baker import make
 
 from apps.address_registry.models import (
@@ -106,10 +108,37 @@ class TestDocument:
             "creation_time": document.creation_time,
         }
 
+    def test_to_dict_without_content(self) -> None:
+        document = make(Document)
+        assert "content" not in document.to_dict(with_content=False)
+
     def test_generate_test_data(self) -> None:
         Document.generate_test_data(quantity=2)
         assert Document.objects.count() == 2
         assert DocumentAuthor.objects.count() == 2
+        for document in Document.objects.all():
+            assert document.content_size == len(document.content)
+            assert document.content_hash == hashlib.md5(document.content).hexdigest()
+
+    def test_content_digest_updated_on_save(self) -> None:
+        document = make(Document, content=b"content")
+        assert (document.content_size, document.content_hash) == (7, hashlib.md5(b"content").hexdigest())
+
+        document.content = b"new content"
+        document.save(update_fields=["content"])
+
+        document.refresh_from_db()
+        assert (document.content_size, document.content_hash) == (11, hashlib.md5(b"new content").hexdigest())
+
+    def test_content_digest_kept_when_content_deferred(self) -> None:
+        make(Document, content=b"content", number="1")
+        document = Document.objects.defer("content").get()
+
+        document.number = "2"
+        document.save()
+
+        document.refresh_from_db()
+        assert document.content_size == 7
 
 
 class TestDocumentAuthor:
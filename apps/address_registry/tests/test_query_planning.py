@@ -0,0 +1,71 @@
+from apps.address_registry.schema_nested import CountyNestedResponseModel, EldershipNestedResponseModel
+from apps.address_registry.serializers import (
+    ContinentCountrySettlementSerializer,
+    DocumentListSerializer,
+    DocumentSerializer,
+    SettlementSerializer,
+    TitleSerializer,
+)
+from apps.address_registry.services import TownFilter
+from apps.utils.query_planning import (
+    QueryPlan,
+    get_serializer_query_plan,
+    get_spyne_model_query_plan,
+    plan_serializer_queries,
+    plan_spyne_model_queries,
+)
+
+
+def test_serializer_without_nested_serializers_has_empty_plan() -> None:
+    assert plan_serializer_queries(TitleSerializer()) == QueryPlan()
+
+
+def test_single_object_relation_selected() -> None:
+    assert plan_serializer_queries(DocumentSerializer()) == QueryPlan(select_related=["documentauthor"])
+    assert plan_serializer_queries(DocumentListSerializer()) == QueryPlan(select_related=["documentauthor"])
+
+
+def test_multiple_object_relation_prefetched() -> None:
+    assert plan_serializer_queries(SettlementSerializer()) == QueryPlan(prefetch_related=["title_forms"])
+
+
+def test_deepest_nested_relation_prefetched() -> None:
+    assert plan_serializer_queries(ContinentCountrySettlementSerializer()) == QueryPlan(
+        prefetch_related=["countries__settlements__title_forms"]
+    )
+
+
+def test_plan_calculated_once_per_serializer_class() -> None:
+    assert get_serializer_query_plan(SettlementSerializer) is get_serializer_query_plan(SettlementSerializer)
+
+
+def test_spyne_model_without_django_model_has_empty_plan() -> None:
+    assert plan_spyne_model_queries(TownFilter) == QueryPlan()
+
+
+def test_spyne_model_relations_planned() -> None:
+    assert plan_spyne_model_queries(CountyNestedResponseModel) == QueryPlan(
+        select_related=["admin_unit__centre__country", "admin_unit__country"],
+        prefetch_related=["admin_unit__centre__title_forms"],
+    )
+
+
+def test_spyne_model_nested_relations_planned() -> None:
+    assert plan_spyne_model_queries(EldershipNestedResponseModel) == QueryPlan(
+        select_related=[
+            "municipality__admin_unit__centre__country",
+            "municipality__admin_unit__country",
+            "municipality__county__admin_unit__centre__country",
+            "municipality__county__admin_unit__country",
+        ],
+        prefetch_related=[
+            "municipality__admin_unit__centre__title_forms",
+            "municipality__county__admin_unit__centre__title_forms",
+        ],
+    )
+
+
+def test_plan_calculated_once_per_spyne_model() -> None:
+    assert get_spyne_model_query_plan(CountyNestedResponseModel) is get_spyne_model_query_plan(
+        CountyNestedResponseModel
+    )
@@ -0,0 +1,111 @@
+import base64
+import json
+
+import pytest
+from django.contrib.gis.geos import GEOSGeometry, Polygon
+from model_bakery.baker import make
+
+from apps.address_registry.models import AdministrativeBoundary, Eldership
+from apps.utils.spatial import encode_geometry, get_geojson_precision, get_simplify_tolerance
+from apps.utils.tests_query_counter import APIClientWithQueryCounter
+
+BOUNDARIES_URL = "/api/v1/administrative-units/json/"
+
+
+@pytest.fixture
+def eldership() -> Eldership:
+    eldership = make(Eldership)
+    make(AdministrativeBoundary, admin_unit=eldership.admin_unit, geometry=Polygon.from_bbox((25, 54, 26, 55)))
+    make(
+        AdministrativeBoundary,
+        admin_unit=eldership.municipality.admin_unit,
+        geometry=Polygon.from_bbox((24, 54, 26, 56)),
+    )
+    return eldership
+
+
+def test_simplify_tolerance_is_pixel_size() -> None:
+    assert get_simplify_tolerance(None) is None
+    assert get_simplify_tolerance(0) == 360 / 256
+    assert get_simplify_tolerance(1) == 360 / 512
+
+
+def test_geojson_precision_matches_tolerance() -> None:
+    assert get_geojson_precision(None) == 6
+    assert get_geojson_precision(get_simplify_tolerance(0)) == 0
+    assert get_geojson_precision(get_simplify_tolerance(10)) == 3
+    assert get_geojson_precision(get_simplify_tolerance(22)) == 6
+
+
+def test_unknown_geometry_format() -> None:
+    with pytest.raises(ValueError, match="Unknown geometry format"):
+        encode_geometry("geometry", geometry_format="kml")
+
+
+def test_boundaries_at_point(client: APIClientWithQueryCounter, eldership: Eldership) -> None:
+    response = client.get(
+        f"{BOUNDARIES_URL}boundaries_at_point",
+        {"point_filter.longitude": 25.5, "point_filter.latitude": 54.5},
+        query_limit=1,
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["eldership_id"] == eldership.id
+    assert data[0]["municipality_id"] == eldership.municipality_id
+    assert data[0]["county_id"] == eldership.municipality.county_id
+    assert data[0]["eldership_title"] == eldership.admin_unit.title
+
+
+def test_boundaries_at_point_of_level(client: APIClientWithQueryCounter, eldership: Eldership) -> None:
+    params = {"point_filter.longitude": 24.5, "point_filter.latitude": 55.5}
+
+    assert client.get(f"{BOUNDARIES_URL}boundaries_at_point", params).json() == []
+
+    response = client.get(f"{BOUNDARIES_URL}boundaries_at_point", {**params, "point_filter.level": "MUNICIPALITY"})
+    assert [row["municipality_id"] for row in response.json()] == [eldership.municipality_id]
+
+
+def test_boundaries_in_bbox(client: APIClientWithQueryCounter, eldership: Eldership) -> None:
+    bbox = {
+        "bbox_filter.min_longitude": 25.9,
+        "bbox_filter.min_latitude": 54.9,
+        "bbox_filter.max_longitude": 27,
+        "bbox_filter.max_latitude": 56,
+    }
+
+    response = client.get(f"{BOUNDARIES_URL}boundaries_in_bbox", {**bbox, "bbox_filter.zoom": 8})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [row["eldership_id"] for row in data] == [eldership.id]
+    geometry = json.loads(data[0]["geometry"])
+    assert geometry["type"] == "Polygon"
+    assert GEOSGeometry(json.dumps(geometry)).equals(Polygon.from_bbox((25, 54, 26, 55)))
+
+
+def test_boundaries_in_bbox_as_wkb(client: APIClientWithQueryCounter, eldership: Eldership) -> None:
+    response = client.get(
+        f"{BOUNDARIES_URL}boundaries_in_bbox",
+        {
+            "bbox_filter.min_longitude": 25,
+            "bbox_filter.min_latitude": 54,
+            "bbox_filter.max_longitude": 26,
+            "bbox_filter.max_latitude": 55,
+            "bbox_filter.geometry_format": "wkb",
+        },
+    )
+
+    geometry = GEOSGeometry(memoryview(base64.b64decode(response.json()[0]["geometry"])))
+    assert geometry.equals(Polygon.from_bbox((25, 54, 26, 55)))
+
+
+def test_coordinates_required(client: APIClientWithQueryCounter) -> None:
+    response = client.get(f"{BOUNDARIES_URL}boundaries_at_point", {"point_filter.longitude": 25})
+    assert response.status_code == 400
+    assert "latitude member must occur at least 1 times" in response.content.decode()
+
+    response = client.get(f"{BOUNDARIES_URL}boundaries_in_bbox")
+    assert response.status_code == 400
+    assert "Coordinates are required" in response.content.decode()
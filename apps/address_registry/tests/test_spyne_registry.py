@@ -0,0 +1,60 @@
+from collections import deque
+
+from spyne.protocol.http import HttpRpc
+from spyne.protocol.json import JsonDocument
+from spyne.protocol.soap import Soap11
+
+from apps.address_registry.services import CityNameService, CityService
+from apps.address_registry.views.views import cities_application_json, cities_application_soap
+from apps.utils.spyne_registry import SpyneApplicationRegistry
+
+
+def test_front_ends_share_service_interface() -> None:
+    soap_application = cities_application_soap.app
+    json_application = cities_application_json.app
+
+    assert soap_application.interface is not json_application.interface
+    assert json_application.interface.app is json_application
+    assert json_application.interface.service_method_map == soap_application.interface.service_method_map
+    assert json_application.interface.classes == soap_application.interface.classes
+    assert json_application.interface.docs is not soap_application.interface.docs
+
+
+def test_front_ends_do_not_share_interface_state() -> None:
+    registry = SpyneApplicationRegistry()
+    services = [CityService, CityNameService]
+    soap_application = registry.get_application(
+        services, tns="tns", name="Application", in_protocol=Soap11(), out_protocol=Soap11()
+    )
+    json_application = registry.get_application(
+        services, tns="tns", name="Application", in_protocol=HttpRpc(), out_protocol=JsonDocument()
+    )
+
+    for attr, value in vars(soap_application.interface).items():
+        if isinstance(value, dict | list | set | deque):
+            assert getattr(json_application.interface, attr) is not value, attr
+    for key, methods in soap_application.interface.service_method_map.items():
+        assert json_application.interface.service_method_map[key] is not methods
+
+    json_application.interface.get_namespace_prefix("urn:front-end")
+    assert "urn:front-end" not in soap_application.interface.prefmap
+    assert json_application.interface.services == soap_application.interface.services
+    assert json_application.interface.get_tns() == "tns"
+
+
+def test_front_end_has_own_protocols() -> None:
+    registry = SpyneApplicationRegistry()
+    services = [CityService, CityNameService]
+    soap_application = registry.get_application(
+        services, tns="tns", name="Application", in_protocol=Soap11(), out_protocol=Soap11()
+    )
+    json_application = registry.get_application(
+        services, tns="tns", name="Application", in_protocol=HttpRpc(), out_protocol=JsonDocument()
+    )
+
+    assert isinstance(soap_application.in_protocol, Soap11)
+    assert isinstance(json_application.in_protocol, HttpRpc)
+    assert isinstance(json_application.out_protocol, JsonDocument)
+    assert json_application.in_protocol.app is json_application
+    assert json_application.out_protocol.app is json_application
+    assert soap_application.out_protocol.app is soap_application
@@ -0,0 +1,72 @@
+from contextlib import AbstractContextManager
+from unittest.mock import patch
+
+import pytest
+from django.urls import clear_url_caches
+
+from apps.utils.spyne_registry import spyne_applications
+from apps.utils.swagger import CustomSchemaGenerator
+from apps.utils.tests_query_counter import APIClientWithQueryCounter
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_cache():
+    CustomSchemaGenerator._schema_cache.clear()
+
+
+def _count_generations() -> AbstractContextManager:
+    return patch.object(
+        CustomSchemaGenerator, "_generate_schema", autospec=True, side_effect=CustomSchemaGenerator._generate_schema
+    )
+
+
+def test_schema_generated_once(client: APIClientWithQueryCounter) -> None:
+    with _count_generations() as generate_schema:
+        response = client.get("/swagger.json/")
+        cached_response = client.get("/swagger.json/")
+
+    assert generate_schema.call_count == 1
+    assert cached_response.status_code == 200
+    assert cached_response.content == response.content
+    assert "api/v1/sodra/skola-sodrai/SkolaSodraiBatch" in response.json()["paths"]
+
+
+def test_not_modified_schema(client: APIClientWithQueryCounter) -> None:
+    response = client.get("/swagger.json/")
+    assert response["ETag"]
+
+    not_modified_response = client.get("/swagger.json/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified_response.status_code == 304
+    assert not_modified_response["ETag"] == response["ETag"]
+
+    # Different representation of the same schema
+    yaml_response = client.get("/swagger.yaml/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert yaml_response.status_code == 200
+    assert yaml_response["ETag"] != response["ETag"]
+
+
+def test_schema_generated_for_each_host(client: APIClientWithQueryCounter) -> None:
+    client.get("/swagger.json/")
+    response = client.get("/swagger.json/", HTTP_HOST="example.com")
+
+    assert response.json()["host"] == "example.com"
+
+
+def test_schema_regenerated_when_urls_change(client: APIClientWithQueryCounter) -> None:
+    with _count_generations() as generate_schema:
+        client.get("/swagger.json/")
+        clear_url_caches()
+        client.get("/swagger.json/")
+
+    assert generate_schema.call_count == 2
+
+
+def test_schema_regenerated_when_spyne_applications_change(
+    client: APIClientWithQueryCounter, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    with _count_generations() as generate_schema:
+        client.get("/swagger.json/")
+        monkeypatch.setattr(spyne_applications, "version", spyne_applications.version + 1)
+        client.get("/swagger.json/")
+
+    assert generate_schema.call_count == 2
@@ -0,0 +1,101 @@
+import os
+from pathlib import Path
+
+import pytest
+from django.contrib.gis.geos import Polygon
+from model_bakery.baker import make
+
+from apps.address_registry.models import AdministrativeBoundary, Eldership
+from apps.address_registry.tiles import MVT_CONTENT_TYPE, tile_cache
+from apps.utils.tests_query_counter import APIClientWithQueryCounter
+from apps.utils.tile_cache import TileCache
+
+# Tile containing Vilnius at zoom level 10
+TILE_URL = "/api/v1/administrative-units/tiles/eldership/10/583/325/"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> TileCache:
+    return TileCache(tmp_path, max_size=100)
+
+
+@pytest.fixture
+def eldership_tile_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> TileCache:
+    monkeypatch.setattr(tile_cache, "directory", tmp_path)
+    monkeypatch.setattr(tile_cache, "max_size", 1024 * 1024)
+    return tile_cache
+
+
+def test_tile_cache(cache: TileCache) -> None:
+    assert cache.get("eldership/1/0/0") is None
+
+    cache.set("eldership/1/0/0", b"tile")
+
+    assert cache.get("eldership/1/0/0") == b"tile"
+
+
+def test_tile_cache_disabled(tmp_path: Path) -> None:
+    cache = TileCache(tmp_path, max_size=0)
+
+    cache.set("eldership/1/0/0", b"tile")
+
+    assert cache.get("eldership/1/0/0") is None
+    assert not any(tmp_path.iterdir())
+
+
+def test_tile_cache_invalidated(cache: TileCache) -> None:
+    cache.set("eldership/1/0/0", b"tile")
+
+    cache.invalidate()
+
+    assert cache.get("eldership/1/0/0") is None
+    cache.set("eldership/1/0/0", b"new tile")
+    assert cache.get("eldership/1/0/0") == b"new tile"
+
+
+def test_least_recently_used_tiles_evicted(cache: TileCache) -> None:
+    for y in range(3):
+        cache.set(f"eldership/1/0/{y}", b"x" * 30)
+        # Tiles are ordered by modification time, which might be the same for files written at once
+        os.utime(cache._get_path(f"eldership/1/0/{y}"), (y, y))
+    cache.get("eldership/1/0/0")
+
+    cache.set("eldership/1/0/3", b"x" * 30)
+
+    # Tile 0 was read after tiles 1 and 2 were written
+    assert cache.get("eldership/1/0/1") is None
+    assert cache.get("eldership/1/0/0") is not None
+    assert cache.get("eldership/1/0/3") is not None
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/v1/administrative-units/tiles/country/1/0/0/",
+        "/api/v1/administrative-units/tiles/eldership/1/2/0/",
+        "/api/v1/administrative-units/tiles/eldership/23/0/0/",
+    ],
+)
+def test_tile_does_not_exist(client: APIClientWithQueryCounter, url: str) -> None:
+    assert client.get(url, query_limit=0).status_code == 404
+
+
+def test_tile(client: APIClientWithQueryCounter, eldership_tile_cache: TileCache) -> None:
+    eldership = make(Eldership)
+    boundary = make(
+        AdministrativeBoundary, admin_unit=eldership.admin_unit, geometry=Polygon.from_bbox((25.0, 54.6, 25.2, 54.7))
+    )
+
+    response = client.get(TILE_URL)
+    assert response.status_code == 200
+    assert response["Content-Type"] == MVT_CONTENT_TYPE
+    assert b"eldership" in response.content
+    assert eldership.admin_unit.title.encode() in response.content
+
+    cached_response = client.get(TILE_URL, query_limit=0)
+    assert cached_response.content == response.content
+
+    boundary.geometry = Polygon.from_bbox((0, 0, 1, 1))
+    boundary.save()
+
+    assert client.get(TILE_URL).content == b""
@@ -0,0 +1,86 @@
+import datetime
+import json
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from model_bakery.baker import make
+
+from apps.address_registry.models import Continent, Country, Settlement, Title
+from apps.address_registry.serializers import (
+    ContinentCountrySettlementSerializer,
+    DocumentListSerializer,
+    SettlementSerializer,
+)
+from apps.utils.tests_query_counter import APIClientWithQueryCounter
+from apps.utils.values_serializers import ValuesSerializer
+
+
+@pytest.fixture
+def continents() -> list[Continent]:
+    continents = make(Continent, _quantity=2)
+    for continent in continents:
+        for country in make(Country, continent=continent, _quantity=2):
+            make(Settlement, country=country, registered=datetime.date(2020, 1, 2), area=12.5)
+            for settlement in make(Settlement, country=country, _quantity=2):
+                make(Title, settlement=settlement, _quantity=2)
+    # Country without settlements
+    make(Country, continent=continents[0])
+    return continents
+
+
+def test_values_serializer_output_same_as_serializer(continents: list[Continent]) -> None:
+    queryset = Continent.objects.prefetch_related("countries__settlements__title_forms")
+    values_serializer = ValuesSerializer(ContinentCountrySettlementSerializer)
+
+    data = values_serializer.serialize(values_serializer.get_queryset(queryset))
+
+    # Compared as JSON, so that order of the keys is compared too
+    assert json.dumps(data) == json.dumps(ContinentCountrySettlementSerializer(queryset, many=True).data)
+
+
+def test_values_serializer_queries(continents: list[Continent], django_assert_num_queries) -> None:
+    values_serializer = ValuesSerializer(ContinentCountrySettlementSerializer)
+
+    # Continents, countries, settlements and titles
+    with django_assert_num_queries(4):
+        values_serializer.serialize(values_serializer.get_queryset(Continent.objects.all()))
+
+
+def test_nested_values_not_queried_for_empty_rows(django_assert_num_queries) -> None:
+    values_serializer = ValuesSerializer(SettlementSerializer)
+
+    with django_assert_num_queries(0):
+        assert values_serializer.serialize([]) == []
+
+
+def test_unsupported_serializer() -> None:
+    with pytest.raises(ImproperlyConfigured, match="document_author is not supported"):
+        ValuesSerializer(DocumentListSerializer)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"all": "true"}, {"limit": 1, "offset": 1}, {"pagination": "keyset", "limit": 1}],
+)
+def test_settlements_list_same_as_detail(
+    authorized_client: APIClientWithQueryCounter, continents: list[Continent], params: dict
+) -> None:
+    response = authorized_client.get("/api/v1/settlements/", params)
+    assert response.status_code == 200
+
+    data = response.data if params.get("all") else response.data["results"]
+    for continent_data in data:
+        detail_response = authorized_client.get(f"/api/v1/settlements/{continent_data['code']}/")
+        assert json.dumps(continent_data) == json.dumps(detail_response.data)
+
+
+def test_settlements_keyset_pagination_next_page(
+    authorized_client: APIClientWithQueryCounter, continents: list[Continent]
+) -> None:
+    response = authorized_client.get("/api/v1/settlements/", {"pagination": "keyset", "limit": 1})
+    next_response = authorized_client.get(response.data["next"])
+
+    assert [response.data["results"][0]["code"], next_response.data["results"][0]["code"]] == sorted(
+        continent.code for continent in continents
+    )
+    assert next_response.data["next"] is None
@@ -0,0 +1,54 @@
+import base64
+import xml.etree.ElementTree as ET
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from model_bakery.baker import make
+
+from apps.address_registry.models import Country
+from apps.address_registry.xml_engines import (
+    ElementTreeCountriesXmlEngine,
+    LxmlCountriesXmlEngine,
+    construct_country_xml,
+    get_countries_xml_engine,
+)
+from apps.utils.streaming import iter_base64
+
+
+@pytest.mark.parametrize("encoding", ["ascii", "utf-8"])
+def test_engines_return_same_xml(encoding: str) -> None:
+    countries = make(Country, title="Šveicarija & <Lichtenšteinas>", _quantity=5)
+
+    etree_xml = b"".join(ElementTreeCountriesXmlEngine().iter_xml(countries, encoding=encoding))
+    lxml_xml = b"".join(LxmlCountriesXmlEngine(chunk_size=2).iter_xml(countries, encoding=encoding))
+
+    assert lxml_xml == etree_xml
+    assert etree_xml == b"<countries>%s</countries>" % b"".join(
+        ET.tostring(construct_country_xml(country), encoding=encoding, xml_declaration=False) for country in countries
+    )
+
+
+@pytest.mark.parametrize("engine_class", [ElementTreeCountriesXmlEngine, LxmlCountriesXmlEngine])
+def test_engines_return_empty_countries_xml(engine_class: type) -> None:
+    assert b"".join(engine_class().iter_xml([])) == b"<countries />"
+
+
+def test_lxml_engine_yields_chunk_per_chunk_size_countries() -> None:
+    countries = make(Country, _quantity=5)
+
+    chunks = list(LxmlCountriesXmlEngine(chunk_size=2).iter_xml(countries))
+
+    assert len(chunks) == 3
+    assert [chunk.count(b"<countryData>") for chunk in chunks] == [2, 2, 1]
+
+
+@pytest.mark.parametrize("chunks", [[], [b""], [b"a"], [b"ab", b"c"], [b"abcd", b"e", b"", b"fghij"], [b"x" * 10] * 7])
+def test_iter_base64_returns_same_as_b64encode(chunks: list[bytes]) -> None:
+    assert b"".join(iter_base64(chunks)) == base64.b64encode(b"".join(chunks))
+
+
+def test_unknown_engine_setting(settings) -> None:
+    settings.RC_BROKER_XML_ENGINE = "lxm"
+
+    with pytest.raises(ImproperlyConfigured, match="expected one of \\['etree', 'lxml'\\]"):
+        get_countries_xml_engine()
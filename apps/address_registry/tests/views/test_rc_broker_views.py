@@ -1,16 +1,23 @@
 import base64
+import os
+from pathlib import Path
 
 import pytest
+from lxml import etree
 from model_bakery.baker import make
 from spyne.client.django import DjangoTestClient
 
+from apps.address_registry.generators import BulkTestDataGenerator
+from apps.address_registry.helpers import get_country_xml, invalidate_countries_xml, iter_cached_countries_xml
 from apps.address_registry.models import Continent, Country
-from apps.address_registry.views.rc_broker_views import get_data
+from apps.address_registry.rc_examples.helpers import XmlExampleRegistry, examples_path_root
+from apps.address_registry.views.rc_broker_views import get_data, rc_testing_view
+from apps.utils.tests_spyne_client import StreamingDjangoTestClient
 
 
 @pytest.fixture
 def client() -> DjangoTestClient:
-    return DjangoTestClient("/api/v1/rc/get-data/", get_data.app)
+    return StreamingDjangoTestClient("/api/v1/rc/get-data/", get_data.app)
 
 
 def _get_request_data(
@@ -159,3 +166,235 @@ def test_return_fail_response_if_action_type_60_and_incorrect_signature(client:
 
     assert response_data.ResponseCode == "-1"
     assert response_data.ResponseData == "Incorrect signature. Authorization failed."
+
+
+@pytest.mark.parametrize("action_type", ["1", "64"])
+def test_get_data_response_streamed(client: DjangoTestClient, settings, action_type: str):
+    settings.RC_BROKER_XML_ENGINE = "lxml"
+    make(Country, _quantity=250)
+    request_data = _get_request_data(action_type=action_type)
+
+    response = client.service.GetData.get_django_response(**request_data)
+
+    assert response.streaming
+    assert "Content-Length" not in response
+    # Envelope start, chunks of 100 countries and envelope end
+    assert len(list(response.streaming_content)) > 3
+
+
+def test_get_data_query_count_does_not_depend_on_country_count(client: DjangoTestClient, django_assert_num_queries):
+    make(Country, _quantity=5)
+    request_data = _get_request_data()
+
+    with django_assert_num_queries(1):
+        response_data = client.service.GetData(**request_data)
+
+    assert base64.b64decode(response_data.ResponseData).count(b"<countryData>") == 5
+
+
+@pytest.mark.parametrize("action_type", ["1", "64"])
+def test_get_data_returns_cached_xml(client: DjangoTestClient, django_assert_num_queries, action_type: str):
+    make(Country, _quantity=5)
+    request_data = _get_request_data(action_type=action_type)
+    response_data = client.service.GetData(**request_data)
+
+    with django_assert_num_queries(0):
+        cached_response_data = client.service.GetData(**request_data)
+
+    assert cached_response_data.ResponseData == response_data.ResponseData
+
+
+@pytest.mark.parametrize("action_type", ["1", "64"])
+def test_get_data_returns_generated_countries(client: DjangoTestClient, action_type: str):
+    make(Country)
+    request_data = _get_request_data(action_type=action_type)
+    client.service.GetData(**request_data)
+
+    BulkTestDataGenerator().generate(Country, 2)
+    response_data = client.service.GetData(**request_data)
+
+    xml = response_data.ResponseData if action_type == "64" else base64.b64decode(response_data.ResponseData).decode()
+    assert xml.count("<countryData>") == 3
+
+
+def test_countries_xml_invalidated_while_streaming_is_not_cached():
+    make(Country, title="Lithuania")
+    chunks = iter_cached_countries_xml()
+    next(chunks)
+
+    Country.objects.update(title="Latvia")
+    invalidate_countries_xml(list(Country.objects.values_list("id", flat=True)))
+    list(chunks)
+
+    assert b"Latvia" in b"".join(iter_cached_countries_xml())
+
+
+@pytest.mark.parametrize("engine", ["etree", "lxml"])
+@pytest.mark.parametrize("action_type", ["1", "64"])
+def test_get_data_returns_same_xml_with_each_engine(client: DjangoTestClient, settings, engine: str, action_type: str):
+    settings.RC_BROKER_XML_ENGINE = engine
+    countries = make(Country, title="Šveicarija", _quantity=3)
+    request_data = _get_request_data(action_type=action_type)
+
+    response_data = client.service.GetData(**request_data)
+    xml = response_data.ResponseData if action_type == "64" else base64.b64decode(response_data.ResponseData).decode()
+
+    expected_xml = f"<countries>{''.join(get_country_xml(country) for country in countries)}</countries>"
+    if action_type != "64":
+        expected_xml = expected_xml.replace("Š", "&#352;")
+    assert xml == expected_xml
+
+
+@pytest.mark.parametrize("action_type", ["1", "64"])
+def test_get_data_returns_updated_xml_after_country_or_continent_change(client: DjangoTestClient, action_type: str):
+    continent = make(Continent, name="Europe")
+    country = make(Country, continent=continent, title="Lithuania")
+    request_data = _get_request_data(action_type=action_type)
+    client.service.GetData(**request_data)
+
+    country.title = "Latvia"
+    country.save()
+    continent.name = "Asia"
+    continent.save()
+
+    response_data = client.service.GetData(**request_data)
+    xml = response_data.ResponseData if action_type == "64" else base64.b64decode(response_data.ResponseData).decode()
+    assert "<title>Latvia</title>" in xml
+    assert "<name>Asia</name>" in xml
+
+    country.delete()
+
+    response_data = client.service.GetData(**request_data)
+    xml = response_data.ResponseData if action_type == "64" else base64.b64decode(response_data.ResponseData).decode()
+    assert xml == "<countries />"
+
+
+def test_get_data_base64_encodes_non_ascii_characters_as_character_references(client: DjangoTestClient):
+    country = make(Country, title="Šveicarija")
+    request_data = _get_request_data()
+
+    response_data = client.service.GetData(**request_data)
+    assert (
+        f"<id>{country.id}</id><title>&#352;veicarija</title>" in base64.b64decode(response_data.ResponseData).decode()
+    )
+
+
+def _get_streamed_response_data(response) -> list[str]:
+    assert response.streaming
+    envelope = etree.fromstring(b"".join(response.streaming_content))
+    return [element.text for element in envelope.iterfind(".//{*}Output/{*}ResponseData")]
+
+
+def test_get_data_multiple_streams_country_per_output(client: DjangoTestClient, django_assert_num_queries):
+    continent = make(Continent, name="Europe")
+    countries = make(Country, continent=continent, _quantity=3)
+    request_data = _get_request_data()
+
+    response = client.service.GetDataMultiple.get_django_response(**request_data)
+    assert response.status_code == 200
+    assert [base64.b64decode(data).decode() for data in _get_streamed_response_data(response)] == [
+        f"<countries>{get_country_xml(country)}</countries>" for country in sorted(countries, key=lambda c: c.id)
+    ]
+
+    # Encoded countries are reused, only the countries are queried
+    with django_assert_num_queries(1):
+        response = client.service.GetDataMultiple.get_django_response(**request_data)
+        assert len(_get_streamed_response_data(response)) == 3
+
+
+def test_get_data_multiple_returns_country_xml_if_action_type_64(client: DjangoTestClient):
+    country = make(Country, title="Lithuania")
+    request_data = _get_request_data(action_type="64")
+
+    response = client.service.GetDataMultiple.get_django_response(**request_data)
+    assert _get_streamed_response_data(response) == [f"<countries>{get_country_xml(country)}</countries>"]
+
+
+def test_get_data_multiple_returns_updated_country_after_change(client: DjangoTestClient):
+    country = make(Country, title="Lithuania")
+    request_data = _get_request_data()
+    client.service.GetDataMultiple.get_django_response(**request_data)
+
+    country.title = "Latvia"
+    country.save()
+
+    response = client.service.GetDataMultiple.get_django_response(**request_data)
+    assert "<title>Latvia</title>" in base64.b64decode(_get_streamed_response_data(response)[0]).decode()
+
+
+def test_get_data_multiple_returns_fail_response_if_incorrect_signature(client: DjangoTestClient):
+    make(Country)
+    request_data = _get_request_data(action_type="60", signature="incorrect")
+
+    response_data = list(client.service.GetDataMultiple(**request_data))
+
+    assert len(response_data) == 1
+    assert response_data[0].ResponseCode == "-1"
+
+
+@pytest.mark.parametrize(
+    ("action_type", "file_path"),
+    [("1687", "nirvar/example1.xml"), ("249", "jadis/example5.xml")],
+)
+def test_rc_test_returns_base64_encoded_example(action_type: str, file_path: str):
+    rc_client = DjangoTestClient("/api/v1/rc/testing/", rc_testing_view.app)
+    example_number = file_path[-5]
+    request_data = _get_request_data(action_type=action_type)
+    request_data["input"]["CallerCode"] = example_number
+
+    response = rc_client.service.rc_test(**request_data)
+
+    assert response.ResponseCode == "1"
+    assert base64.b64decode(response.ResponseData) == (examples_path_root / file_path).read_bytes()
+
+
+def test_rc_test_returns_error_if_example_does_not_exist():
+    rc_client = DjangoTestClient("/api/v1/rc/testing/", rc_testing_view.app)
+    request_data = _get_request_data(action_type="1687")
+    request_data["input"]["CallerCode"] = "100"
+
+    response = rc_client.service.rc_test(**request_data)
+
+    assert response.ResponseCode == "-1"
+    assert base64.b64decode(response.ResponseData) == b"XML example file number 100 for action_type=1687 does not exist"
+
+
+def _write_example(path: Path, content: bytes, mtime_ns: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_xml_example_registry_scans_directories(tmp_path: Path):
+    _write_example(tmp_path / "nirvar" / "example1.xml", b"<a/>", 1)
+    _write_example(tmp_path / "100" / "example02.xml", b"<b/>", 1)
+    _write_example(tmp_path / "100" / "readme.txt", b"", 1)
+    _write_example(tmp_path / "unknown" / "example1.xml", b"<c/>", 1)
+
+    registry = XmlExampleRegistry(tmp_path)
+
+    assert registry.get_base64("1687", "1") == base64.b64encode(b"<a/>").decode()
+    assert registry.get_base64("100", "2") == base64.b64encode(b"<b/>").decode()
+    assert registry.get_base64("1687", "2") is None
+    assert registry.get_base64("unknown", "1") is None
+
+
+def test_xml_example_registry_reloads_changed_files(tmp_path: Path):
+    example_path = tmp_path / "jadis" / "example1.xml"
+    _write_example(example_path, b"<a/>", 1)
+    registry = XmlExampleRegistry(tmp_path)
+    assert registry.get_base64("249", "1") == base64.b64encode(b"<a/>").decode()
+
+    _write_example(example_path, b"<b/>", 2)
+    _write_example(tmp_path / "jadis" / "example2.xml", b"<c/>", 1)
+
+    # Files are not checked until directory is rescanned
+    assert registry.get_base64("249", "1") == base64.b64encode(b"<a/>").decode()
+    assert registry.get_base64("249", "2") is None
+
+    registry.reload_interval = 0
+    assert registry.get_base64("249", "1") == base64.b64encode(b"<b/>").decode()
+    assert registry.get_base64("249", "2") == base64.b64encode(b"<c/>").decode()
+
+    example_path.unlink()
+    assert registry.get_base64("249", "1") is None
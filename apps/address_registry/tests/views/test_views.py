@@ -1,4 +1,7 @@
 import base64
+import hashlib
+import json
+import logging
 
 import pytest
 from model_bakery.baker import make
@@ -7,16 +10,21 @@ from spyne.client.django import DjangoTestClient
 from apps.address_registry.models import (
     Continent,
     Country,
+    County,
     Document,
     DocumentAuthor,
+    Eldership,
     Settlement,
     Title,
 )
 from apps.address_registry.views.views import (
+    ContinentCountrySettlementViewSet,
+    administrative_units_application_soap,
     cities_application_soap,
     countries_application_soap,
     document_application_soap,
 )
+from apps.utils.query_budget import QueryBudgetMode, QueryLimitExceededError
 from apps.utils.tests_query_counter import APIClientWithQueryCounter
 
 
@@ -79,6 +87,18 @@ class TestCitiesApplicationSoap:
         assert data.id == title1.id
         assert data.settlement.id == settlement.id
 
+    def test_city_name_response_accent_insensitive(self, client: DjangoTestClient) -> None:
+        settlement = make(Settlement, title_lt="Šiauliai")
+        title = make(Title, settlement=settlement, title="Šiaulių")
+        make(Title, settlement=settlement, title="Vilniaus")
+
+        request_data = {"city_name_filter": {"title": "siauliu", "accent_insensitive": True}}
+        assert len(list(client.service.city_names(city_name_filter={"title": "siauliu"}))) == 0
+
+        response_data = list(client.service.city_names(**request_data))
+        assert len(response_data) == 1
+        assert response_data[0].id == title.id
+
 
 class TestCitiesApplicationJson:
     def test_city_response(self, client: APIClientWithQueryCounter) -> None:
@@ -100,6 +120,21 @@ class TestCitiesApplicationJson:
             title2.id,
         }
 
+    @pytest.mark.parametrize("client", [2], indirect=True)
+    def test_city_response_query_count_does_not_depend_on_settlement_count(
+        self, client: APIClientWithQueryCounter
+    ) -> None:
+        for settlement in make(Settlement, _quantity=5):
+            make(Title, settlement=settlement, _quantity=2)
+
+        response = client.get("/api/v1/cities/json/cities")
+        assert response.status_code == 200
+
+        response_data = response.json()
+        assert len(response_data) == 5
+        assert all(len(data["title_forms"]) == 2 for data in response_data)
+        assert all(data["xml_country_data"].startswith("<countryData>") for data in response_data)
+
     def test_city_name_response(self, client: APIClientWithQueryCounter) -> None:
         settlement = make(Settlement)
         title = make(Title, grammatical_case="GENITIVE", settlement=settlement)
@@ -318,6 +353,190 @@ class TestCountryApplicationJson:
         assert data.get("name") == continent.name
 
 
+class TestAdministrativeUnitApplicationSoap:
+    @pytest.fixture
+    def client(self) -> DjangoTestClient:
+        return DjangoTestClient("/api/v1/administrative-units/soap/", administrative_units_application_soap.app)
+
+    def test_eldership_response(self, client: DjangoTestClient) -> None:
+        eldership = make(Eldership)
+        municipality = eldership.municipality
+        make(Title, settlement=municipality.admin_unit.centre, _quantity=2)
+
+        response = client.service.elderships.get_django_response()
+        assert response.status_code == 200
+
+        response_data = list(client.service.elderships())
+        assert len(response_data) == 1
+
+        data = response_data[0]
+        assert data.id == eldership.id
+        assert data.municipality.id == municipality.id
+        assert data.municipality.admin_unit.title == municipality.admin_unit.title
+        assert data.municipality.county.id == municipality.county_id
+        assert len(data.municipality.admin_unit.centre.title_forms) == 2
+
+    def test_county_response_with_request_body(self, client: DjangoTestClient) -> None:
+        county = make(County, admin_unit__title="Vilniaus apskritis")
+        make(County, admin_unit__title="Kauno apskritis")
+
+        response_data = list(client.service.counties(unit_filter={"title": "vilniaus"}))
+        assert [data.id for data in response_data] == [county.id]
+
+
+class TestAdministrativeUnitApplicationJson:
+    def test_municipality_response(self, client: APIClientWithQueryCounter) -> None:
+        eldership = make(Eldership)
+        municipality = eldership.municipality
+        make(Title, settlement=municipality.admin_unit.centre, _quantity=2)
+
+        response = client.get("/api/v1/administrative-units/json/municipalities")
+        assert response.status_code == 200
+
+        response_data = response.json()
+        assert len(response_data) == 1
+
+        data = response_data[0]
+        assert data["id"] == municipality.id
+        assert data["admin_unit"]["centre"]["country"]["id"] == municipality.admin_unit.centre.country_id
+        assert len(data["admin_unit"]["centre"]["title_forms"]) == 2
+        assert data["county"]["admin_unit"]["id"] == municipality.county.admin_unit_id
+
+    def test_query_count_does_not_depend_on_number_of_units(self, client: APIClientWithQueryCounter) -> None:
+        for eldership in make(Eldership, _quantity=5):
+            make(Title, settlement=eldership.municipality.admin_unit.centre)
+
+        # Elderships joined with their lineage, title forms of municipality and county centres prefetched
+        response = client.get("/api/v1/administrative-units/json/elderships", query_limit=3)
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+
+
+class TestSpyneResponseCache:
+    def test_repeated_request_returned_from_cache(self, client: APIClientWithQueryCounter) -> None:
+        make(Country)
+
+        response = client.get("/api/v1/countries/json/countries")
+        assert response.status_code == 200
+        assert response["X-Cache"] == "MISS"
+
+        cached_response = client.get("/api/v1/countries/json/countries", query_limit=0)
+        assert cached_response.status_code == 200
+        assert cached_response["X-Cache"] == "HIT"
+        assert cached_response.content == response.content
+        assert cached_response["Content-Type"] == response["Content-Type"]
+
+    def test_query_parameter_order_does_not_change_cache_key(self, client: APIClientWithQueryCounter) -> None:
+        make(Country, code="LT", title_lt="Lietuva")
+
+        response = client.get("/api/v1/countries/json/countries?country_filter.code=LT&country_filter.title=Liet")
+        assert response["X-Cache"] == "MISS"
+
+        response = client.get("/api/v1/countries/json/countries?country_filter.title=Liet&country_filter.code=LT")
+        assert response["X-Cache"] == "HIT"
+
+        response = client.get("/api/v1/countries/json/countries?country_filter.code=LV")
+        assert response["X-Cache"] == "MISS"
+        assert response.json() == []
+
+    def test_cache_invalidated_when_model_changes(self, client: APIClientWithQueryCounter) -> None:
+        continent = make(Continent)
+        client.get("/api/v1/countries/json/continents")
+        client.get("/api/v1/documents/json/documents")
+
+        continent.name = "Updated"
+        continent.save()
+
+        response = client.get("/api/v1/countries/json/continents")
+        assert response["X-Cache"] == "MISS"
+        assert response.json()[0]["name"] == "Updated"
+
+        # Documents application does not depend on continents
+        assert client.get("/api/v1/documents/json/documents")["X-Cache"] == "HIT"
+
+    def test_cache_invalidated_when_test_data_generated(self, client: APIClientWithQueryCounter) -> None:
+        assert client.get("/api/v1/countries/json/countries").json() == []
+
+        Country.generate_test_data(quantity=2)
+
+        response = client.get("/api/v1/countries/json/countries")
+        assert response["X-Cache"] == "MISS"
+        assert len(response.json()) == 2
+
+    def test_soap_request_cached(self) -> None:
+        soap_client = DjangoTestClient("/api/v1/countries/soap/", countries_application_soap.app)
+        country = make(Country)
+
+        assert soap_client.service.countries.get_django_response()["X-Cache"] == "MISS"
+        assert soap_client.service.countries.get_django_response()["X-Cache"] == "HIT"
+        assert [data.id for data in soap_client.service.countries()] == [country.id]
+
+    def test_cache_disabled(self, client: APIClientWithQueryCounter, settings) -> None:
+        settings.SPYNE_RESPONSE_CACHE_TIMEOUT = 0
+
+        client.get("/api/v1/countries/json/countries")
+        response = client.get("/api/v1/countries/json/countries")
+        assert response.status_code == 200
+        assert "X-Cache" not in response
+
+
+class TestWsdlCache:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/v1/cities/soap/",
+            "/api/v1/documents/soap/",
+            "/api/v1/countries/soap/",
+            "/api/v1/rc/get-data/",
+            "/api/v1/rc/testing/",
+            "/api/v1/sodra/skola-sodrai/",
+        ],
+    )
+    def test_wsdl_returned_with_validators(self, client: APIClientWithQueryCounter, url: str) -> None:
+        response = client.get(f"{url}?wsdl", query_limit=0)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/xml; charset=utf-8"
+        assert response["ETag"] == f'"{hashlib.sha256(response.content).hexdigest()}"'
+        assert "Last-Modified" in response
+        assert f'location="http://testserver{url}"'.encode() in response.content
+
+    def test_not_modified_wsdl(self, client: APIClientWithQueryCounter) -> None:
+        response = client.get("/api/v1/countries/soap/?wsdl")
+
+        not_modified_response = client.get("/api/v1/countries/soap/?wsdl", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert not_modified_response.status_code == 304
+        assert not_modified_response.content == b""
+        assert not_modified_response["ETag"] == response["ETag"]
+
+        not_modified_response = client.get(
+            "/api/v1/countries/soap/?wsdl", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        assert not_modified_response.status_code == 304
+
+        modified_response = client.get("/api/v1/countries/soap/?wsdl", HTTP_IF_NONE_MATCH='"outdated"')
+        assert modified_response.status_code == 200
+        assert modified_response.content == response.content
+
+    def test_wsdl_built_once_per_url(self, client: APIClientWithQueryCounter, monkeypatch: pytest.MonkeyPatch) -> None:
+        wsdl11 = countries_application_soap.app.interface.docs.wsdl11
+        build_interface_document = wsdl11.build_interface_document
+        built_urls = []
+
+        def build(url: str) -> None:
+            built_urls.append(url)
+            build_interface_document(url)
+
+        monkeypatch.setattr(wsdl11, "build_interface_document", build)
+
+        client.get("/api/v1/countries/soap/?wsdl")
+        client.get("/api/v1/countries/soap/?wsdl")
+        response = client.get("/api/v1/countries/soap/?wsdl", HTTP_HOST="example.com")
+
+        assert built_urls == ["http://testserver/api/v1/countries/soap/", "http://example.com/api/v1/countries/soap/"]
+        assert b'location="http://example.com/api/v1/countries/soap/"' in response.content
+
+
 class TestGetDataEndpoints:
     @staticmethod
     def get_url(model_name: str) -> str:
@@ -342,7 +561,8 @@ class TestGetDataEndpoints:
                 "id": document.id,
                 "number": document.number,
                 "received": document.received.isoformat(),
-                "content": base64.b64encode(document.content).decode(),
+                "content_size": len(document.content),
+                "content_hash": hashlib.md5(document.content).hexdigest(),
                 "status": document.status,
                 "type": document.type,
                 "creation_date": document.creation_date.isoformat(),
@@ -400,3 +620,172 @@ class TestGetDataEndpoints:
                 ],
             }
         ]
+
+    def test_settlements_query_count_does_not_depend_on_object_count(
+        self, authorized_client: APIClientWithQueryCounter
+    ) -> None:
+        for continent in make(Continent, _quantity=2):
+            for country in make(Country, continent=continent, _quantity=2):
+                for settlement in make(Settlement, country=country, _quantity=3):
+                    make(Title, settlement=settlement, _quantity=2)
+
+        # User, continents, countries, settlements and titles
+        response = authorized_client.get(self.get_url("settlements"), query_limit=5)
+        assert response.status_code == 200
+        assert (
+            sum(len(settlement["title_forms"]) for settlement in response.data[0]["countries"][0]["settlements"]) == 6
+        )
+
+    def test_return_error_when_query_budget_exceeded(
+        self, authorized_client: APIClientWithQueryCounter, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(ContinentCountrySettlementViewSet, "query_budget", 1)
+        make(Title)
+
+        with pytest.raises(QueryLimitExceededError):
+            authorized_client.get(self.get_url("settlements"))
+
+    def test_query_budget_exceeded_logged(
+        self, authorized_client: APIClientWithQueryCounter, monkeypatch, settings, caplog
+    ) -> None:
+        monkeypatch.setattr(ContinentCountrySettlementViewSet, "query_budget", 1)
+        settings.QUERY_BUDGET_MODE = QueryBudgetMode.LOG
+        make(Title)
+
+        with caplog.at_level(logging.WARNING, logger="app"):
+            response = authorized_client.get(self.get_url("settlements"))
+
+        assert response.status_code == 200
+        assert "Too many queries." in caplog.text
+        assert "limit: 1. Request: GET /api/v1/settlements/" in caplog.text
+
+    def test_documents_returned_with_keyset_pagination(self, authorized_client: APIClientWithQueryCounter) -> None:
+        documents = make(Document, _quantity=5)
+
+        response = authorized_client.get(self.get_url("documents"), {"pagination": "keyset", "limit": 2})
+        assert response.status_code == 200
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        assert [data["id"] for data in response.data["results"]] == [document.id for document in documents[:2]]
+
+        response = authorized_client.get(response.data["next"])
+        assert [data["id"] for data in response.data["results"]] == [document.id for document in documents[2:4]]
+
+        response = authorized_client.get(response.data["next"])
+        assert [data["id"] for data in response.data["results"]] == [documents[4].id]
+        assert response.data["next"] is None
+
+    def test_settlements_returned_with_keyset_pagination_and_count(
+        self, authorized_client: APIClientWithQueryCounter
+    ) -> None:
+        continents = make(Continent, _quantity=3)
+
+        response = authorized_client.get(
+            self.get_url("settlements"), {"pagination": "keyset", "limit": 2, "count": "true"}
+        )
+        assert response.status_code == 200
+        assert response.data["count"] == 3
+        assert [data["code"] for data in response.data["results"]] == sorted(
+            continent.code for continent in continents
+        )[:2]
+
+    def test_pagination_parameters_documented_once(self, client: APIClientWithQueryCounter) -> None:
+        response = client.get("/swagger.json/")
+        assert response.status_code == 200
+
+        parameters = [
+            parameter["name"] for parameter in response.json()["paths"]["/v1/documents/"]["get"]["parameters"]
+        ]
+        assert sorted(parameters) == ["cursor", "limit", "offset"]
+
+    def test_both_pagination_responses_documented(self, client: APIClientWithQueryCounter) -> None:
+        response = client.get("/swagger.json/")
+        assert response.status_code == 200
+
+        schema = response.json()["paths"]["/v1/documents/"]["get"]["responses"]["200"]["schema"]
+        assert schema["required"] == ["results"]
+        assert {"count", "limit", "offset", "totalPages", "currentPage", "next", "previous", "results"} == set(
+            schema["properties"]
+        )
+        assert schema["properties"]["totalPages"]["description"] == "Returned with offset pagination"
+        assert schema["properties"]["next"]["description"] == "Returned with keyset pagination"
+
+    def test_documents_returned_with_offset_pagination(self, authorized_client: APIClientWithQueryCounter) -> None:
+        make(Document, _quantity=3)
+
+        response = authorized_client.get(self.get_url("documents"), {"limit": 2, "offset": 2})
+        assert response.status_code == 200
+        assert response.data["count"] == 3
+        assert len(response.data["results"]) == 1
+
+    def test_documents_streamed_as_ndjson(self, authorized_client: APIClientWithQueryCounter) -> None:
+        documents = make(Document, _quantity=3)
+
+        response = authorized_client.get(self.get_url("documents"), {"all": "true", "stream": "ndjson"})
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [document.id for document in documents]
+
+    def test_settlements_streamed_as_json_array(self, authorized_client: APIClientWithQueryCounter) -> None:
+        continent = make(Continent)
+        country = make(Country, continent=continent)
+        make(Settlement, country=country)
+
+        response = authorized_client.get(self.get_url("settlements"), {"all": "true"})
+        streamed_response = authorized_client.get(self.get_url("settlements"), {"all": "true", "stream": "json"})
+        assert streamed_response.status_code == 200
+        assert streamed_response["Content-Type"] == "application/json"
+        assert json.loads(b"".join(streamed_response.streaming_content)) == response.json()
+
+    def test_empty_json_array_streamed(self, authorized_client: APIClientWithQueryCounter) -> None:
+        response = authorized_client.get(self.get_url("documents"), {"all": "true", "stream": "json"})
+        assert b"".join(response.streaming_content) == b"[]"
+
+    def test_document_detail_returns_content(self, authorized_client: APIClientWithQueryCounter) -> None:
+        document = make(Document, content=b"content")
+        response = authorized_client.get(f"{self.get_url('documents')}{document.id}/")
+        assert response.status_code == 200
+        assert response.data["content"] == base64.b64encode(b"content").decode()
+
+    def test_document_content_downloaded(self, authorized_client: APIClientWithQueryCounter) -> None:
+        document = make(Document, content=b"0123456789")
+        response = authorized_client.get(f"{self.get_url('documents')}{document.id}/content/")
+        assert response.status_code == 200
+        assert response["Content-Length"] == "10"
+        assert response["Accept-Ranges"] == "bytes"
+        assert b"".join(response.streaming_content) == b"0123456789"
+
+    @pytest.mark.parametrize(
+        ("range_header", "content_range", "content"),
+        [
+            ("bytes=2-4", "bytes 2-4/10", b"234"),
+            ("bytes=7-", "bytes 7-9/10", b"789"),
+            ("bytes=-2", "bytes 8-9/10", b"89"),
+            ("bytes=8-100", "bytes 8-9/10", b"89"),
+        ],
+    )
+    def test_document_content_range_downloaded(
+        self, authorized_client: APIClientWithQueryCounter, range_header: str, content_range: str, content: bytes
+    ) -> None:
+        document = make(Document, content=b"0123456789")
+        response = authorized_client.get(f"{self.get_url('documents')}{document.id}/content/", HTTP_RANGE=range_header)
+        assert response.status_code == 206
+        assert response["Content-Range"] == content_range
+        assert response["Content-Length"] == str(len(content))
+        assert b"".join(response.streaming_content) == content
+
+    def test_document_content_downloaded_in_chunks(
+        self, authorized_client: APIClientWithQueryCounter, monkeypatch
+    ) -> None:
+        monkeypatch.setattr("apps.address_registry.views.views.DOCUMENT_CONTENT_CHUNK_SIZE", 3)
+        document = make(Document, content=b"0123456789")
+        response = authorized_client.get(f"{self.get_url('documents')}{document.id}/content/", HTTP_RANGE="bytes=1-")
+        assert list(response.streaming_content) == [b"123", b"456", b"789"]
+
+    def test_document_content_range_not_satisfiable(self, authorized_client: APIClientWithQueryCounter) -> None:
+        document = make(Document, content=b"0123456789")
+        response = authorized_client.get(f"{self.get_url('documents')}{document.id}/content/", HTTP_RANGE="bytes=10-")
+        assert response.status_code == 416
+        assert response["Content-Range"] == "bytes */10"
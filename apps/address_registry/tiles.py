@@ -0,0 +1,65 @@
+"""
+tiles.py
+Mapbox vector tiles (MVT) of administrative boundaries, one layer per administrative level.
+
+Boundaries overlapping the tile (`&&`, GiST index) are simplified to the pixel size of the zoom level, clipped and
+quantized to tile coordinates (ST_AsMVTGeom) and encoded (ST_AsMVT) by PostGIS. Tiles are cached on disk (tile_cache).
+"""
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Transform
+from django.db import connection
+from django.db.models import F
+
+from apps.address_registry.models import AdministrativeHierarchy, AdministrativeLevel
+from apps.utils.spatial import (
+    WEB_MERCATOR_SRID,
+    AsMVTGeom,
+    SimplifyPreserveTopology,
+    get_simplify_tolerance,
+    get_tile_envelope,
+)
+from apps.utils.tile_cache import TileCache
+
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+MVT_EXTENT = 4096
+# Geometries are clipped with a buffer (in tile coordinates), so that lines at tile edges are rendered seamlessly
+MVT_BUFFER = 64
+
+# Levels by layer names used in tile urls
+TILE_LAYERS = {level.lower(): level for level in AdministrativeLevel.values}
+
+tile_cache = TileCache(settings.TILE_CACHE_DIR, settings.TILE_CACHE_MAX_SIZE)
+
+
+def render_tile(layer: str, z: int, x: int, y: int) -> bytes:
+    geometry_field = f"{layer}_admin_unit__boundary__geometry"
+    envelope = get_tile_envelope(z, x, y)
+    geometry = Transform(SimplifyPreserveTopology(geometry_field, get_simplify_tolerance(z)), WEB_MERCATOR_SRID)
+    queryset = AdministrativeHierarchy.objects.filter(
+        level=TILE_LAYERS[layer], **{f"{geometry_field}__bboverlaps": envelope}
+    ).values(
+        unit_id=F(f"{layer}_id"),
+        title=F(f"{layer}_title"),
+        code=F(f"{layer}_code"),
+        geom=AsMVTGeom(geometry, envelope, MVT_EXTENT, MVT_BUFFER),
+    )
+
+    # ST_AsMVT aggregates whole rows, which can not be expressed with ORM, so rows query is wrapped
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT ST_AsMVT(tile, %s, %s, 'geom', 'unit_id') FROM ({sql}) AS tile WHERE geom IS NOT NULL",
+            [layer, MVT_EXTENT, *params],
+        )
+        (tile,) = cursor.fetchone()
+    return bytes(tile) if tile else b""
+
+
+def get_tile(layer: str, z: int, x: int, y: int) -> bytes:
+    key = f"{layer}/{z}/{x}/{y}"
+    tile = tile_cache.get(key)
+    if tile is None:
+        tile = render_tile(layer, z, x, y)
+        tile_cache.set(key, tile)
+    return tile
@@ -4,9 +4,13 @@ from rest_framework.routers import DefaultRouter
 from apps.address_registry.views.rc_broker_views import get_data, rc_testing_view
 from apps.address_registry.views.sodra_views import skola_sodrai_view
 from apps.address_registry.views.views import (
+    AdministrativeBoundaryTileView,
     ContinentCountrySettlementViewSet,
     DocumentViewSet,
     GenerateTestData,
+    ImportData,
+    administrative_units_application_json,
+    administrative_units_application_soap,
     cities_application_json,
     cities_application_soap,
     cities_application_xml,
@@ -49,9 +53,20 @@ urlpatterns = [
             ]
         ),
     ),
+    path(
+        "administrative-units/",
+        include(
+            [
+                re_path(r"^json/", administrative_units_application_json),
+                re_path(r"^soap/", administrative_units_application_soap),
+                path("tiles/<str:layer>/<int:z>/<int:x>/<int:y>/", AdministrativeBoundaryTileView.as_view()),
+            ]
+        ),
+    ),
     re_path(r"^rc/get-data/", get_data),
     re_path(r"^rc/testing/", rc_testing_view),
     re_path(r"^sodra/skola-sodrai/", skola_sodrai_view),
     path("<str:app_label>/<str:model_name>/generate/", GenerateTestData.as_view()),
+    path("<str:app_label>/<str:model_name>/import/", ImportData.as_view()),
     path("", include(router.urls)),
 ]
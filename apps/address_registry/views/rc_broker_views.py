@@ -1,17 +1,28 @@
 import base64
 import binascii
-import xml.etree.ElementTree as ET
+from collections.abc import Iterator
 from enum import Enum
+from itertools import islice
 
 from django.views.decorators.csrf import csrf_exempt
-from spyne import Application, ComplexModel, Iterable, Mandatory, String, rpc
+from spyne import ComplexModel, Iterable, Mandatory, String, rpc
 from spyne.protocol.soap import Soap11
-from spyne.server.django import DjangoApplication
 from spyne.service import Service
 
-from apps.address_registry.helpers import construct_countries_xml, construct_country_xml
+from apps.address_registry.helpers import (
+    COUNTRIES_CHUNK_SIZE,
+    get_countries_xml_base64_fragments,
+    get_countries_xml_fragments,
+    iter_cached_countries_xml,
+    iter_cached_countries_xml_base64,
+    wrap_countries_xml,
+)
 from apps.address_registry.models import Country
-from apps.address_registry.rc_examples.helpers import get_xml_file_path
+from apps.address_registry.rc_examples.helpers import xml_examples
+from apps.utils.basic_auth import CredentialCache
+from apps.utils.spyne_registry import spyne_applications
+from apps.utils.spyne_streaming import StreamingSoapDjangoApplication, stream_soap_response, stream_soap_result
+from apps.utils.spyne_wsdl import WsdlCachedDjangoApplication
 
 
 class Actions(Enum):
@@ -47,18 +58,33 @@ def _get_decoded_params(parameter: str) -> str:
     return decoded_params
 
 
-def _get_response_data(action_type: str, xml_data: ET.Element) -> str | bytes:
+def _iter_country_response_data(action_type: str) -> Iterator[str | bytes]:
+    """Yields ResponseData with single country <countries> document for each country"""
+    countries = Country.objects.all().select_related("continent").iterator(chunk_size=COUNTRIES_CHUNK_SIZE)
+    while chunk := list(islice(countries, COUNTRIES_CHUNK_SIZE)):
+        if action_type == Actions.NO_BASE64_ACTION.value:  # Returns ResponseData without base64 encoding
+            yield from (wrap_countries_xml([country_xml]) for country_xml in get_countries_xml_fragments(chunk))
+        else:
+            yield from get_countries_xml_base64_fragments(chunk)
+
+
+def _iter_countries_response_data(action_type: str) -> Iterator[str]:
+    """Yields ResponseData with all countries in chunks, cached ones or while XML is being written"""
     if action_type == Actions.NO_BASE64_ACTION.value:  # Returns ResponseData without base64 encoding
-        countries_data = ET.tostring(xml_data, encoding="unicode")
+        for chunk in iter_cached_countries_xml():
+            yield chunk.decode("utf-8")
     else:
-        countries_data = base64.b64encode(ET.tostring(xml_data))
+        for chunk in iter_cached_countries_xml_base64():
+            yield chunk.decode("ascii")
+
 
-    return countries_data
+signature_cache = CredentialCache()
 
 
 def _fake_authenticate(action_type: str, signature: str) -> bool:
     if action_type == Actions.AUTHENTICATED_RESPONSE_ACTION.value:
-        return signature in ALLOWED_SIGNATURES
+        # Successfully verified signatures are cached, so real (expensive) signature check is not repeated
+        return signature_cache.verify(signature, lambda: signature in ALLOWED_SIGNATURES)
     return True
 
 
@@ -67,7 +93,7 @@ class Get(Service):
     __port_types__ = ("GetPort",)
 
     @rpc(Mandatory(Input), _returns=Output, _port_type="GetPort")
-    def GetData(self, input: Input) -> dict:  # noqa: N802, A002
+    def GetData(ctx, input: Input) -> dict | None:  # noqa: N802, N805, A002
         decoded_params = _get_decoded_params(input.Parameters)
 
         if not _fake_authenticate(input.ActionType, input.Signature):
@@ -77,13 +103,16 @@ class Get(Service):
                 "DecodedParameters": decoded_params,
             }
 
-        countries_xml = construct_countries_xml()
-        countries_str = _get_response_data(input.ActionType, countries_xml)
-
-        return {"ResponseCode": "1", "ResponseData": countries_str, "DecodedParameters": decoded_params}
+        # Response is streamed, XML is written, encoded and sent in chunks
+        response_data = _iter_countries_response_data(input.ActionType)
+        return stream_soap_result(
+            ctx,
+            {"ResponseCode": "1", "ResponseData": response_data, "DecodedParameters": decoded_params},
+            Output,
+        )
 
     @rpc(Mandatory(Input), _returns=Iterable(Output), _port_type="GetPort")
-    def GetDataMultiple(self, input: Input) -> list[dict]:  # noqa: N802, A002
+    def GetDataMultiple(ctx, input: Input) -> list:  # noqa: N802, N805, A002
         decoded_params = _get_decoded_params(input.Parameters)
 
         if not _fake_authenticate(input.ActionType, input.Signature):
@@ -95,18 +124,13 @@ class Get(Service):
                 }
             ]
 
-        response_data = []
-
-        for country in Country.objects.all().select_related("continent"):
-            country_xml = ET.Element("countries")
-            country_xml.append(construct_country_xml(country))
-            country_str = _get_response_data(input.ActionType, country_xml)
-
-            response_data.append(
-                {"ResponseCode": "1", "ResponseData": country_str, "DecodedParameters": decoded_params}
-            )
-
-        return response_data
+        # Response is streamed, countries are read and serialized while it is being sent. Response body is written
+        # to ctx.out_string by stream_soap_response, the returned empty list only stands in for the result
+        response_data = (
+            {"ResponseCode": "1", "ResponseData": country_data, "DecodedParameters": decoded_params}
+            for country_data in _iter_country_response_data(input.ActionType)
+        )
+        return stream_soap_response(ctx, response_data, Output)
 
 
 class RcTestingService(Service):
@@ -115,30 +139,28 @@ class RcTestingService(Service):
 
     @rpc(Mandatory(Input), _returns=Output, _port_type="RcPort")
     def rc_test(self, input: Input) -> dict:  # noqa: N802, A002
+        xml_base64 = xml_examples.get_base64(input.ActionType, input.CallerCode)
 
-        xml_file_path = get_xml_file_path(input.ActionType, input.CallerCode)
-        error_message = f"XML example file number {input.CallerCode} for action_type={input.ActionType} does not exist"
-
-        if not xml_file_path:
+        if xml_base64 is None:
+            error_message = (
+                f"XML example file number {input.CallerCode} for action_type={input.ActionType} does not exist"
+            )
             return {
                 "ResponseCode": "-1",
                 "ResponseData": base64.b64encode(error_message.encode("utf-8")).decode("utf-8"),
                 "DecodedParameters": "",
             }
 
-        with open(xml_file_path, "rb") as f:
-            xml_bytes = f.read()
-
         return {
             "ResponseCode": "1",
-            "ResponseData": base64.b64encode(xml_bytes).decode("utf-8"),
-            "DecodedParameters": ""
+            "ResponseData": xml_base64,
+            "DecodedParameters": "",
         }
 
 
 get_data = csrf_exempt(
-    DjangoApplication(
-        Application(
+    StreamingSoapDjangoApplication(
+        spyne_applications.get_application(
             [Get],
             tns="Get",
             name="Get",
@@ -150,8 +172,8 @@ get_data = csrf_exempt(
 
 
 rc_testing_view = csrf_exempt(
-    DjangoApplication(
-        Application(
+    WsdlCachedDjangoApplication(
+        spyne_applications.get_application(
             [RcTestingService],
             tns="rc_testing_view",
             name="rc_testing_view",
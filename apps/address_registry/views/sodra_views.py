@@ -1,15 +1,14 @@
-import base64
-import binascii
-from collections.abc import Callable
 from datetime import datetime
-from functools import wraps
 
 from django.views.decorators.csrf import csrf_exempt
-from spyne import Application, ComplexModel, Date, DateTime, Fault, Integer, String, XmlAttribute, rpc
+from spyne import Array, ComplexModel, Date, DateTime, Fault, Integer, String, XmlAttribute, rpc
 from spyne.protocol.soap import Soap11
-from spyne.server.django import DjangoApplication
 from spyne.service import Service
 
+from apps.utils.basic_auth import BasicAuthVerifier, basic_auth_decorator
+from apps.utils.spyne_registry import spyne_applications
+from apps.utils.spyne_wsdl import WsdlCachedDjangoApplication
+
 
 class Skola(ComplexModel):
     rezultatas = String()
@@ -54,32 +53,22 @@ class SkolasodraiError(ComplexModel):
     laikas = XmlAttribute(DateTime)
 
 
-def fake_auth_decorator(func: Callable) -> Callable:
-    """This decorator imitates HTTP Basic Auth. Only allows username: test_user, password: test_password"""
+class SkolaSodraiResult(ComplexModel):
+    """Result of a single person check in SkolaSodraiBatch - either `atsakymas` or `klaida` is set"""
 
-    @wraps(func)
-    def wrapper(self, skola_sodrai: Skolasodrai, *args, **kwargs) -> Callable:
-        auth = self.transport.headers.get("authorization", "")
-        if isinstance(auth, list):
-            auth = auth[0]
+    atsakymas = SkolaSodraiResponse
+    klaida = SkolasodraiError
 
-        if not auth or not auth.lower().startswith("basic"):
-            raise Fault(faultcode="Client", faultstring="Invalid auth header")
 
-        try:
-            auth_decoded = base64.b64decode(auth.split()[1]).decode("utf-8")
-            username, password = auth_decoded.split(":", 1)
-        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error, IndexError) as exception:
-            raise Fault(
-                faultcode="Client", faultstring="Invalid basic header. Credentials not correctly base64 encoded"
-            ) from exception
+SKOLA_SODRAI_BATCH_MAX_SIZE = 1000
 
-        if username == "test_user" and password == "test_password":
-            return func(self, skola_sodrai, *args, **kwargs)
 
-        raise Fault(faultcode="Client", faultstring="Invalid credentials")
+def _check_fake_credentials(username: str, password: str) -> bool:
+    """Imitates credential check. Only allows username: test_user, password: test_password"""
+    return username == "test_user" and password == "test_password"
 
-    return wrapper
+
+fake_auth_decorator = basic_auth_decorator(BasicAuthVerifier(_check_fake_credentials))
 
 
 class SkolasodraiService(Service):
@@ -88,6 +77,7 @@ class SkolasodraiService(Service):
 
     @rpc(
         Skolasodrai,
+        _args=("skola_sodrai",),
         _returns=SkolaSodraiResponse,
         _throws=[SkolasodraiError],
         _port_type="skolasodraiPortType",
@@ -95,41 +85,82 @@ class SkolasodraiService(Service):
     )
     @fake_auth_decorator
     def SkolaSodrai(self, skola_sodrai: Skolasodrai) -> SkolaSodraiResponse:  # noqa: N802
-        if skola_sodrai.asm_kodas and len(str(skola_sodrai.asm_kodas)) != 11:
-            details = {
-                "asm_kodas": skola_sodrai.asm_kodas,
-                "vardas": skola_sodrai.vardas,
-                "pavarde": skola_sodrai.pavarde,
-                "gim_data": skola_sodrai.gim_data,
-                "sds": skola_sodrai.sds,
-                "sdn": skola_sodrai.sdn,
-                "klaida": '"asm_kodas" turi būti sudarytas iš 11 skaičių',
-                "laikas": datetime.now(),
-            }
-
-            raise Fault(faultcode="Client", faultstring="Invalid input data", detail=details)
-
-        # Mock logic: debtor if asm_kodas is even
-        debtor = (skola_sodrai.asm_kodas or 0) % 2 == 0
-
-        return SkolaSodraiResponse(
-            asmuo=Asmuo(
-                asm_kodas=skola_sodrai.asm_kodas,
-                vardas=skola_sodrai.vardas,
-                pavarde=skola_sodrai.pavarde,
-                gim_data=skola_sodrai.gim_data,
-                sds=skola_sodrai.sds,
-                sdn=skola_sodrai.sdn,
-                pavadinimas="",
-                skola=Skola(rezultatas="Taip" if debtor else "Ne"),
-            ),
-            laikas=datetime.now(),
-        )
+        if error := _validate_skola_sodrai(skola_sodrai):
+            raise Fault(
+                faultcode="Client", faultstring="Invalid input data", detail=_get_error_details(skola_sodrai, error)
+            )
+
+        return _get_skola_sodrai_response(skola_sodrai)
+
+    @rpc(
+        Array(Skolasodrai),
+        _args=("skolos_sodrai",),
+        _returns=Array(SkolaSodraiResult),
+        _port_type="skolasodraiPortType",
+    )
+    @fake_auth_decorator
+    def SkolaSodraiBatch(self, skolos_sodrai: list[Skolasodrai] | None) -> list[SkolaSodraiResult]:  # noqa: N802
+        """
+        Checks multiple persons in one call. Invalid person does not fail the whole call, its error is returned in
+        `klaida` of the person's result instead.
+        """
+        skolos_sodrai = skolos_sodrai or []
+        if len(skolos_sodrai) > SKOLA_SODRAI_BATCH_MAX_SIZE:
+            raise Fault(
+                faultcode="Client",
+                faultstring=f"Too many persons in one call. Maximum is {SKOLA_SODRAI_BATCH_MAX_SIZE}",
+            )
+
+        results = []
+        for skola_sodrai in skolos_sodrai:
+            if error := _validate_skola_sodrai(skola_sodrai):
+                results.append(SkolaSodraiResult(klaida=SkolasodraiError(**_get_error_details(skola_sodrai, error))))
+            else:
+                results.append(SkolaSodraiResult(atsakymas=_get_skola_sodrai_response(skola_sodrai)))
+        return results
+
+
+def _validate_skola_sodrai(skola_sodrai: Skolasodrai) -> str | None:
+    if skola_sodrai.asm_kodas and len(str(skola_sodrai.asm_kodas)) != 11:
+        return '"asm_kodas" turi būti sudarytas iš 11 skaičių'
+    return None
+
+
+def _get_error_details(skola_sodrai: Skolasodrai, error: str) -> dict:
+    return {
+        "asm_kodas": skola_sodrai.asm_kodas,
+        "vardas": skola_sodrai.vardas,
+        "pavarde": skola_sodrai.pavarde,
+        "gim_data": skola_sodrai.gim_data,
+        "sds": skola_sodrai.sds,
+        "sdn": skola_sodrai.sdn,
+        "klaida": error,
+        "laikas": datetime.now(),
+    }
+
+
+def _get_skola_sodrai_response(skola_sodrai: Skolasodrai) -> SkolaSodraiResponse:
+    # Mock logic: debtor if asm_kodas is even
+    debtor = (skola_sodrai.asm_kodas or 0) % 2 == 0
+
+    return SkolaSodraiResponse(
+        asmuo=Asmuo(
+            asm_kodas=skola_sodrai.asm_kodas,
+            vardas=skola_sodrai.vardas,
+            pavarde=skola_sodrai.pavarde,
+            gim_data=skola_sodrai.gim_data,
+            sds=skola_sodrai.sds,
+            sdn=skola_sodrai.sdn,
+            pavadinimas="",
+            skola=Skola(rezultatas="Taip" if debtor else "Ne"),
+        ),
+        laikas=datetime.now(),
+    )
 
 
 skola_sodrai_view = csrf_exempt(
-    DjangoApplication(
-        Application(
+    WsdlCachedDjangoApplication(
+        spyne_applications.get_application(
             [SkolasodraiService],
             tns="SkolaSodraiService",
             name="SkolaSodraiService",
@@ -1,27 +1,35 @@
+from io import BytesIO
+
 from django.apps import apps as django_apps
+from django.db.models import QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import serializers, status, viewsets
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from spyne import Application
 from spyne.protocol.http import HttpRpc
-from spyne.protocol.json import JsonDocument
 from spyne.protocol.soap import Soap11
 from spyne.protocol.xml import XmlDocument
-from spyne.server.django import DjangoApplication
 
+from apps.address_registry.helpers import ResponseCacheNamespace, iter_document_content
+from apps.address_registry.importers import IMPORT_CONTENT_TYPES, BulkImporter, BulkImportError
 from apps.address_registry.models import (
     Continent,
     Document,
 )
 from apps.address_registry.serializers import (
     ContinentCountrySettlementSerializer,
+    DocumentListSerializer,
     DocumentSerializer,
 )
 from apps.address_registry.services import (
+    AdministrativeBoundaryService,
+    AdministrativeUnitService,
     CityNameService,
     CityService,
     ContinentService,
@@ -29,97 +37,156 @@ from apps.address_registry.services import (
     DocumentAuthorService,
     DocumentService,
 )
+from apps.address_registry.tiles import MVT_CONTENT_TYPE, TILE_LAYERS, get_tile
+from apps.utils.json_renderers import FastJsonDocument
+from apps.utils.pagination import SelectablePagination
+from apps.utils.query_budget import QueryBudgetMixin
+from apps.utils.query_planning import QueryPlanningMixin
+from apps.utils.spatial import is_valid_tile
+from apps.utils.spyne_cache import CachedDjangoApplication
+from apps.utils.spyne_registry import spyne_applications
+from apps.utils.streaming import RangeNotSatisfiableError, StreamingExportMixin, parse_byte_range
+from apps.utils.values_serializers import ValuesSerializerMixin
+
+# Size of document content chunk read from the database per query
+DOCUMENT_CONTENT_CHUNK_SIZE = 64 * 1024
 
 cities_application_soap = csrf_exempt(
-    DjangoApplication(
-        Application(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
             [CityService, CityNameService],
             tns="cities_application_tns",
             name="CitiesApplication",
             in_protocol=Soap11(validator="lxml"),
             out_protocol=Soap11(validator="soft"),
-        )
+        ),
+        cache_namespace=ResponseCacheNamespace.CITIES,
     )
 )
 
 
 cities_application_json = csrf_exempt(
-    DjangoApplication(
-        Application(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
             [CityService, CityNameService],
             tns="cities_application_tns",
             name="CitiesApplication",
             in_protocol=HttpRpc(validator="soft"),
-            out_protocol=JsonDocument(validator="soft"),
-        )
+            out_protocol=FastJsonDocument(validator="soft"),
+        ),
+        cache_namespace=ResponseCacheNamespace.CITIES,
     )
 )
 
 
 cities_application_xml = csrf_exempt(
-    DjangoApplication(
-        Application(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
             [CityService, CityNameService],
             tns="cities_application_tns",
             name="CitiesApplication",
             in_protocol=HttpRpc(validator="soft"),
             out_protocol=XmlDocument(validator="soft"),
-        )
+        ),
+        cache_namespace=ResponseCacheNamespace.CITIES,
     )
 )
 
 
 document_application_json = csrf_exempt(
-    DjangoApplication(
-        Application(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
             [DocumentService, DocumentAuthorService],
             tns="document_application_tns",
             name="DocumentApplication",
             in_protocol=HttpRpc(validator="soft"),
-            out_protocol=JsonDocument(validator="soft"),
-        )
+            out_protocol=FastJsonDocument(validator="soft"),
+        ),
+        cache_namespace=ResponseCacheNamespace.DOCUMENTS,
     )
 )
 
 document_application_soap = csrf_exempt(
-    DjangoApplication(
-        Application(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
             [DocumentService, DocumentAuthorService],
             tns="document_application_tns",
             name="DocumentApplication",
             in_protocol=Soap11(validator="lxml"),
             out_protocol=Soap11(validator="soft"),
-        )
+        ),
+        cache_namespace=ResponseCacheNamespace.DOCUMENTS,
     )
 )
 
 countries_application_json = csrf_exempt(
-    DjangoApplication(
-        Application(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
             [ContinentService, CountryService],
             tns="countries_application_tns",
             name="CountryApplication",
             in_protocol=HttpRpc(validator="soft"),
-            out_protocol=JsonDocument(validator="soft"),
-        )
+            out_protocol=FastJsonDocument(validator="soft"),
+        ),
+        cache_namespace=ResponseCacheNamespace.COUNTRIES,
     )
 )
 
 countries_application_soap = csrf_exempt(
-    DjangoApplication(
-        Application(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
             [ContinentService, CountryService],
             tns="countries_application_tns",
             name="CountryApplication",
             in_protocol=Soap11(validator="lxml"),
             out_protocol=Soap11(validator="soft"),
-        )
+        ),
+        cache_namespace=ResponseCacheNamespace.COUNTRIES,
+    )
+)
+
+
+administrative_units_application_json = csrf_exempt(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
+            [AdministrativeUnitService, AdministrativeBoundaryService],
+            tns="administrative_units_application_tns",
+            name="AdministrativeUnitApplication",
+            in_protocol=HttpRpc(validator="soft"),
+            out_protocol=FastJsonDocument(validator="soft"),
+        ),
+        cache_namespace=ResponseCacheNamespace.ADMINISTRATIVE_UNITS,
     )
 )
 
+administrative_units_application_soap = csrf_exempt(
+    CachedDjangoApplication(
+        spyne_applications.get_application(
+            [AdministrativeUnitService, AdministrativeBoundaryService],
+            tns="administrative_units_application_tns",
+            name="AdministrativeUnitApplication",
+            in_protocol=Soap11(validator="lxml"),
+            out_protocol=Soap11(validator="soft"),
+        ),
+        cache_namespace=ResponseCacheNamespace.ADMINISTRATIVE_UNITS,
+    )
+)
+
+
+class AdministrativeBoundaryTileView(APIView):
+    """Mapbox vector tile of county, municipality or eldership boundaries"""
+
+    permission_classes = []
+
+    def get(self, request: Request, layer: str, z: int, x: int, y: int) -> HttpResponse | Response:
+        if layer not in TILE_LAYERS or not is_valid_tile(z, x, y):
+            return Response(f"Tile {layer}/{z}/{x}/{y} does not exist", status=status.HTTP_404_NOT_FOUND)
+        return HttpResponse(get_tile(layer, z, x, y), content_type=MVT_CONTENT_TYPE)
+
 
 class GenerateTestDataSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=1, max_value=1000, required=True)
+    fan_out = serializers.IntegerField(min_value=1, max_value=1000, default=1)
 
 
 class GenerateTestData(APIView):
@@ -145,18 +212,106 @@ class GenerateTestData(APIView):
                 f"Test data for model {model_class.__name__} cannot be generated", status=status.HTTP_404_NOT_FOUND
             )
 
-        model_class.generate_test_data(quantity=serializer.validated_data["quantity"])
+        model_class.generate_test_data(
+            quantity=serializer.validated_data["quantity"], fan_out=serializer.validated_data["fan_out"]
+        )
 
         return Response(status=status.HTTP_201_CREATED)
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
-    queryset = Document.objects.all().prefetch_related("documentauthor")
+class ImportData(APIView):
+    """Imports CSV (with header row) or NDJSON dump sent as request body, existing rows with the same ids are updated"""
+
+    # Existing data is overwritten
+    permission_classes = [
+        IsAdminUser,
+    ]
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_BINARY),
+        consumes=list(IMPORT_CONTENT_TYPES),
+    )
+    def post(self, request: Request, app_label: str, model_name: str) -> Response:
+        try:
+            model_class = django_apps.get_model(app_label, model_name)
+        except LookupError:
+            return Response(
+                f"Django model '{model_name}' in app '{app_label}' does not exist", status=status.HTTP_404_NOT_FOUND
+            )
+
+        if not BulkImporter.supports(model_class):
+            return Response(
+                f"Data of model {model_class.__name__} cannot be imported", status=status.HTTP_404_NOT_FOUND
+            )
+
+        content_type = request.content_type.split(";")[0].strip()
+        if content_type not in IMPORT_CONTENT_TYPES:
+            return Response(
+                f"Content type must be one of {list(IMPORT_CONTENT_TYPES)}",
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+
+        try:
+            # Body is not parsed by DRF, so it is streamed to the database without being loaded into memory
+            imported = BulkImporter(model_class).import_stream(
+                request.stream or BytesIO(), IMPORT_CONTENT_TYPES[content_type]
+            )
+        except BulkImportError as exception:
+            return Response(str(exception), status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"imported": imported})
+
+
+class DocumentViewSet(QueryBudgetMixin, QueryPlanningMixin, StreamingExportMixin, viewsets.ModelViewSet):
+    queryset = Document.objects.all()
     serializer_class = DocumentSerializer
     permission_classes = []
+    pagination_class = SelectablePagination
+    query_budget = 5
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        # Binary content is not loaded for lists, it can be downloaded from content endpoint
+        if self.action in ("list", "content"):
+            queryset = queryset.defer("content")
+        return queryset
+
+    def get_serializer_class(self) -> type[serializers.BaseSerializer]:
+        if self.action == "list":
+            return DocumentListSerializer
+        return super().get_serializer_class()
+
+    @action(detail=True, methods=["get"])
+    def content(self, request: Request, pk: str) -> HttpResponse | StreamingHttpResponse:
+        """Streams document content from the database in chunks, supports single HTTP Range"""
+        document = self.get_object()
+        size = document.content_size
+
+        try:
+            byte_range = parse_byte_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiableError:
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        first, last = byte_range or (0, size - 1)
+        response = StreamingHttpResponse(
+            iter_document_content(document.id, first, last, DOCUMENT_CONTENT_CHUNK_SIZE),
+            status=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+            content_type="application/octet-stream",
+        )
+        response["Content-Length"] = last - first + 1
+        response["Accept-Ranges"] = "bytes"
+        if byte_range:
+            response["Content-Range"] = f"bytes {first}-{last}/{size}"
+        return response
 
 
-class ContinentCountrySettlementViewSet(viewsets.ModelViewSet):
-    queryset = Continent.objects.all().prefetch_related("countries__settlements")
+class ContinentCountrySettlementViewSet(
+    QueryBudgetMixin, QueryPlanningMixin, ValuesSerializerMixin, viewsets.ModelViewSet
+):
+    queryset = Continent.objects.all()
     serializer_class = ContinentCountrySettlementSerializer
     permission_classes = []
+    pagination_class = SelectablePagination
+    query_budget = 6
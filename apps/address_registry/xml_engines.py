@@ -0,0 +1,114 @@
+"""
+xml_engines.py
+Engines serializing countries to RC broker <countries> XML document.
+
+Document is produced as an iterator of encoded chunks, so it can be encoded and sent without keeping the whole XML in
+memory. Engine is selected with RC_BROKER_XML_ENGINE setting.
+"""
+
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from io import BytesIO
+from itertools import chain
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from lxml import etree
+
+from apps.address_registry.models import Country
+
+EMPTY_COUNTRIES_XML = "<countries />"
+
+
+def construct_country_xml(country: Country) -> ET.Element:
+    country_data = ET.Element("countryData")
+    ET.SubElement(country_data, "id").text = str(country.id)
+    ET.SubElement(country_data, "title").text = country.title
+    ET.SubElement(country_data, "continent_id").text = str(country.continent_id)
+
+    continent_data = ET.SubElement(country_data, "continent")
+    ET.SubElement(continent_data, "code").text = str(country.continent.code)
+    ET.SubElement(continent_data, "name").text = country.continent.name
+
+    return country_data
+
+
+class CountriesXmlEngine(ABC):
+    """
+    Base class of <countries> document serializers.
+    With "ascii" encoding non-ASCII characters are written as character references, same as ET.tostring() does.
+    """
+
+    @abstractmethod
+    def iter_xml(self, countries: Iterable[Country], encoding: str = "ascii") -> Iterator[bytes]:
+        pass
+
+
+class ElementTreeCountriesXmlEngine(CountriesXmlEngine):
+    """Builds the whole document tree in memory and serializes it at once"""
+
+    def iter_xml(self, countries: Iterable[Country], encoding: str = "ascii") -> Iterator[bytes]:
+        countries_data = ET.Element("countries")
+        for country in countries:
+            countries_data.append(construct_country_xml(country))
+        yield ET.tostring(countries_data, encoding=encoding, xml_declaration=False)
+
+
+class LxmlCountriesXmlEngine(CountriesXmlEngine):
+    """Writes the document incrementally with lxml.etree.xmlfile, yielding written XML every `chunk_size` countries"""
+
+    def __init__(self, chunk_size: int = 100):
+        self.chunk_size = chunk_size
+
+    def iter_xml(self, countries: Iterable[Country], encoding: str = "ascii") -> Iterator[bytes]:
+        countries = iter(countries)
+        first_country = next(countries, None)
+        if first_country is None:
+            yield EMPTY_COUNTRIES_XML.encode(encoding)
+            return
+
+        buffer = BytesIO()
+        with etree.xmlfile(buffer, encoding=encoding) as xf, xf.element("countries"):
+            for index, country in enumerate(chain([first_country], countries), start=1):
+                self._write_country(xf, country)
+                if index % self.chunk_size == 0:
+                    xf.flush()
+                    yield self._drain(buffer)
+        yield self._drain(buffer)
+
+    def _write_country(self, xf, country: Country) -> None:
+        with xf.element("countryData"):
+            self._write_text_element(xf, "id", country.id)
+            self._write_text_element(xf, "title", country.title)
+            self._write_text_element(xf, "continent_id", country.continent_id)
+            with xf.element("continent"):
+                self._write_text_element(xf, "code", country.continent.code)
+                self._write_text_element(xf, "name", country.continent.name)
+
+    def _write_text_element(self, xf, tag: str, value) -> None:
+        with xf.element(tag):
+            xf.write(str(value))
+
+    def _drain(self, buffer: BytesIO) -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+
+COUNTRIES_XML_ENGINES: dict[str, type[CountriesXmlEngine]] = {
+    "etree": ElementTreeCountriesXmlEngine,
+    "lxml": LxmlCountriesXmlEngine,
+}
+
+
+def get_countries_xml_engine() -> CountriesXmlEngine:
+    try:
+        engine_class = COUNTRIES_XML_ENGINES[settings.RC_BROKER_XML_ENGINE]
+    except KeyError as exception:
+        raise ImproperlyConfigured(
+            f"Unknown RC_BROKER_XML_ENGINE {settings.RC_BROKER_XML_ENGINE!r}, expected one of "
+            f"{list(COUNTRIES_XML_ENGINES)}"
+        ) from exception
+    return engine_class()
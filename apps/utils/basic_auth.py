@@ -0,0 +1,183 @@
+"""
+basic_auth.py
+Credential verification for Spyne services.
+
+Verifying credentials (password hash, signature) can be expensive, while SOAP clients keeping the connection alive send
+the same credentials with every call. CredentialCache remembers digests of successfully verified credentials in process
+memory (LRU with TTL), so repeated calls skip verification. Failed verifications are not cached.
+
+All credential caches are invalidated at once by increasing shared version (invalidate_credential_caches), e.g. when
+user's password changes. Version is kept in Django cache, which is shared by all workers only with a shared backend
+(e.g. database cache). Local memory cache is per process, so CredentialCache is disabled by default with it
+(CREDENTIAL_CACHE_MAX_SIZE), otherwise other workers would keep accepting revoked credentials. To avoid a shared cache
+round-trip on every verification, each cache reads the version at most once per version check interval, so other
+workers notice invalidation within the interval (caches of the invalidating process notice it immediately).
+"""
+
+import base64
+import binascii
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from spyne import Fault
+
+CREDENTIAL_CACHE_VERSION_KEY = "credential_cache:version"
+
+# Time (monotonic) of the last invalidation made by this process
+_invalidated_at = float("-inf")
+
+
+def get_credential_cache_version() -> int:
+    return cache.get_or_set(CREDENTIAL_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_credential_caches() -> None:
+    global _invalidated_at
+    _invalidated_at = time.monotonic()
+    try:
+        cache.incr(CREDENTIAL_CACHE_VERSION_KEY)
+    except ValueError:
+        # Version key does not exist (or was evicted), caches with old version have to be invalidated anyway
+        cache.set(CREDENTIAL_CACHE_VERSION_KEY, get_credential_cache_version() + 1, timeout=None)
+
+
+class CredentialCache:
+    """LRU cache with TTL of verified credentials' digests"""
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        timeout: float | None = None,
+        version_check_interval: float | None = None,
+    ):
+        self.max_size = settings.CREDENTIAL_CACHE_MAX_SIZE if max_size is None else max_size
+        self.timeout = settings.CREDENTIAL_CACHE_TIMEOUT if timeout is None else timeout
+        self.version_check_interval = (
+            settings.CREDENTIAL_CACHE_VERSION_CHECK_INTERVAL
+            if version_check_interval is None
+            else version_check_interval
+        )
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._version: int | None = None
+        self._version_checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def _get_version(self, now: float) -> int:
+        """Returns shared version, which is read again only after version check interval or local invalidation"""
+        if (
+            self._version is not None
+            and now < self._version_checked_at + self.version_check_interval
+            and self._version_checked_at > _invalidated_at
+        ):
+            return self._version
+
+        version = get_credential_cache_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._version_checked_at = now
+        return version
+
+    def verify(self, credentials: str, verify_credentials: Callable[[], bool]) -> bool:
+        """Returns True if `credentials` were verified recently, otherwise calls `verify_credentials`"""
+        if self.max_size <= 0 or self.timeout <= 0:
+            return verify_credentials()
+
+        digest = hashlib.sha256(credentials.encode("utf-8")).hexdigest()
+        version = self._get_version(time.monotonic())
+        with self._lock:
+            expires_at = self._entries.get(digest)
+            if expires_at is not None and expires_at > time.monotonic():
+                self._entries.move_to_end(digest)
+                return True
+            self._entries.pop(digest, None)
+
+        if not verify_credentials():
+            return False
+
+        with self._lock:
+            if version == self._version:
+                self._entries[digest] = time.monotonic() + self.timeout
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class BasicAuthError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+def parse_basic_auth_header(header: str) -> tuple[str, str]:
+    if not header or not header.lower().startswith("basic"):
+        raise BasicAuthError("Invalid auth header")
+
+    try:
+        username, password = base64.b64decode(header.split()[1]).decode("utf-8").split(":", 1)
+    except (TypeError, ValueError, UnicodeDecodeError, binascii.Error, IndexError) as exception:
+        raise BasicAuthError("Invalid basic header. Credentials not correctly base64 encoded") from exception
+    return username, password
+
+
+def check_user_credentials(username: str, password: str) -> bool:
+    """Checks credentials against active Django users"""
+    user = authenticate(username=username, password=password)
+    return user is not None and user.is_active
+
+
+class BasicAuthVerifier:
+    """Verifies HTTP Basic Auth header with `check_credentials(username, password)`, caching successful checks"""
+
+    def __init__(
+        self,
+        check_credentials: Callable[[str, str], bool] = check_user_credentials,
+        credential_cache: CredentialCache | None = None,
+    ):
+        self.check_credentials = check_credentials
+        self.credential_cache = credential_cache or CredentialCache()
+
+    def verify(self, header: str) -> None:
+        """Raises BasicAuthError if header is invalid or credentials are incorrect"""
+
+        def verify_credentials() -> bool:
+            return self.check_credentials(*parse_basic_auth_header(header))
+
+        if not self.credential_cache.verify(header or "", verify_credentials):
+            raise BasicAuthError("Invalid credentials")
+
+
+def basic_auth_decorator(verifier: BasicAuthVerifier) -> Callable:
+    """
+    Decorator of Spyne service methods, which raises Client Fault if request's Basic Auth header is not verified.
+    Wrapper hides method's argument names from Spyne, so they have to be given in rpc decorator's `_args`.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(self, *args, **kwargs) -> Callable:
+            header = self.transport.headers.get("authorization", "")
+            if isinstance(header, list):
+                header = header[0]
+
+            try:
+                verifier.verify(header)
+            except BasicAuthError as error:
+                raise Fault(faultcode="Client", faultstring=error.message) from error
+            return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
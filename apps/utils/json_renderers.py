@@ -0,0 +1,77 @@
+"""
+json_renderers.py
+Fast JSON rendering of DRF responses and Spyne JSON documents.
+
+JSON encoder is selected by JSON_BACKEND setting:
+  - "json" - standard library json module, output is the same as of DRF JSONRenderer and Spyne JsonDocument
+  - "orjson" - orjson, which serializes dates, times, datetimes and UUIDs natively and is several times faster
+
+Values, which orjson does not support (Decimal, lazy translation strings, generators, etc.), are converted by the same
+encoder as with "json" backend.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from spyne.protocol.json import JsonDocument, JsonEncoder
+
+
+class JsonBackend:
+    STDLIB = "json"
+    ORJSON = "orjson"
+
+
+JSON_BACKENDS = (JsonBackend.STDLIB, JsonBackend.ORJSON)
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def is_orjson_enabled() -> bool:
+    if settings.JSON_BACKEND not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON_BACKEND '{settings.JSON_BACKEND}', choose one of {', '.join(JSON_BACKENDS)}")
+    return settings.JSON_BACKEND == JsonBackend.ORJSON
+
+
+def orjson_dumps(data: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    return orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer, which uses orjson when it is enabled and compact output is requested"""
+
+    def render(self, data: Any, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if data is None or indent or self.ensure_ascii or not self.compact or not is_orjson_enabled():
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same as JSONRenderer, line and paragraph separators are escaped, so output is valid JavaScript
+        content = orjson_dumps(data, default=self.encoder_class().default)
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+def _spyne_default(obj: Any) -> list:
+    # Same as spyne.protocol.json.JsonEncoder - not serializable objects are iterables (e.g. generators)
+    return list(obj)
+
+
+class FastJsonDocument(JsonDocument):
+    """Spyne JsonDocument, which uses orjson when it is enabled and no json.dumps() arguments were given"""
+
+    def create_out_string(self, ctx, out_string_encoding: str | None = "utf8") -> None:
+        # JsonDocument always passes its JsonEncoder to json.dumps()
+        json_kwargs = {key: value for key, value in self.kwargs.items() if (key, value) != ("cls", JsonEncoder)}
+        if json_kwargs or not is_orjson_enabled():
+            super().create_out_string(ctx, out_string_encoding)
+            return
+
+        if out_string_encoding is None:
+            ctx.out_string = (orjson_dumps(o, default=_spyne_default).decode() for o in ctx.out_document)
+        elif out_string_encoding.replace("-", "").lower() == "utf8":
+            ctx.out_string = (orjson_dumps(o, default=_spyne_default) for o in ctx.out_document)
+        else:
+            ctx.out_string = (
+                orjson_dumps(o, default=_spyne_default).decode().encode(out_string_encoding) for o in ctx.out_document
+            )
@@ -1,7 +1,7 @@
 """
 pagination.py
 Dedicated for a global CustomPagination class, which allows the response data to be paginated or to return the full
-response list.
+response list, and KeysetPagination class for paging through large tables without OFFSET and COUNT queries.
 """
 
 import math
@@ -40,3 +40,121 @@ class CustomPagination(pagination.LimitOffsetPagination):
                 "results": data,
             }
         )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["count", "results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "limit": {"type": "integer", "example": 100},
+                "offset": {"type": "integer", "example": 0},
+                "totalPages": {"type": "integer", "example": 2},
+                "currentPage": {"type": "integer", "example": 0},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Keyset (cursor) pagination ordered by primary key. Next page is selected with `WHERE pk > <last pk>`, so response
+    time does not depend on how deep the page is. Continuation tokens are opaque, `next`/`previous` links contain them.
+    Total count is not calculated unless requested with url parameter ?count=true
+    """
+
+    ordering = "pk"
+    page_size = 100
+    page_size_query_param = "limit"
+    max_page_size = 10000
+
+    COUNT_KEYWORD = "count"
+    COUNT_VALUE = "true"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.COUNT_KEYWORD) == self.COUNT_VALUE:
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response_data = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            response_data["count"] = self.count
+        return Response(response_data)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"] = {
+            "type": "integer",
+            "example": 123,
+            "description": f"Returned with ?{self.COUNT_KEYWORD}={self.COUNT_VALUE}",
+        }
+        return response_schema
+
+
+class SelectablePagination(pagination.BasePagination):
+    """
+    Allows choosing pagination per request. By default CustomPagination is used, KeysetPagination is used if request
+    is sent with url parameter ?pagination=keyset or with continuation token (?cursor=...).
+    To always use keyset pagination, set view's pagination_class to KeysetPagination instead.
+    """
+
+    PAGINATION_KEYWORD = "pagination"
+    KEYSET_VALUE = "keyset"
+
+    def __init__(self):
+        self.offset_paginator = CustomPagination()
+        self.keyset_paginator = KeysetPagination()
+        self.paginator = self.offset_paginator
+
+    def _is_keyset_requested(self, request) -> bool:
+        return (
+            request.query_params.get(self.PAGINATION_KEYWORD) == self.KEYSET_VALUE
+            or self.keyset_paginator.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.keyset_paginator if self._is_keyset_requested(request) else self.offset_paginator
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        # OpenAPI 2.0 generated by drf-yasg has no oneOf, so properties of both responses are listed and those returned
+        # by one pagination only are described as such
+        offset_properties = self.offset_paginator.get_paginated_response_schema(schema)["properties"]
+        keyset_properties = self.keyset_paginator.get_paginated_response_schema(schema)["properties"]
+        properties = {}
+        for pagination_name, own_properties, other_properties in (
+            ("offset", offset_properties, keyset_properties),
+            ("keyset", keyset_properties, offset_properties),
+        ):
+            for name, property_schema in own_properties.items():
+                if name not in other_properties:
+                    description = f"Returned with {pagination_name} pagination"
+                    if property_schema.get("description"):
+                        description = f"{description}. {property_schema['description']}"
+                    property_schema = {**property_schema, "description": description}
+                properties.setdefault(name, property_schema)
+        return {"type": "object", "required": ["results"], "properties": properties}
+
+    def get_schema_fields(self, view):
+        # Both paginations have "limit" parameter, it is listed once
+        fields = {}
+        for field in self.offset_paginator.get_schema_fields(view) + self.keyset_paginator.get_schema_fields(view):
+            fields.setdefault(field.name, field)
+        return list(fields.values())
+
+    def get_schema_operation_parameters(self, view):
+        parameters = {}
+        for parameter in self.offset_paginator.get_schema_operation_parameters(
+            view
+        ) + self.keyset_paginator.get_schema_operation_parameters(view):
+            parameters.setdefault(parameter["name"], parameter)
+        return list(parameters.values())
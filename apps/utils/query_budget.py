@@ -0,0 +1,73 @@
+"""
+query_budget.py
+Runtime counterpart of APIClientWithQueryCounter - counts database queries executed while view handles the request
+and logs or raises QueryLimitExceededError if view's declared query budget is exceeded (QUERY_BUDGET_MODE setting).
+Unlike CaptureQueriesContext, queries are only counted, not stored, so it can be used in production.
+"""
+
+import logging
+from collections.abc import Callable
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+LOGGER = logging.getLogger("app")
+
+
+class QueryLimitExceededError(ValueError):
+    pass
+
+
+class QueryBudgetMode:
+    OFF = "off"
+    LOG = "log"
+    RAISE = "raise"
+
+
+class QueryBudget:
+    """Context manager counting queries executed on database connection"""
+
+    def __init__(self, limit: int, request_key: str, using: str = DEFAULT_DB_ALIAS):
+        self.limit = limit
+        self.request_key = request_key
+        self.connection = connections[using]
+        self.executed = 0
+        self._wrapper = None
+
+    def __call__(self, execute: Callable, sql: str, params, many: bool, context: dict):
+        if "SAVEPOINT" not in sql:  # Same as APIClientWithQueryCounter, exclude transaction handling queries
+            self.executed += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> "QueryBudget":
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None or self.executed <= self.limit:
+            return
+
+        message = f"Too many queries. Executed: {self.executed}, limit: {self.limit}. Request: {self.request_key}"
+        if settings.QUERY_BUDGET_MODE == QueryBudgetMode.RAISE:
+            raise QueryLimitExceededError(message)
+        LOGGER.warning(message)
+
+
+class QueryBudgetMixin:
+    """
+    Enforces `query_budget` (maximum number of queries per request) on APIView.
+    Queries executed while iterating streaming response are not counted.
+    """
+
+    query_budget: int | None = None
+
+    def dispatch(self, request: Request, *args, **kwargs) -> Response:
+        if self.query_budget is None or settings.QUERY_BUDGET_MODE == QueryBudgetMode.OFF:
+            return super().dispatch(request, *args, **kwargs)
+
+        with QueryBudget(self.query_budget, f"{request.method} {request.path}"):
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,128 @@
+"""
+query_planning.py
+Derives select_related / prefetch_related paths from nested serializer and Spyne model definitions, so that nested
+serializers and Spyne models do not make one query per serialized object.
+"""
+
+import functools
+from dataclasses import dataclass, field
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import QuerySet
+from rest_framework import serializers
+from spyne import Array, ComplexModelBase
+
+
+@dataclass
+class QueryPlan:
+    select_related: list[str] = field(default_factory=list)
+    prefetch_related: list[str] = field(default_factory=list)
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+def _get_relation(model: type[models.Model], source: str) -> models.Field | models.ForeignObjectRel | None:
+    try:
+        model_field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+    return model_field if model_field.is_relation else None
+
+
+def plan_serializer_queries(
+    serializer: serializers.BaseSerializer, prefix: str = "", prefetch: bool = False
+) -> QueryPlan:
+    """
+    Returns query plan for nested serializers of given (model) serializer.
+    Single object relations (foreign key, one to one) are joined with select_related, unless they are nested in a
+    prefetched relation. Multiple object relations are prefetched.
+    """
+    plan = QueryPlan()
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if model is None:
+        return plan
+
+    for serializer_field in serializer.fields.values():
+        if not isinstance(serializer_field, serializers.BaseSerializer) or "." in serializer_field.source:
+            continue
+
+        relation = _get_relation(model, serializer_field.source)
+        if relation is None:
+            continue
+
+        path = f"{prefix}{serializer_field.source}"
+        is_prefetched = prefetch or relation.many_to_many or relation.one_to_many
+        nested_plan = plan_serializer_queries(serializer_field, prefix=f"{path}__", prefetch=is_prefetched)
+
+        if is_prefetched:
+            # Prefetching the deepest path prefetches all the relations on the way
+            plan.prefetch_related.extend(nested_plan.prefetch_related or [path])
+        else:
+            plan.select_related.extend(nested_plan.select_related or [path])
+            plan.prefetch_related.extend(nested_plan.prefetch_related)
+
+    return plan
+
+
+def _get_spyne_django_model(spyne_model: type[ComplexModelBase]) -> type[models.Model] | None:
+    return getattr(spyne_model.Attributes, "django_model", None)
+
+
+def plan_spyne_model_queries(
+    spyne_model: type[ComplexModelBase], prefix: str = "", prefetch: bool = False
+) -> QueryPlan:
+    """
+    Returns query plan for nested models of given Spyne DjangoComplexModel, same as plan_serializer_queries.
+    Nested models of multiple object relations are Array(...) of DjangoComplexModel.
+    """
+    plan = QueryPlan()
+    model = _get_spyne_django_model(spyne_model)
+    if model is None:
+        return plan
+
+    for name, field_type in spyne_model.get_flat_type_info(spyne_model).items():
+        nested_model = next(iter(field_type._type_info.values())) if issubclass(field_type, Array) else field_type
+        if not issubclass(nested_model, ComplexModelBase) or _get_spyne_django_model(nested_model) is None:
+            continue
+
+        relation = _get_relation(model, name)
+        if relation is None:
+            continue
+
+        path = f"{prefix}{name}"
+        is_prefetched = prefetch or relation.many_to_many or relation.one_to_many
+        nested_plan = plan_spyne_model_queries(nested_model, prefix=f"{path}__", prefetch=is_prefetched)
+
+        if is_prefetched:
+            plan.prefetch_related.extend(nested_plan.prefetch_related or [path])
+        else:
+            plan.select_related.extend(nested_plan.select_related or [path])
+            plan.prefetch_related.extend(nested_plan.prefetch_related)
+
+    return plan
+
+
+@functools.cache
+def get_spyne_model_query_plan(spyne_model: type[ComplexModelBase]) -> QueryPlan:
+    return plan_spyne_model_queries(spyne_model)
+
+
+@functools.cache
+def get_serializer_query_plan(serializer_class: type[serializers.BaseSerializer]) -> QueryPlan:
+    return plan_serializer_queries(serializer_class())
+
+
+class QueryPlanningMixin:
+    """Applies select_related / prefetch_related paths required by view's serializer to the queryset"""
+
+    def get_queryset(self) -> QuerySet:
+        return get_serializer_query_plan(self.get_serializer_class()).apply(super().get_queryset())
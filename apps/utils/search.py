@@ -0,0 +1,41 @@
+"""
+search.py
+Substring search helpers backed by pg_trgm GIN indexes.
+
+`icontains` lookups are translated by Django to `UPPER(column::text) LIKE UPPER('%value%')`, so trigram indexes are
+built on `UPPER(column)` expression. Accent insensitive search uses `immutable_unaccent` database function (created by
+migration, because `unaccent` itself is not immutable and can not be used in indexes) and is indexed separately.
+"""
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import CharField, Func, QuerySet, Value
+from django.db.models.functions import Upper
+
+TRIGRAM_OPCLASS = "gin_trgm_ops"
+
+
+class ImmutableUnaccent(Func):
+    function = "immutable_unaccent"
+    output_field = CharField()
+
+
+def trigram_index(field: str, name: str) -> GinIndex:
+    return GinIndex(OpClass(Upper(field), name=TRIGRAM_OPCLASS), name=name)
+
+
+def unaccent_trigram_index(field: str, name: str) -> GinIndex:
+    return GinIndex(OpClass(Upper(ImmutableUnaccent(field)), name=TRIGRAM_OPCLASS), name=name)
+
+
+def filter_contains(queryset: QuerySet, field: str, value: str, accent_insensitive: bool = False) -> QuerySet:
+    """
+    Case insensitive substring filter using trigram indexes.
+    If accent_insensitive is True, "siauliai" matches "Šiauliai" as well.
+    """
+    if not accent_insensitive:
+        return queryset.filter(**{f"{field}__icontains": value})
+
+    alias = f"{field.replace('__', '_')}_unaccent"
+    return queryset.alias(**{alias: Upper(ImmutableUnaccent(field))}).filter(
+        **{f"{alias}__contains": Upper(ImmutableUnaccent(Value(value)))}
+    )
@@ -0,0 +1,86 @@
+"""
+spatial.py
+Simplification and encoding of geometries in database for spatial API responses and map tiles.
+
+Geometries are simplified to the size of a map pixel at requested zoom level (ST_SimplifyPreserveTopology) and encoded
+by PostGIS, so that full resolution boundaries are neither transferred from database nor serialized in Python.
+"""
+
+import base64
+import math
+
+from django.contrib.gis.db.models.functions import AsGeoJSON, AsWKB, GeoFunc, GeomOutputGeoFunc
+from django.contrib.gis.geos import Polygon
+from django.db.models import BinaryField, Expression, F
+
+# Size of map tile in pixels, used to calculate simplification tolerance for zoom level
+TILE_SIZE = 256
+MAX_ZOOM = 22
+# Decimal digits of GeoJSON coordinates when geometry is not simplified (~0.1 m)
+GEOJSON_MAX_PRECISION = 6
+WEB_MERCATOR_SRID = 3857
+# Half of the Web Mercator world width in meters
+WEB_MERCATOR_MAX = 20037508.342789244
+
+
+class GeometryFormat:
+    GEOJSON = "geojson"
+    WKB = "wkb"
+
+
+GEOMETRY_FORMATS = (GeometryFormat.GEOJSON, GeometryFormat.WKB)
+
+
+class SimplifyPreserveTopology(GeomOutputGeoFunc):
+    function = "ST_SimplifyPreserveTopology"
+
+
+class AsMVTGeom(GeoFunc):
+    function = "ST_AsMVTGeom"
+    geom_param_pos = (0, 1)
+    # Geometry in tile coordinates is only passed on to ST_AsMVT, so it is not selected as a geometry
+    output_field = BinaryField()
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def get_tile_envelope(z: int, x: int, y: int) -> Polygon:
+    """Returns Web Mercator bounds of XYZ tile, same as ST_TileEnvelope"""
+    size = 2 * WEB_MERCATOR_MAX / 2**z
+    min_x = -WEB_MERCATOR_MAX + x * size
+    max_y = WEB_MERCATOR_MAX - y * size
+    envelope = Polygon.from_bbox((min_x, max_y - size, min_x + size, max_y))
+    envelope.srid = WEB_MERCATOR_SRID
+    return envelope
+
+
+def get_simplify_tolerance(zoom: int | None) -> float | None:
+    """Returns size of map pixel at zoom level in degrees (at equator), None if zoom is not given"""
+    if zoom is None:
+        return None
+    return 360 / (TILE_SIZE * 2 ** min(max(zoom, 0), MAX_ZOOM))
+
+
+def get_geojson_precision(tolerance: float | None) -> int:
+    """Coordinates are not given with more decimal digits than needed for simplification tolerance"""
+    if tolerance is None:
+        return GEOJSON_MAX_PRECISION
+    return min(max(math.ceil(-math.log10(tolerance)), 0), GEOJSON_MAX_PRECISION)
+
+
+def encode_geometry(field: str, zoom: int | None = None, geometry_format: str = GeometryFormat.GEOJSON) -> Expression:
+    """Returns expression of geometry field simplified for zoom level and encoded to GeoJSON or WKB"""
+    if geometry_format not in GEOMETRY_FORMATS:
+        raise ValueError(f"Unknown geometry format {geometry_format!r}, expected one of {GEOMETRY_FORMATS}")
+
+    tolerance = get_simplify_tolerance(zoom)
+    geometry = F(field) if tolerance is None else SimplifyPreserveTopology(field, tolerance)
+    if geometry_format == GeometryFormat.WKB:
+        return AsWKB(geometry)
+    return AsGeoJSON(geometry, precision=get_geojson_precision(tolerance))
+
+
+def wkb_to_base64(value: bytes | memoryview | None) -> str | None:
+    return None if value is None else base64.b64encode(value).decode()
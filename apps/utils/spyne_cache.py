@@ -0,0 +1,112 @@
+"""
+spyne_cache.py
+Response cache for Spyne Django applications.
+
+Responses are cached by request method, path (which contains protocol and, for HttpRpc, the method name) and
+normalized arguments - sorted query parameters and canonicalized request body, so SOAP envelopes that differ only in
+whitespace or attribute order share the same entry.
+
+Each application belongs to a cache namespace. Namespace version is part of the cache key, so all responses of the
+namespace are invalidated at once by increasing the version (e.g. from model signals) - old entries are never read
+again and are evicted by cache TTL / culling.
+
+Versions are increased in Django cache, so other workers see the invalidation only with a shared cache backend.
+Caching is disabled by default with local memory cache (SPYNE_RESPONSE_CACHE_TIMEOUT).
+"""
+
+import hashlib
+import io
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from lxml import etree
+from spyne.server.django import DjangoApplication
+
+from apps.utils.spyne_wsdl import WsdlCacheMixin
+
+RESPONSE_CACHE_KEY = "spyne_response:{namespace}:{version}:{digest}"
+RESPONSE_CACHE_VERSION_KEY = "spyne_response:{namespace}:version"
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+def get_namespace_version(namespace: str) -> int:
+    return cache.get_or_set(RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace), 1, timeout=None)
+
+
+def invalidate_response_cache(*namespaces: str) -> None:
+    for namespace in namespaces:
+        version_key = RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Version key does not exist (or was evicted), so there is nothing to invalidate yet
+            cache.set(version_key, 1, timeout=None)
+
+
+def normalize_request_body(body: bytes) -> bytes | None:
+    """Returns canonical form of XML request body, None if body is not valid XML"""
+    if not body:
+        return b""
+
+    try:
+        root = etree.fromstring(body, parser=etree.XMLParser(remove_blank_text=True, resolve_entities=False))
+    except etree.XMLSyntaxError:
+        return None
+    return etree.tostring(root, method="c14n2")
+
+
+def get_response_cache_key(namespace: str, request: HttpRequest) -> str | None:
+    body = normalize_request_body(request.body)
+    if body is None:
+        return None
+
+    query = sorted((key, value) for key in request.GET for value in request.GET.getlist(key))
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, repr(query)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(body)
+
+    return RESPONSE_CACHE_KEY.format(
+        namespace=namespace, version=get_namespace_version(namespace), digest=digest.hexdigest()
+    )
+
+
+class CachedDjangoApplication(WsdlCacheMixin, DjangoApplication):
+    """
+    DjangoApplication, which caches successful responses in Django cache for `cache_timeout` seconds
+    (SPYNE_RESPONSE_CACHE_TIMEOUT by default). Caching is disabled if timeout is 0.
+    """
+
+    def __init__(self, app, *args, cache_namespace: str, cache_timeout: int | None = None, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.cache_namespace = cache_namespace
+        self.cache_timeout = cache_timeout
+
+    def get_cache_timeout(self) -> int:
+        return settings.SPYNE_RESPONSE_CACHE_TIMEOUT if self.cache_timeout is None else self.cache_timeout
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        timeout = self.get_cache_timeout()
+        # WSDL is cached by WsdlCacheMixin
+        if not timeout or request.method not in ("GET", "POST") or self.is_wsdl_request(request.META):
+            return super().__call__(request)
+
+        cache_key = get_response_cache_key(self.cache_namespace, request)
+        # Request body was already read from WSGI input stream, so Spyne has to read it from memory
+        request.META["wsgi.input"] = io.BytesIO(request.body)
+        if cache_key is None:
+            return super().__call__(request)
+
+        if cached := cache.get(cache_key):
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response[CACHE_STATUS_HEADER] = "HIT"
+            return response
+
+        response = super().__call__(request)
+        if response.status_code == 200 and not response.streaming:
+            cache.set(cache_key, (response.content, response.get("Content-Type")), timeout)
+        response[CACHE_STATUS_HEADER] = "MISS"
+        return response
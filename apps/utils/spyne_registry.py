@@ -0,0 +1,117 @@
+"""
+spyne_registry.py
+Registry of Spyne applications, which builds service interface once per service definition.
+
+Same services are exposed with several protocol front-ends (e.g. SOAP, JSON and XML), each of them is a separate
+spyne.Application. Spyne builds the interface (introspects all the models and methods of services) for each application
+on its own. Registry builds the interface only for the first front-end and creates the rest of them from it:
+FrontEndInterface copies the maps of the populated interface, so front-ends do not share namespace or method state,
+while models and method descriptors are shared as by any applications of the same services.
+
+Interface documents (WSDL) are not shared, they depend on application's protocols. They are built lazily, on the first
+WSDL request, and kept by the server.
+"""
+
+import threading
+from collections import defaultdict, deque
+from collections.abc import Iterable
+
+from spyne import Application, EventManager
+from spyne.interface import Interface
+from spyne.protocol import ProtocolBase
+from spyne.service import Service
+
+
+class FrontEndInterface(Interface):
+    """Interface copied from the interface of another application of the same services instead of being populated"""
+
+    def __init__(self, app: Application, source: Interface):
+        self.source = source
+        super().__init__(
+            app, import_base_namespaces=source.import_base_namespaces, documents_container=type(source.docs)
+        )
+
+    def get_app(self) -> Application | None:
+        return self._front_end_app
+
+    def set_app(self, value: Application) -> None:
+        # Interface.set_app populates the interface from services
+        self._front_end_app = value
+        self.copy_interface(self.source)
+
+    app = property(get_app, set_app)
+
+    @property
+    def services(self) -> tuple:
+        return self.app.services if self.app else ()
+
+    def copy_interface(self, source: Interface) -> None:
+        self.classes = dict(source.classes)
+        self.imports = {namespace: set(imports) for namespace, imports in source.imports.items()}
+        self.service_method_map = {key: list(methods) for key, methods in source.service_method_map.items()}
+        self.method_id_map = dict(source.method_id_map)
+        self.method_descriptor_id_to_key = dict(source.method_descriptor_id_to_key)
+        self.member_methods = deque(source.member_methods)
+        self.service_attrs = defaultdict(
+            dict, {service: dict(attrs) for service, attrs in source.service_attrs.items()}
+        )
+        self.deps = defaultdict(set, {cls: set(deps) for cls, deps in source.deps.items()})
+        # Namespace prefixes can be added while serving requests
+        self.nsmap = dict(source.nsmap)
+        self.prefmap = dict(source.prefmap)
+
+
+class FrontEndApplication(Application):
+    """Application with other protocols for the services of already built application"""
+
+    def __init__(self, source: Application, in_protocol: ProtocolBase, out_protocol: ProtocolBase):
+        # Same as Application.__init__, except that interface is copied instead of being populated
+        self.services = source.services
+        self.tns = source.tns
+        self.name = source.name
+        self.config = source.config
+        self.classes = source.classes
+        self.event_manager = EventManager(self)
+        self.error_handler = None
+        self.in_protocol = in_protocol
+        self.out_protocol = out_protocol
+        self.interface = FrontEndInterface(self, source.interface)
+
+        self.in_protocol.set_app(self)
+        self.in_protocol.message = self.in_protocol.REQUEST
+        self.out_protocol.set_app(self)
+        self.out_protocol.message = self.out_protocol.RESPONSE
+        # Front-end is not added to Spyne's global application registry, which keeps one application per tns and name
+
+
+class SpyneApplicationRegistry:
+    def __init__(self):
+        self._applications: dict[tuple, Application] = {}
+        self._lock = threading.Lock()
+        # Changes when applications are added, so documentation generated from them can be rebuilt
+        self.version = 0
+
+    def get_application(
+        self,
+        services: Iterable[type[Service]],
+        tns: str,
+        name: str,
+        in_protocol: ProtocolBase,
+        out_protocol: ProtocolBase,
+    ) -> Application:
+        """Returns new application with given protocols, reusing interface of services if it was already built"""
+        services = tuple(services)
+        key = (services, tns, name)
+        with self._lock:
+            self.version += 1
+            application = self._applications.get(key)
+            if application is None:
+                self._applications[key] = Application(
+                    services, tns=tns, name=name, in_protocol=in_protocol, out_protocol=out_protocol
+                )
+                return self._applications[key]
+
+        return FrontEndApplication(application, in_protocol, out_protocol)
+
+
+spyne_applications = SpyneApplicationRegistry()
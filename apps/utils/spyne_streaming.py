@@ -0,0 +1,129 @@
+"""
+spyne_streaming.py
+Streaming of SOAP responses with many elements.
+
+Spyne builds the whole response envelope in memory before sending it. `stream_soap_response` and `stream_soap_result`
+bypass that for a single method - they write the envelope with lxml incremental writer and serialize returned items
+(or chunks of a large field value) one by one while the response is being sent, so memory usage and time to first
+byte do not depend on the size of the response.
+Application has to be served with StreamingSoapDjangoApplication.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from io import BytesIO
+
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from lxml import etree
+from spyne import ComplexModel, MethodContext
+from spyne.server.django import DjangoApplication
+from spyne.server.wsgi import WsgiApplication
+
+from apps.utils.spyne_wsdl import WsdlCacheMixin
+
+SOAP_ENV_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+
+
+def _drain(buffer: BytesIO) -> bytes:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _iter_soap_envelope(ctx: MethodContext, item_ns: str, write_result: Callable) -> Iterator[bytes]:
+    """
+    Writes SOAP envelope of method's response. Content of result element is written by `write_result(xf, nsmap)`
+    generator, written data is yielded each time it yields.
+    """
+    tns = ctx.app.interface.get_tns()
+    out_message = ctx.descriptor.out_message
+    (result_name,) = out_message._type_info
+    item_nsmap = {ctx.app.interface.get_namespace_prefix(item_ns): item_ns}
+    nsmap = {"soap11env": SOAP_ENV_NS, "tns": tns, **item_nsmap}
+
+    buffer = BytesIO()
+    with etree.xmlfile(buffer, encoding="UTF-8") as xf:
+        xf.write_declaration()
+        with (
+            xf.element(f"{{{SOAP_ENV_NS}}}Envelope", nsmap=nsmap),
+            xf.element(f"{{{SOAP_ENV_NS}}}Body"),
+            xf.element(f"{{{tns}}}{out_message.get_type_name()}"),
+            xf.element(f"{{{tns}}}{result_name}"),
+        ):
+            yield _drain(buffer)
+            for _ in write_result(xf, item_nsmap):
+                xf.flush()
+                yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def stream_soap_response(ctx: MethodContext, items: Iterable, item_class: type[ComplexModel]) -> list:
+    """
+    Makes method respond with `items` serialized as `item_class` elements of method's result.
+    `items` is consumed lazily, while response is being sent. Returned value should be returned by the method.
+    """
+    item_ns = item_class.get_namespace()
+
+    def write_items(xf, nsmap: dict[str, str]) -> Iterator[None]:
+        for item in items:
+            parent = etree.Element("parent", nsmap=nsmap)
+            ctx.out_protocol.to_parent(ctx, item_class, item, parent, item_ns)
+            xf.write(parent[0])
+            yield
+
+    ctx.out_string = _iter_soap_envelope(ctx, item_ns, write_items)
+    return []
+
+
+def stream_soap_result(
+    ctx: MethodContext, values: dict[str, str | Iterable[str] | None], result_class: type[ComplexModel]
+) -> None:
+    """
+    Makes method respond with `result_class` result, which fields are given in `values`. Field value can be an
+    iterable of text chunks, which is consumed lazily, while response is being sent. Returned value should be returned
+    by the method.
+    """
+    item_ns = result_class.get_namespace()
+
+    def write_fields(xf, nsmap: dict[str, str]) -> Iterator[None]:
+        for field_name in result_class._type_info:
+            value = values.get(field_name)
+            if value is None:
+                continue
+
+            with xf.element(f"{{{item_ns}}}{field_name}"):
+                for chunk in [value] if isinstance(value, str) else value:
+                    xf.write(chunk)
+                    yield
+
+    ctx.out_string = _iter_soap_envelope(ctx, item_ns, write_fields)
+
+
+class StreamingSoapDjangoApplication(WsdlCacheMixin, DjangoApplication):
+    """
+    DjangoApplication, which returns StreamingHttpResponse if response body is generated lazily by the method
+    (see stream_soap_response), and regular HttpResponse otherwise.
+    """
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | StreamingHttpResponse:
+        if self.is_wsdl_request(request.META):
+            return super().__call__(request)
+
+        status_and_headers = {}
+
+        def start_response(status: str, headers: list[tuple[str, str]]) -> None:
+            status_and_headers["status"] = int(status.split(" ", 1)[0])
+            status_and_headers["headers"] = headers
+
+        body = WsgiApplication.__call__(self, request.META.copy(), start_response)
+        headers = dict(status_and_headers["headers"])
+
+        # Content length is known only if the whole body was generated by Spyne
+        if "Content-Length" in headers:
+            response = HttpResponse(b"".join(body), status=status_and_headers["status"])
+        else:
+            response = StreamingHttpResponse(body, status=status_and_headers["status"])
+
+        for header, value in headers.items():
+            response[header] = value
+        return response
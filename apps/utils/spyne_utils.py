@@ -1,3 +1,6 @@
+from typing import Any
+
+from django.db import models
 from spyne import Integer64, NormalizedString
 from spyne.util.django import DEFAULT_FIELD_MAP, DjangoComplexModel, DjangoModelMapper
 
@@ -7,3 +10,24 @@ FIELD_MAP = DEFAULT_FIELD_MAP + (("BigAutoField", Integer64), ("PolygonField", N
 
 class DjangoAttributes(DjangoComplexModel.Attributes):
     django_mapper = DjangoModelMapper(FIELD_MAP)
+
+
+class DjangoInstanceProxy:
+    """
+    Model instance returned to Spyne instead of the instance itself. Multiple object relations (related managers) are
+    returned as lists, which Spyne can serialize as Array(...), nested model instances are proxied too.
+    """
+
+    __slots__ = ("_instance",)
+
+    def __init__(self, instance: models.Model):
+        self._instance = instance
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._instance, name)
+        if isinstance(value, models.Manager):
+            # Uses prefetched objects if relation was prefetched
+            return [DjangoInstanceProxy(instance) for instance in value.all()]
+        if isinstance(value, models.Model):
+            return DjangoInstanceProxy(value)
+        return value
@@ -0,0 +1,63 @@
+"""
+spyne_wsdl.py
+Cached WSDL documents of Spyne applications.
+
+WSDL depends only on the deployed code and service URL (it contains the service location), so it is built once per
+deploy (BUILD_VERSION is part of the cache key) and URL and kept in Django cache. WSDL responses have ETag and
+Last-Modified headers, clients re-fetching unchanged WSDL get 304 Not Modified response.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from spyne.server.django import DjangoApplication
+
+WSDL_CACHE_KEY = "spyne_wsdl:{build_version}:{digest}"
+WSDL_CONTENT_TYPE = "text/xml; charset=utf-8"
+
+
+class WsdlCacheMixin:
+    """Serves WSDL requests of Spyne DjangoApplication from cache, with conditional GET support"""
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not self.is_wsdl_request(request.META):
+            return super().__call__(request)
+
+        # Same as Spyne, service location is request URL without query and .wsdl suffix
+        url = request.build_absolute_uri(request.path).split(".wsdl")[0]
+        wsdl, etag, last_modified = self.get_wsdl(url)
+
+        response = HttpResponse(wsdl, content_type=WSDL_CONTENT_TYPE)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+    def get_wsdl(self, url: str) -> tuple[bytes, str, int]:
+        """Returns WSDL document for service at `url`, its ETag and last modification timestamp"""
+        digest = hashlib.sha256(f"{self.app.tns}\0{self.app.name}\0{url}".encode()).hexdigest()
+        cache_key = WSDL_CACHE_KEY.format(build_version=settings.BUILD_VERSION, digest=digest)
+        if cached := cache.get(cache_key):
+            return cached
+
+        if self.doc.wsdl11 is None:
+            raise Http404("WSDL is not available")
+
+        # Interface document building is not thread safe
+        with self._mtx_build_interface_document:
+            # Service elements (with location) are kept between builds
+            self.doc.wsdl11.service_elt_dict = {}
+            self.doc.wsdl11.build_interface_document(url)
+            wsdl = self.doc.wsdl11.get_interface_document()
+
+        cached = (wsdl, quote_etag(hashlib.sha256(wsdl).hexdigest()), int(time.time()))
+        cache.set(cache_key, cached, timeout=None)
+        return cached
+
+
+class WsdlCachedDjangoApplication(WsdlCacheMixin, DjangoApplication):
+    pass
@@ -0,0 +1,137 @@
+"""
+streaming.py
+Dedicated for StreamingExportMixin, which allows ListViews to stream the full response list (?all=true) instead of
+loading all objects into memory and rendering them as a single response, for HTTP Range header handling of
+streamed binary downloads and for streaming base64 encoding.
+"""
+
+import base64
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from pathlib import Path
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework.request import Request
+
+from apps.utils.json_renderers import FastJSONRenderer
+from apps.utils.pagination import CustomPagination
+
+# Size of chunks read from files, which are streamed
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def iter_file(path: Path, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def iter_base64(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Base64 encodes stream of bytes chunk by chunk, so that neither the whole input nor the whole output is kept in
+    memory. Bytes are encoded in multiples of 3, which are encoded without padding, so joined output is the same as
+    base64.b64encode() of joined input.
+    """
+    remainder = b""
+    for chunk in chunks:
+        data = remainder + chunk if remainder else chunk
+        aligned_size = len(data) - len(data) % 3
+        remainder = data[aligned_size:]
+        if aligned_size:
+            yield base64.b64encode(data[:aligned_size])
+
+    if remainder:
+        yield base64.b64encode(remainder)
+
+
+class RangeNotSatisfiableError(ValueError):
+    pass
+
+
+def parse_byte_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Returns inclusive (first, last) byte positions requested by HTTP Range header, e.g. "bytes=0-499", "bytes=500-"
+    or "bytes=-500". Returns None if whole content should be returned (no header, unsupported unit or multiple ranges).
+    Raises RangeNotSatisfiableError if range does not overlap the content.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    first, _, last = range_header.removeprefix("bytes=").strip().partition("-")
+    try:
+        if not first:
+            # Suffix range - last N bytes
+            first, last = max(size - int(last), 0), size - 1
+        else:
+            first, last = int(first), min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+
+    if first > last or first >= size:
+        raise RangeNotSatisfiableError(f"Range {range_header} is not satisfiable for content of {size} bytes")
+
+    return first, last
+
+
+class StreamFormat:
+    NDJSON = "ndjson"
+    JSON = "json"
+
+
+STREAM_CONTENT_TYPES = {
+    StreamFormat.NDJSON: "application/x-ndjson",
+    StreamFormat.JSON: "application/json",
+}
+
+
+class StreamingExportMixin:
+    """
+    If request is sent to ListView with url parameters ?all=true&stream=ndjson or ?all=true&stream=json - response is
+    streamed. Objects are read from the database with QuerySet.iterator() and serialized in chunks, so the first bytes
+    are sent at once and memory usage does not depend on the number of objects.
+      - ndjson - one JSON object per line
+      - json - JSON array, same as not paginated response
+    """
+
+    STREAM_KEYWORD = "stream"
+    stream_chunk_size = 1000
+
+    def get_stream_format(self, request: Request) -> str | None:
+        not_paginated = request.query_params.get(CustomPagination.NOT_PAGINATED_KEYWORD)
+        stream_format = request.query_params.get(self.STREAM_KEYWORD)
+        if not_paginated == CustomPagination.NOT_PAGINATED_VALUE and stream_format in STREAM_CONTENT_TYPES:
+            return stream_format
+        return None
+
+    def list(self, request: Request, *args, **kwargs):
+        stream_format = self.get_stream_format(request)
+        if stream_format is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_stream_queryset()
+        content = self._stream_ndjson(queryset) if stream_format == StreamFormat.NDJSON else self._stream_json(queryset)
+        return StreamingHttpResponse(content, content_type=STREAM_CONTENT_TYPES[stream_format])
+
+    def get_stream_queryset(self) -> QuerySet:
+        return self.filter_queryset(self.get_queryset())
+
+    def serialize_chunk(self, objects: Sequence) -> Sequence[dict]:
+        return self.get_serializer(objects, many=True).data
+
+    def _iter_serialized(self, queryset: QuerySet) -> Iterator[bytes]:
+        renderer = FastJSONRenderer()
+        objects = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while chunk := list(islice(objects, self.stream_chunk_size)):
+            for data in self.serialize_chunk(chunk):
+                yield renderer.render(data)
+
+    def _stream_ndjson(self, queryset: QuerySet) -> Iterator[bytes]:
+        for data in self._iter_serialized(queryset):
+            yield data + b"\n"
+
+    def _stream_json(self, queryset: QuerySet) -> Iterator[bytes]:
+        yield b"["
+        for index, data in enumerate(self._iter_serialized(queryset)):
+            yield data if index == 0 else b"," + data
+        yield b"]"
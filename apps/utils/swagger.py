@@ -1,10 +1,33 @@
-from django.urls import get_resolver
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.http import HttpResponse
+from django.urls import URLResolver, get_resolver
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from drf_yasg import openapi
 from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.renderers import _SpecRenderer
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
+from rest_framework.request import Request
 from spyne import Application
 
+from apps.utils.spyne_registry import spyne_applications
+
+SCHEMA_CACHE_MAX_SIZE = 32
+
+
+@dataclass
+class CachedSchema:
+    resolver: URLResolver
+    spyne_version: int
+    schema: openapi.Swagger
+    digest: str
+
 
 class CustomSchemaGenerator(OpenAPISchemaGenerator):
     """
@@ -14,8 +37,13 @@ class CustomSchemaGenerator(OpenAPISchemaGenerator):
       - Collects public methods of each spyne application service
       - Creates minimal swagger schema with constructed URL
       - Adds schema to main swagger schema
+
+    Public schema is generated once per process and kept until URLconf or Spyne applications change.
     """
 
+    _schema_cache: OrderedDict[tuple, CachedSchema] = OrderedDict()
+    _schema_cache_lock = threading.Lock()
+
     @staticmethod
     def _get_spyne_app_schema_patterns(spyne_app: Application) -> list[str]:
         spyne_schema_patterns = []
@@ -50,7 +78,7 @@ class CustomSchemaGenerator(OpenAPISchemaGenerator):
 
         return spyne_paths
 
-    def get_schema(self, request=None, public=False):
+    def _generate_schema(self, request: Request | None, public: bool) -> openapi.Swagger:
         schema = super().get_schema(request=request, public=public)
 
         # Add the new paths from the extra swagger JSON to the schema
@@ -59,9 +87,46 @@ class CustomSchemaGenerator(OpenAPISchemaGenerator):
 
         return schema
 
+    def _get_schema_cache_key(self, request: Request | None) -> tuple:
+        patterns = self._gen.patterns
+        # Only scheme and host of the URL are used in the schema
+        url = self.url or (request.build_absolute_uri("/") if request is not None else None)
+        return self.version, url, self._gen.urlconf, None if patterns is None else tuple(patterns)
+
+    def get_schema(self, request=None, public=False):
+        if not public:
+            # Schema depends on the user
+            return self._generate_schema(request, public)
+
+        key = self._get_schema_cache_key(request)
+        resolver = get_resolver(self._gen.urlconf)
+        spyne_version = spyne_applications.version
+        with self._schema_cache_lock:
+            cached = self._schema_cache.get(key)
+            if cached and cached.resolver is resolver and cached.spyne_version == spyne_version:
+                self._schema_cache.move_to_end(key)
+                return cached.schema
+
+        schema = self._generate_schema(request, public)
+        digest = hashlib.sha256(json.dumps(schema, default=str).encode()).hexdigest()
+        with self._schema_cache_lock:
+            self._schema_cache[key] = CachedSchema(resolver, spyne_version, schema, digest)
+            while len(self._schema_cache) > SCHEMA_CACHE_MAX_SIZE:
+                self._schema_cache.popitem(last=False)
+        return schema
+
+    @classmethod
+    def get_schema_digest(cls, schema: openapi.Swagger) -> str | None:
+        """Returns digest of cached schema, None if schema is not cached"""
+        with cls._schema_cache_lock:
+            for cached in cls._schema_cache.values():
+                if cached.schema is schema:
+                    return cached.digest
+        return None
+
 
 # Generate the base schema view using drf-yasg
-schema_view = get_schema_view(
+BaseSchemaView = get_schema_view(
     openapi.Info(
         title="Demo šaltiniai API",
         default_version="v1",
@@ -70,3 +135,24 @@ schema_view = get_schema_view(
     permission_classes=[permissions.AllowAny],
     generator_class=CustomSchemaGenerator,
 )
+
+
+class SchemaView(BaseSchemaView):
+    """
+    Returns schema with strong ETag (digest of the schema and its format). Request with matching If-None-Match header
+    gets 304 Not Modified response, schema is not rendered again.
+    """
+
+    def get(self, request: Request, version: str = "", format: str | None = None) -> HttpResponse:  # noqa: A002
+        response = super().get(request, version=version, format=format)
+
+        digest = CustomSchemaGenerator.get_schema_digest(response.data)
+        if digest is None or not isinstance(request.accepted_renderer, _SpecRenderer):
+            return response
+
+        etag = hashlib.sha256(f"{digest}:{request.accepted_renderer.format}".encode()).hexdigest()
+        response["ETag"] = quote_etag(etag)
+        return get_conditional_response(request, etag=response["ETag"], response=response)
+
+
+schema_view = SchemaView
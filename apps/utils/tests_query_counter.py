@@ -2,9 +2,7 @@ from django.db import DEFAULT_DB_ALIAS, connections
 from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
-
-class QueryLimitExceededError(ValueError):
-    pass
+from apps.utils.query_budget import QueryLimitExceededError
 
 
 class APIClientWithQueryCounter(APIClient):
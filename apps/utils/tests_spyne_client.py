@@ -0,0 +1,28 @@
+from django.http import HttpResponse
+from spyne import RemoteService
+from spyne.client.django import DjangoTestClient, _RemoteProcedure
+
+
+class _StreamingRemoteProcedure(_RemoteProcedure):
+    def __call__(self, *args, **kwargs):
+        response = self.get_django_response(*args, **kwargs)
+        if response.streaming:
+            response = HttpResponse(b"".join(response.streaming_content), status=response.status_code)
+
+        self.ctx.in_string = [response.content]
+        self.get_in_object(self.ctx)
+
+        if self.ctx.in_error is not None:
+            raise self.ctx.in_error
+        return self.ctx.in_object
+
+
+class StreamingDjangoTestClient(DjangoTestClient):
+    """
+    DjangoTestClient, which can also deserialize streamed responses (StreamingSoapDjangoApplication).
+    get_django_response() returns responses as they are.
+    """
+
+    def __init__(self, url, app, secure=False):
+        super().__init__(url, app, secure=secure)
+        self.service = RemoteService(_StreamingRemoteProcedure, url, app, secure=secure)
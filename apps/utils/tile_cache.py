@@ -0,0 +1,125 @@
+"""
+tile_cache.py
+On-disk cache of map tiles with least recently used eviction.
+
+Tiles are stored as files `<directory>/<version>/<key>`. Cache is invalidated by increasing the version kept in
+`<directory>/VERSION` file, so invalidation is shared by all the workers using the same directory and survives
+restarts. Tiles of old versions are never read again and are removed by eviction.
+
+Modification time of the file is its last access time (atime is not updated on most mounts). When size of the cached
+tiles exceeds max size, least recently used tiles are deleted until the cache is below EVICTION_RATIO of max size.
+Size is counted by scanning the directory on first write and on eviction, between them written bytes are added up.
+"""
+
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import suppress
+from pathlib import Path
+
+TILE_SUFFIX = ".mvt"
+VERSION_FILE = "VERSION"
+EVICTION_RATIO = 0.9
+
+
+class TileCache:
+    def __init__(self, directory: str | Path, max_size: int):
+        self.directory = Path(directory)
+        # Max size of cached tiles in bytes, 0 disables caching
+        self.max_size = max_size
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_version(self) -> int:
+        try:
+            return int((self.directory / VERSION_FILE).read_text())
+        except (FileNotFoundError, ValueError):
+            return 1
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / str(self.get_version()) / f"{key}{TILE_SUFFIX}"
+
+    def get(self, key: str) -> bytes | None:
+        if not self.enabled:
+            return None
+
+        path = self._get_path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        with suppress(FileNotFoundError):
+            os.utime(path)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if not self.enabled:
+            return
+
+        path = self._get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written to temporary file and renamed, so that other workers never read partially written tiles
+        self._write_atomic(path, data)
+
+        with self._lock:
+            self._size = self._get_size() if self._size is None else self._size + len(data)
+            if self._size > self.max_size:
+                self._size = self._evict()
+
+    def invalidate(self) -> None:
+        """Tiles cached so far are not returned anymore"""
+        if not self.enabled or not self.directory.exists():
+            # Nothing has been cached yet
+            return
+        self._write_atomic(self.directory / VERSION_FILE, str(self.get_version() + 1).encode())
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        fd, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.remove(temporary_path)
+            raise
+
+    def _iter_tiles(self, directory: Path | str | None = None) -> Iterator[os.DirEntry]:
+        with suppress(FileNotFoundError), os.scandir(directory or self.directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_tiles(entry.path)
+                elif entry.name.endswith(TILE_SUFFIX):
+                    yield entry
+
+    def _get_size(self) -> int:
+        size = 0
+        for entry in self._iter_tiles():
+            with suppress(FileNotFoundError):
+                size += entry.stat().st_size
+        return size
+
+    def _evict(self) -> int:
+        """Deletes least recently used tiles, returns size of remaining tiles"""
+        tiles = []
+        for entry in self._iter_tiles():
+            with suppress(FileNotFoundError):
+                stat = entry.stat()
+                tiles.append((stat.st_mtime, stat.st_size, entry.path))
+        tiles.sort()
+
+        size = sum(tile_size for _, tile_size, _ in tiles)
+        target_size = self.max_size * EVICTION_RATIO
+        for _, tile_size, path in tiles:
+            if size <= target_size:
+                break
+            with suppress(FileNotFoundError):
+                os.remove(path)
+            size -= tile_size
+        return size
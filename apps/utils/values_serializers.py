@@ -0,0 +1,164 @@
+"""
+values_serializers.py
+Read-only serialization of nested model serializers from .values() rows.
+
+ModelSerializer creates a model instance and calls every serializer field for each serialized object. ValuesSerializer
+is derived from a ModelSerializer class, it runs one .values() query per nesting level (same queries as
+prefetch_related) and assembles nested dicts in a single pass over the rows of each level. Output is the same as of the
+ModelSerializer.
+"""
+
+import functools
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from apps.utils.streaming import StreamingExportMixin
+
+# Fields, which represent .values() of model fields as they are
+PLAIN_FIELD_CLASSES = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+@dataclass(frozen=True)
+class ValuesField:
+    name: str
+    column: str
+    to_representation: Callable[[Any], Any] | None = None
+
+
+@dataclass(frozen=True)
+class NestedValues:
+    name: str
+    serializer: "ValuesSerializer"
+    # Foreign key of nested model to the parent model
+    parent_column: str
+
+
+class ValuesSerializer:
+    """
+    Serializes .values() rows the same way as given ModelSerializer serializes model instances.
+    Supports model fields, primary key related fields and nested serializers of reverse foreign keys (many=True).
+    """
+
+    def __init__(self, serializer_class: type[serializers.ModelSerializer]):
+        serializer = serializer_class()
+        self.model: type[models.Model] = serializer.Meta.model
+        # Output fields in serializer order, nested lists are filled in after rows of the level are serialized
+        self.fields: list[ValuesField | NestedValues] = []
+
+        for field in serializer._readable_fields:
+            model_field = self._get_model_field(field)
+            if isinstance(field, serializers.ListSerializer):
+                if not model_field.one_to_many or not isinstance(field.child, serializers.ModelSerializer):
+                    raise ImproperlyConfigured(f"{serializer_class.__name__}.{field.field_name} is not supported")
+                self.fields.append(
+                    NestedValues(field.field_name, ValuesSerializer(type(field.child)), model_field.field.name)
+                )
+            elif isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                self.fields.append(ValuesField(field.field_name, field.source))
+            elif isinstance(field, serializers.BaseSerializer) or model_field.is_relation:
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{field.field_name} is not supported")
+            elif isinstance(field, PLAIN_FIELD_CLASSES):
+                self.fields.append(ValuesField(field.field_name, field.source))
+            else:
+                self.fields.append(ValuesField(field.field_name, field.source, field.to_representation))
+
+        self.columns = ["pk", *(field.column for field in self.fields if isinstance(field, ValuesField))]
+
+    def _get_model_field(self, field: serializers.Field) -> models.Field | models.ForeignObjectRel:
+        try:
+            return self.model._meta.get_field(field.source)
+        except FieldDoesNotExist as exception:
+            raise ImproperlyConfigured(
+                f"{self.model.__name__} field '{field.source}' of serializer field '{field.field_name}' does not exist"
+            ) from exception
+
+    def get_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Returns .values() queryset of rows required to serialize objects of given queryset"""
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def serialize(self, rows: Iterable[dict]) -> list[dict]:
+        data = []
+        objects = {}
+        for row in rows:
+            objects[row["pk"]] = obj = self._serialize_row(row)
+            data.append(obj)
+        self._serialize_nested(objects)
+        return data
+
+    def _serialize_row(self, row: dict) -> dict:
+        obj = {}
+        for field in self.fields:
+            if isinstance(field, NestedValues):
+                obj[field.name] = []
+                continue
+            value = row[field.column]
+            obj[field.name] = (
+                value if value is None or field.to_representation is None else field.to_representation(value)
+            )
+        return obj
+
+    def _serialize_nested(self, parents: dict[Any, dict]) -> None:
+        if not parents:
+            return
+
+        for nested in self.fields:
+            if not isinstance(nested, NestedValues):
+                continue
+
+            columns = nested.serializer.columns
+            if nested.parent_column not in columns:
+                columns = [*columns, nested.parent_column]
+            rows = nested.serializer.model._default_manager.filter(
+                **{f"{nested.parent_column}__in": list(parents)}
+            ).values(*columns)
+
+            objects = {}
+            for row in rows:
+                objects[row["pk"]] = obj = nested.serializer._serialize_row(row)
+                parents[row[nested.parent_column]][nested.name].append(obj)
+            nested.serializer._serialize_nested(objects)
+
+
+@functools.cache
+def get_values_serializer(serializer_class: type[serializers.ModelSerializer]) -> ValuesSerializer:
+    return ValuesSerializer(serializer_class)
+
+
+class ValuesSerializerMixin(StreamingExportMixin):
+    """
+    List responses (paginated, not paginated and streamed) are serialized from .values() rows by ValuesSerializer
+    derived from view's serializer class. Other actions use the serializer class.
+    """
+
+    def get_values_serializer(self) -> ValuesSerializer:
+        return get_values_serializer(self.get_serializer_class())
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        if self.get_stream_format(request) is not None:
+            return super().list(request, *args, **kwargs)
+
+        values_serializer = self.get_values_serializer()
+        queryset = values_serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))
+
+    def get_stream_queryset(self) -> QuerySet:
+        return self.get_values_serializer().get_queryset(super().get_stream_queryset())
+
+    def serialize_chunk(self, objects: Sequence) -> Sequence[dict]:
+        return self.get_values_serializer().serialize(objects)
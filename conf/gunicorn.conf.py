@@ -4,3 +4,16 @@ loglevel = "info"
 access_log_format = "%(h)s %(l)s %(u)s %(t)s %(r)s %(s)s %(b)s %(f)s %(a)s"
 
 secure_scheme_headers = {"X-FORWARDED-PROTOCOL": "ssl", "X-FORWARDED-PROTO": "https", "X-FORWARDED-SSL": "on"}
+
+
+def post_worker_init(worker) -> None:
+    """Warns when caches invalidated on writes are kept in memory of each worker separately"""
+    # Application (and Django settings) is loaded by now
+    from django.conf import settings
+
+    if worker.cfg.workers > 1 and settings.LOCAL_MEMORY_CACHE:
+        worker.log.warning(
+            "Local memory cache is not shared by %s workers, cached responses, country XML and credentials are not "
+            "invalidated in other workers. Use shared cache backend (CACHE_BACKEND) or a single worker.",
+            worker.cfg.workers,
+        )
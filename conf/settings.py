@@ -129,6 +129,57 @@ else:
 
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Caches are invalidated on writes, so they have to be shared by all workers. Database cache table is created by
+# `python manage.py createcachetable` (run by entrypoint.sh).
+
+LOCAL_MEMORY_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "django_cache"),
+        # Oldest entries are culled when the limit is reached
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 10_000))},
+    }
+}
+# Local memory cache is per process, invalidation made by one worker would not reach the others. Caches invalidated on
+# writes are disabled by default with it, enable them only when running a single process.
+LOCAL_MEMORY_CACHE = CACHES["default"]["BACKEND"] == LOCAL_MEMORY_CACHE_BACKEND
+
+# Serialized country XML fragments used by RC broker and cities services, invalidated on Country/Continent changes.
+# Set to 0 to disable caching
+COUNTRY_XML_CACHE_TIMEOUT = int(os.getenv("COUNTRY_XML_CACHE_TIMEOUT", 0 if LOCAL_MEMORY_CACHE else 60 * 60))
+
+# In-process cache of verified SOAP service credentials (Basic Auth headers, RC broker signatures), 0 disables it.
+# Invalidated when users change through version kept in the shared cache. Disabled by default with local memory cache,
+# where other workers would keep accepting revoked credentials.
+CREDENTIAL_CACHE_MAX_SIZE = int(os.getenv("CREDENTIAL_CACHE_MAX_SIZE", 0 if LOCAL_MEMORY_CACHE else 1024))
+CREDENTIAL_CACHE_TIMEOUT = int(os.getenv("CREDENTIAL_CACHE_TIMEOUT", 5 * 60))
+# Seconds between reads of the shared invalidation version, other workers notice invalidation within this time
+CREDENTIAL_CACHE_VERSION_CHECK_INTERVAL = int(os.getenv("CREDENTIAL_CACHE_VERSION_CHECK_INTERVAL", 5))
+
+# Engine writing RC broker <countries> documents: "lxml" (incremental) or "etree" (whole tree in memory)
+RC_BROKER_XML_ENGINE = os.getenv("RC_BROKER_XML_ENGINE", "lxml")
+
+# Responses of Spyne (SOAP/JSON/XML) applications, invalidated on changes of models used by the application.
+# Set to 0 to disable caching
+SPYNE_RESPONSE_CACHE_TIMEOUT = int(os.getenv("SPYNE_RESPONSE_CACHE_TIMEOUT", 0 if LOCAL_MEMORY_CACHE else 5 * 60))
+
+# RC broker XML examples are kept in memory, examples directory is checked for changes at most every N seconds
+RC_EXAMPLES_RELOAD_INTERVAL = float(os.getenv("RC_EXAMPLES_RELOAD_INTERVAL", 5))
+
+# What to do when view executes more queries than its query_budget: "log", "raise" or "off"
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "log")
+
+# Encoder of JSON responses (DRF and Spyne JSON applications): "orjson" (fast) or "json" (standard library)
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson")
+
+# On-disk cache of administrative boundary vector tiles, shared by workers. Least recently used tiles are deleted when
+# size (bytes) exceeds the max size, set to 0 to disable caching. Invalidated when boundaries or units change
+TILE_CACHE_DIR = os.getenv("TILE_CACHE_DIR", os.path.join(BASE_DIR, "tile_cache/"))
+TILE_CACHE_MAX_SIZE = int(os.getenv("TILE_CACHE_MAX_SIZE", 512 * 1024 * 1024))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -174,6 +225,10 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "COERCE_DECIMAL_TO_STRING": False,
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.utils.json_renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 # user uploads
@@ -2,3 +2,10 @@
 from .settings import *
 
 INSTALLED_APPS = list(INSTALLED_APPS) + ["django_extensions"]
+
+# Tests and development server run in a single process, so local memory cache is not stale after writes
+CACHES = {"default": {"BACKEND": LOCAL_MEMORY_CACHE_BACKEND, "OPTIONS": {"MAX_ENTRIES": 10_000}}}
+LOCAL_MEMORY_CACHE = True
+COUNTRY_XML_CACHE_TIMEOUT = 60 * 60
+CREDENTIAL_CACHE_MAX_SIZE = 1024
+SPYNE_RESPONSE_CACHE_TIMEOUT = 5 * 60
@@ -2,9 +2,11 @@ import logging
 from pathlib import Path
 
 import pytest
+from django.core.cache import cache
 from model_bakery import generators
 from model_bakery.baker import make
 
+from apps.utils.query_budget import QueryBudgetMode
 from apps.utils.tests_query_counter import APIClientWithQueryCounter
 from apps.utils.token_helpers import get_token
 
@@ -15,6 +17,17 @@ def enable_db_access(db):
     pass
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cache is not rolled back together with test transaction, so it is cleared for each test."""
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def raise_on_query_budget_exceeded(settings):
+    settings.QUERY_BUDGET_MODE = QueryBudgetMode.RAISE
+
+
 @pytest.fixture(autouse=True)
 def add_richtextfield():
     generators.add("ckeditor.fields.RichTextField", generators.random_gen.gen_text)
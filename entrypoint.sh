@@ -3,6 +3,7 @@ echo $DJANGO_SETTINGS_MODULE
 
 python3 manage.py collectstatic --noinput
 python3 manage.py migrate -v 2 || exit 1
+python3 manage.py createcachetable || exit 1
 python3 manage.py loaddata initial.json
 python3 manage.py createsuperuser --noinput
 